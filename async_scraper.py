@@ -0,0 +1,343 @@
+import asyncio
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+from playwright.async_api import async_playwright, Error as PlaywrightError
+
+from company_cache import CompanyCache
+from input_pipeline import parse_entry
+from instrumentation import timers
+from linkedin_urls import canonical_profile_url, is_human_check_url, UNAVAILABLE_PROFILE_URL
+from page_readiness import load_timeouts
+from page_scroller import PageScroller
+from profile_parser import profile_fingerprint, EXTRACT_PROFILE_SCRIPT
+from profile_scraper import ProfileBuilder, ScrapingResult, CLICK_CONTACT_INFO_SCRIPT, \
+    GET_EMAIL_SCRIPT, EXPAND_SECTIONS_SCRIPT, distinct_company_urls, join_company_data, refresh_job_history
+from utils import CannotProceedScrapingException, HumanCheckException
+
+LINKEDIN_LOGIN_URL = 'https://www.linkedin.com/uas/login'
+LINKEDIN_FEED_URL = 'https://www.linkedin.com/feed/'
+
+# Same as page_readiness.DOM_QUIET_SCRIPT, as a promise awaited by page.evaluate
+DOM_QUIET_PROMISE = """
+([quietTime, timeout]) => new Promise((done) => {
+    let finished = false, timer = null;
+    const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quietTime, true); });
+    function finish(stable) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(stable);
+    }
+    observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(finish, quietTime, true);
+    setTimeout(finish, timeout, false);
+})
+"""
+
+# Clicks the first element of the class given as argument, returns if it was found
+CLICK_FIRST_SCRIPT = "(className) => { let el = document.getElementsByClassName(className)[0]; " \
+                     "if (el) { el.click(); return true; } return false; }"
+
+
+class PrefetchedProfileBuilder(ProfileBuilder):
+    """ProfileBuilder reading the company pages already fetched for a single profile"""
+
+    def __init__(self, company_cache, company_pages, capture=None):
+        self.company_cache = company_cache
+        self.company_pages = company_pages
+        self.capture = capture
+
+    def load_company_page(self, url):
+        return self.company_pages.get(url)
+
+
+class AsyncProfileScraper(Thread):
+    """Scrapes many profiles concurrently from a single thread: an asyncio event loop drives one Chrome over the
+    DevTools protocol (Playwright), with one browser context per concurrent profile.
+
+    It pulls the entries from the same WorkQueue and puts the results on the same queue of ProfileScraper.
+    The Human Check can not be done interactively in this mode: when LinkedIn asks for it the scraping stops.
+    """
+
+    def __init__(self, work_queue, results_queue, config, headless_option, concurrency, company_cache=None,
+                 journal=None, capture=None, fingerprints=None, login=True):
+
+        Thread.__init__(self)
+
+        self.work_queue = work_queue
+        self.results_queue = results_queue
+        self.config = config
+        self.headless_option = headless_option
+        self.concurrency = concurrency
+        self.company_cache = company_cache if company_cache is not None else CompanyCache.from_config(config)
+        self.journal = journal
+        self.capture = capture
+        self.fingerprints = fingerprints
+
+        # Disabled when scraping a local stand-in of LinkedIn
+        self.login = login
+
+        self.timeouts, self.dom_quiet_time = load_timeouts(config)
+        self.scroller = PageScroller.from_config(config)
+
+        # The session is saved here and reused by the next executions
+        self.storage_state_file_name = config.get('system', 'async_storage_state',
+                                                  fallback=os.path.join('browser_profiles', 'async_state.json'))
+
+        # Company pages being fetched: concurrent profiles of the same company share a single fetch, opened in a
+        # browser context of the scraper (the one of the profile asking first may be closed before the others)
+        self._company_fetches = {}
+        self._company_context = None
+
+        # The company cache is read and written on disk by its own thread, so the event loop never waits for it
+        self._cache_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Set when the scraping stops due to the Human Check, or due to an unexpected error
+        self.interrupted = False
+        self.crashed = False
+
+    def run(self):
+        try:
+            asyncio.run(self.scrap_all())
+        except Exception:
+            self.crashed = True
+            with open("errlog.txt", "a") as errlog:
+                traceback.print_exc(file=errlog)
+            print("Async scraper: Stopped by an unexpected error, see errlog.txt")
+        finally:
+            self._cache_executor.submit(self.company_cache.close).result()
+            if self.fingerprints is not None:
+                self._cache_executor.submit(self.fingerprints.close).result()
+            self._cache_executor.shutdown()
+
+    async def in_cache_thread(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._cache_executor, function, *args)
+
+    async def scrap_all(self):
+        start_time = time.time()
+
+        async with async_playwright() as playwright:
+            browser = await self.launch_browser(playwright)
+
+            storage_state = await self.linkedin_login(browser) if self.login else None
+
+            self._company_context = await browser.new_context(storage_state=storage_state)
+            counts = await asyncio.gather(*[self.worker(i + 1, browser, storage_state)
+                                            for i in range(self.concurrency)])
+            await self._company_context.close()
+
+            await browser.close()
+
+        elapsed_time = time.strftime('%H:%M:%S', time.gmtime(time.time() - start_time))
+        print(f"Async scraper: Parsed {sum(counts)} profiles in {elapsed_time}")
+
+    async def launch_browser(self, playwright):
+        chrome_path = self.config.get('system', 'chrome_path', fallback='')
+        return await playwright.chromium.launch(headless=self.headless_option,
+                                                executable_path=chrome_path if chrome_path != '' else None)
+
+    async def linkedin_login(self, browser):
+        # Returns the storage state (cookies) of a logged in session, reusing the saved one while still valid
+        storage_state = self.storage_state_file_name if os.path.exists(self.storage_state_file_name) else None
+        context = await browser.new_context(storage_state=storage_state)
+        page = await context.new_page()
+
+        await page.goto(LINKEDIN_FEED_URL)
+        if not page.url.startswith(LINKEDIN_FEED_URL):
+            print("Async scraper: Executing LinkedIn login...")
+            await page.goto(LINKEDIN_LOGIN_URL)
+            await page.fill('#username', self.config.get('linkedin', 'username'))
+            await page.fill('#password', self.config.get('linkedin', 'password'))
+            await page.press('#password', 'Enter')
+            await page.wait_for_load_state()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.storage_state_file_name)), exist_ok=True)
+        storage_state = await context.storage_state(path=self.storage_state_file_name)
+        await context.close()
+
+        return storage_state
+
+    async def worker(self, identifier, browser, storage_state):
+        delimiter = self.config.get('profiles_data', 'delimiter')
+        loop = asyncio.get_running_loop()
+
+        context = await browser.new_context(storage_state=storage_state)
+        page = await context.new_page()
+
+        count = 0
+
+        while not self.interrupted:
+            # WorkQueue.get may block: it runs outside the event loop
+            item = await loop.run_in_executor(None, self.work_queue.get)
+            if item is None:
+                break
+
+            count += 1
+            print(f"Async scraper #{identifier}: Scraping profile {item.index + 1} / {self.work_queue.total}")
+
+            try:
+                linkedin_url, known_graduation_date = parse_entry(item.entry, delimiter)
+                with timers.stage('profile'):
+                    scraping_result = await self.scrap_profile(page, linkedin_url, known_graduation_date)
+
+            except CannotProceedScrapingException:
+                self.save_result(item, ScrapingResult('TerminatedDueToHumanCheckError'))
+                self.work_queue.task_done()
+                self.interrupted = True
+                break
+
+            except Exception:
+                with open("errlog.txt", "a") as errlog:
+                    traceback.print_exc(file=errlog)
+                if self.work_queue.retry(item):
+                    continue
+                scraping_result = ScrapingResult('GenericError')
+
+            self.save_result(item, scraping_result)
+            self.work_queue.task_done()
+
+        await context.close()
+
+        return count
+
+    def save_result(self, item, scraping_result):
+        self.results_queue.put((item.index, scraping_result))
+        if self.journal is not None:
+            self.journal.append(item.index, item.entry, scraping_result)
+
+    async def wait_for_dom_quiet(self, page, step):
+        try:
+            return await page.evaluate(DOM_QUIET_PROMISE, [self.dom_quiet_time, int(self.timeouts[step] * 1000)])
+        except PlaywrightError:
+            return False
+
+    async def wait_for_selector(self, page, selector, step):
+        try:
+            await page.wait_for_selector(selector, state='attached', timeout=self.timeouts[step] * 1000)
+            return True
+        except PlaywrightError:
+            return False
+
+    async def scrap_profile(self, page, profile_linkedin_url, profile_known_graduation_date):
+
+        if canonical_profile_url(profile_linkedin_url) is None:
+            return ScrapingResult('BadFormattedLink')
+
+        # Opening of the profile page
+        with timers.stage('navigation'):
+            await page.goto(profile_linkedin_url, wait_until='domcontentloaded')
+
+        current_url = canonical_profile_url(page.url)
+        if not current_url == canonical_profile_url(profile_linkedin_url):
+            if current_url == UNAVAILABLE_PROFILE_URL:
+                return ScrapingResult('ProfileUnavailable')
+            raise CannotProceedScrapingException
+
+        with timers.stage('scroll'):
+            # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
+            await self.scroller.scroll_page_to_bottom(page)
+
+            await self.wait_for_selector(page, '#experience-section, #education-section', 'sections')
+
+        with timers.stage('expand_sections'):
+            expanded = await page.evaluate(EXPAND_SECTIONS_SCRIPT)
+            if expanded['see_more']:
+                await self.wait_for_dom_quiet(page, 'see_more')
+
+            if expanded['skills']:
+                await self.wait_for_selector(page, '.pv-skill-category-entity', 'skills')
+                await self.wait_for_dom_quiet(page, 'skills')
+
+        # All the data of the profile is read with a single script
+        with timers.stage('extraction'):
+            profile_data = json.loads(await page.evaluate(EXTRACT_PROFILE_SCRIPT))
+
+        # Unchanged profiles (same data of the previous run) are taken from the store: their contact info and their
+        # company pages are not opened again
+        fingerprint = None
+        if self.fingerprints is not None:
+            with timers.stage('fingerprint'):
+                fingerprint = profile_fingerprint(profile_data, profile_known_graduation_date)
+                profile = await self.in_cache_thread(self.fingerprints.lookup, profile_linkedin_url, fingerprint)
+            if profile is not None:
+                return ScrapingResult(refresh_job_history(profile, profile_known_graduation_date))
+
+        # Scraping the Email Address from Contact Info (email)
+        with timers.stage('contact_info'):
+            if await page.evaluate(CLICK_CONTACT_INFO_SCRIPT):
+                await self.wait_for_selector(page, '.pv-contact-info__contact-type', 'contact_info')
+            try:
+                email = await page.evaluate(GET_EMAIL_SCRIPT)
+                await page.evaluate(CLICK_FIRST_SCRIPT, 'artdeco-modal__dismiss')
+            except PlaywrightError:
+                email = 'N/A'
+
+        if self.capture is not None:
+            self.capture.save_profile(profile_linkedin_url, await page.content(), email,
+                                      profile_known_graduation_date)
+
+        builder = PrefetchedProfileBuilder(self.company_cache, {}, self.capture)
+        with timers.stage('parsing'):
+            scraping_result, company_urls = builder.parse_profile(profile_data, email, profile_known_graduation_date)
+
+        # The company pages of all the job positions are fetched concurrently, then joined with the jobs
+        urls = []
+        for url in distinct_company_urls(company_urls):
+            if await self.in_cache_thread(self.company_cache.get, url) is None:
+                urls.append(url)
+        try:
+            company_pages = await asyncio.gather(*[self.get_company_page(url) for url in urls])
+        except HumanCheckException:
+            raise CannotProceedScrapingException
+        builder.company_pages.update(zip(urls, company_pages))
+
+        companies = {}
+        for url in distinct_company_urls(company_urls):
+            # Reads the company cache, and writes the pages just fetched to it
+            companies[url] = await self.in_cache_thread(builder.get_company_data, url)
+
+        scraping_result = join_company_data(scraping_result, company_urls, companies)
+
+        if fingerprint is not None and not scraping_result.is_error():
+            await self.in_cache_thread(self.fingerprints.put, profile_linkedin_url, fingerprint,
+                                       scraping_result.profile)
+
+        return scraping_result
+
+    async def get_company_page(self, url):
+        fetch = self._company_fetches.get(url)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self.fetch_company_page(url))
+            self._company_fetches[url] = fetch
+            # Once fetched, the company data goes to the company cache
+            fetch.add_done_callback(lambda _: self._company_fetches.pop(url, None))
+        return await asyncio.shield(fetch)
+
+    async def fetch_company_page(self, url):
+        # Returns the html of the company page, opened in a new tab, or None if it can not be opened.
+        # Raises HumanCheckException if LinkedIn asks for the Human Check.
+        page = await self._company_context.new_page()
+        try:
+            with timers.stage('company_page'):
+                await page.goto(url, wait_until='domcontentloaded')
+                human_check = is_human_check_url(page.url)
+                if not human_check:
+                    # A page not rendered in time would be parsed (and cached) as a company with no data
+                    if not await self.wait_for_selector(page, '.org-top-card-summary-info-list', 'company_page'):
+                        return None
+                    page_source = await page.content()
+        except PlaywrightError:
+            return None
+        finally:
+            await page.close()
+
+        if human_check:
+            raise HumanCheckException
+
+        return page_source
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils_dates import parse_date  # noqa: E402
+
+# Micro-benchmark of utils_dates.parse_date against the previous strptime based implementation.
+#
+#   python benchmarks/bench_dates.py [number_of_dates]
+
+
+def strptime_parse_date(date_str):
+    if date_str == 'Present':
+        return datetime.today()
+
+    try:
+        return datetime.strptime(date_str, '%b %Y')
+    except ValueError:
+        try:
+            return datetime.strptime(date_str, '%Y')
+        except ValueError:
+            return None
+
+
+def generate_dates(number_of_dates):
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    random.seed(0)
+    dates = []
+    for _ in range(number_of_dates):
+        kind = random.random()
+        if kind < 0.7:
+            dates.append(f"{random.choice(months)} {random.randint(1990, 2020)}")
+        elif kind < 0.9:
+            dates.append(str(random.randint(1990, 2020)))
+        else:
+            dates.append('Present')
+    return dates
+
+
+def measure(function, dates):
+    start_time = time.perf_counter()
+    for date_str in dates:
+        function(date_str)
+    return time.perf_counter() - start_time
+
+
+if __name__ == '__main__':
+    number_of_dates = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    dates = generate_dates(number_of_dates)
+
+    for name, function in [('strptime chain', strptime_parse_date), ('parse_date', parse_date)]:
+        elapsed_time = measure(function, dates)
+        print(f"{name:>15}: {elapsed_time:6.2f}s  {number_of_dates / elapsed_time:12,.0f} dates/s")
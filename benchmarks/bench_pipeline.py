@@ -0,0 +1,334 @@
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from configparser import ConfigParser
+from datetime import datetime
+from queue import Queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from company_cache import CompanyCache, MemoryCompanyCache  # noqa: E402
+from company_resolver import CompanyResolver  # noqa: E402
+from exporter import XlsxExporter, PROFILES_HEADERS, SIMPLE_PROFILES_HEADERS, profiles_row, \
+    simple_profiles_row  # noqa: E402
+from input_pipeline import InputFile  # noqa: E402
+from instrumentation import timers  # noqa: E402
+from job_history_batch import JobHistoryBatch  # noqa: E402
+from job_history_summary import JobHistorySummary  # noqa: E402
+from linkedin_urls import allow_mock_linkedin  # noqa: E402
+from parquet_exporter import ParquetExporter  # noqa: E402
+from mock_linkedin import MockLinkedInServer, HttpBrowserPool, number_of_companies, profile_spec, company_spec, \
+    render_profile_page, render_company_page  # noqa: E402
+from profile_scraper import ProfileBuilder, ProfileScraper, ScrapingResult, iterate_results  # noqa: E402
+from utils import Profile, Job, Company, Location, Education  # noqa: E402
+from work_queue import WorkQueue  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: peak memory is not reported
+    resource = None
+
+# Offline benchmarks of the scraping pipeline, on synthetic LinkedIn-like pages (see mock_linkedin.py).
+#
+#   python benchmarks/bench_pipeline.py [--scales=1000,10000,100000] [--benchmarks=scraper,parsers,...]
+#                                       [--threads=4] [--save=results.json] [--baseline=results.json]
+#                                       [--tolerance=0.1]
+#
+# Each benchmark runs at each scale in a new process, so that the peak memory is the one of that run only.
+# With --baseline the run fails (exit code 1) when a throughput is lower than the baseline one by more than the
+# tolerance.
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+
+
+def graduation_date(spec):
+    return datetime.strptime(spec['graduation_date'], '%d/%m/%y')
+
+
+def spec_profile(spec):
+    # Profile of the spec, as ProfileBuilder would build it from the pages
+    jobs = []
+    for job in spec['jobs']:
+        company = company_spec(job['company'])
+        jobs.append(Job(Company(company['name'], company['industry'] or 'N/A'), job['title'],
+                        Location.from_string(company['location']), job['daterange']))
+
+    educations = []
+    for education in spec['educations']:
+        educations.append(Education(education['institution'], education['degreename'], education['field'],
+                                    education['start_year'], education['end_year']))
+
+    if len(jobs) == 0:
+        return Profile(spec['name'], spec['email'] or 'N/A', spec['skills'])
+
+    return Profile(spec['name'], spec['email'] or 'N/A', spec['skills'], jobs[0],
+                   JobHistorySummary(graduation_date(spec), [job['daterange'] for job in spec['jobs']]),
+                   jobs, educations)
+
+
+class MockPagesBuilder(ProfileBuilder):
+    """ProfileBuilder reading the company pages straight from the page generator"""
+
+    def __init__(self):
+        self.company_cache = MemoryCompanyCache()
+
+    def load_company_page(self, url):
+        return render_company_page(company_spec(int(url.rstrip('/').split('-')[-1])))
+
+
+def bench_parsers(number_of_profiles):
+    companies = number_of_companies(number_of_profiles)
+    builder = MockPagesBuilder()
+
+    elapsed_time = 0
+    for i in range(number_of_profiles):
+        spec = profile_spec(i, companies)
+        page_source = render_profile_page(spec, 'https://www.linkedin.com')
+
+        start_time = time.perf_counter()
+        builder.build_profile(page_source, spec['email'] or 'N/A', graduation_date(spec))
+        elapsed_time += time.perf_counter() - start_time
+
+    return elapsed_time
+
+
+def _job_history_inputs(number_of_profiles):
+    companies = number_of_companies(number_of_profiles)
+    graduation_dates = []
+    ranges_lists = []
+    for i in range(number_of_profiles):
+        spec = profile_spec(i, companies)
+        graduation_dates.append(graduation_date(spec))
+        ranges_lists.append([job['daterange'] for job in spec['jobs']])
+    return graduation_dates, ranges_lists
+
+
+def bench_job_history(number_of_profiles):
+    graduation_dates, ranges_lists = _job_history_inputs(number_of_profiles)
+
+    start_time = time.perf_counter()
+    for graduation, ranges in zip(graduation_dates, ranges_lists):
+        with timers.stage('job_history_summary'):
+            JobHistorySummary(graduation, ranges)
+    return time.perf_counter() - start_time
+
+
+def bench_job_history_batch(number_of_profiles):
+    graduation_dates, ranges_lists = _job_history_inputs(number_of_profiles)
+
+    start_time = time.perf_counter()
+    JobHistoryBatch.from_date_ranges(graduation_dates, ranges_lists)
+    return time.perf_counter() - start_time
+
+
+def _bench_exporter(number_of_profiles, create_exporter):
+    companies = number_of_companies(number_of_profiles)
+
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = create_exporter(directory)
+
+        elapsed_time = 0
+        for i in range(number_of_profiles):
+            scraping_result = ScrapingResult(spec_profile(profile_spec(i, companies)))
+
+            start_time = time.perf_counter()
+            exporter.write(scraping_result)
+            elapsed_time += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        exporter.close()
+        elapsed_time += time.perf_counter() - start_time
+
+    return elapsed_time
+
+
+def bench_xlsx(number_of_profiles):
+    return _bench_exporter(number_of_profiles, lambda directory: XlsxExporter(
+        os.path.join(directory, 'profiles.xlsx'), PROFILES_HEADERS, profiles_row))
+
+
+def bench_xlsx_simple(number_of_profiles):
+    return _bench_exporter(number_of_profiles, lambda directory: XlsxExporter(
+        os.path.join(directory, 'profiles.xlsx'), SIMPLE_PROFILES_HEADERS, simple_profiles_row))
+
+
+def bench_parquet(number_of_profiles):
+    return _bench_exporter(number_of_profiles, lambda directory: ParquetExporter(os.path.join(directory, 'profiles')))
+
+
+def bench_scraper(number_of_profiles, threads):
+    # ProfileScraper threads and the CompanyResolver, as in scrap_profiles.py, on the local server
+    server = MockLinkedInServer(number_of_profiles)
+
+    with tempfile.TemporaryDirectory() as directory:
+        config = ConfigParser()
+        config.read_dict({'profiles_data': {'delimiter': ':::'},
+                          'company_cache': {'file_name': os.path.join(directory, 'companies_cache.sqlite')},
+                          'system': {'max_retries': '1', 'company_workers': '2',
+                                     'mock_linkedin_url': server.base_url}})
+        allow_mock_linkedin(config)
+
+        companies = number_of_companies(number_of_profiles)
+        input_file_name = os.path.join(directory, 'profiles_data.txt')
+        with open(input_file_name, 'w') as input_file:
+            for i in range(number_of_profiles):
+                input_file.write(f"{server.profile_url(i)}:::{profile_spec(i, companies)['graduation_date']}\n")
+
+        company_workers = int(config.get('system', 'company_workers'))
+
+        start_time = time.perf_counter()
+
+        entries = InputFile(input_file_name, config.get('profiles_data', 'delimiter'))
+        work_queue = WorkQueue(entries, int(config.get('system', 'max_retries')), total=entries.to_scrape)
+        browser_pool = HttpBrowserPool(threads + company_workers)
+        results_queue = Queue()
+
+        company_cache = CompanyCache.from_config(config)
+
+        company_resolver = CompanyResolver(browser_pool, config, company_workers, company_cache)
+        company_resolver.start()
+
+        scrapers = []
+        for _ in range(threads):
+            scrapers.append(ProfileScraper(len(scrapers) + 1, work_queue, results_queue, browser_pool, config, True,
+                                           company_cache, company_resolver=company_resolver))
+        for scraper in scrapers:
+            scraper.start()
+
+        errors = 0
+        for scraping_result in iterate_results(results_queue, entries, {}, work_queue,
+                                               scrapers + [company_resolver]):
+            if scraping_result.is_error():
+                errors += 1
+
+        elapsed_time = time.perf_counter() - start_time
+
+        for scraper in scrapers:
+            scraper.join()
+        company_resolver.close()
+        company_cache.close()
+
+    server.close()
+
+    if errors > 0:
+        print(f"{errors} profiles not scraped, see errlog.txt", file=sys.stderr)
+
+    return elapsed_time
+
+
+BENCHMARKS = {'scraper': bench_scraper,
+              'parsers': bench_parsers,
+              'job_history': bench_job_history,
+              'job_history_batch': bench_job_history_batch,
+              'xlsx': bench_xlsx,
+              'xlsx_simple': bench_xlsx_simple,
+              'parquet': bench_parquet}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_child(name, number_of_profiles, threads):
+    timers.enable()
+
+    output = sys.stdout
+    # The scrapers print a line per profile
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if name == 'scraper':
+            elapsed_time = bench_scraper(number_of_profiles, threads)
+        else:
+            elapsed_time = BENCHMARKS[name](number_of_profiles)
+
+    stages = {}
+    for stage, data in timers.report()['stages'].items():
+        stages[stage] = {'count': data['count'],
+                         'p50_ms': data['p50_seconds'] * 1000,
+                         'p95_ms': data['p95_seconds'] * 1000,
+                         'p99_ms': data['p99_seconds'] * 1000}
+
+    print(json.dumps({'benchmark': name,
+                      'profiles': number_of_profiles,
+                      'seconds': elapsed_time,
+                      'profiles_per_second': number_of_profiles / elapsed_time if elapsed_time > 0 else None,
+                      'peak_rss_mb': peak_rss_mb(),
+                      'stages': stages}), file=output)
+
+
+def run(name, number_of_profiles, threads):
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name, str(number_of_profiles),
+                              str(threads)], stdout=subprocess.PIPE, check=True)
+    return json.loads(process.stdout.decode('utf-8').strip().splitlines()[-1])
+
+
+def print_result(result):
+    peak_rss = f"{result['peak_rss_mb']:8.1f} MB" if result['peak_rss_mb'] is not None else '     N/A'
+    print(f"{result['benchmark']:>17} {result['profiles']:>8} profiles: {result['seconds']:9.2f}s "
+          f"{result['profiles_per_second']:12,.1f} profiles/s  peak RSS {peak_rss}")
+    for stage, data in sorted(result['stages'].items()):
+        print(f"{'':>19}{stage:<22} p50 {data['p50_ms']:9.3f} ms  p95 {data['p95_ms']:9.3f} ms  "
+              f"p99 {data['p99_ms']:9.3f} ms  ({data['count']})")
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    previous = {(result['benchmark'], result['profiles']): result for result in baseline}
+    for result in results:
+        key = (result['benchmark'], result['profiles'])
+        if key in previous and result['profiles_per_second'] < \
+                previous[key]['profiles_per_second'] * (1 - tolerance):
+            regressions.append((result, previous[key]))
+    return regressions
+
+
+def option(name, default):
+    for argument in sys.argv[1:]:
+        if argument.startswith(f"--{name}="):
+            return argument.split('=', 1)[1]
+    return default
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        sys.exit(0)
+
+    scales = [int(scale) for scale in option('scales', ','.join(map(str, DEFAULT_SCALES))).split(',')]
+    names = option('benchmarks', ','.join(BENCHMARKS)).split(',')
+    threads = int(option('threads', '4'))
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark {name}, available: {', '.join(BENCHMARKS)}")
+            sys.exit(2)
+
+    results = []
+    for name in names:
+        for scale in scales:
+            result = run(name, scale, threads)
+            print_result(result)
+            results.append(result)
+
+    save_file_name = option('save', None)
+    if save_file_name is not None:
+        with open(save_file_name, 'w') as save_file:
+            json.dump(results, save_file, indent=2)
+
+    baseline_file_name = option('baseline', None)
+    if baseline_file_name is not None:
+        with open(baseline_file_name) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), float(option('tolerance', '0.1')))
+        for result, previous in regressions:
+            print(f"REGRESSION {result['benchmark']} at {result['profiles']} profiles: "
+                  f"{result['profiles_per_second']:,.1f} profiles/s (baseline {previous['profiles_per_second']:,.1f})")
+        if len(regressions) > 0:
+            sys.exit(1)
@@ -0,0 +1,434 @@
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from multiprocessing import Process, Queue
+from queue import Queue as ThreadQueue
+from urllib.request import urlopen
+
+from lxml import html
+from playwright.async_api import Error as PlaywrightError
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from async_scraper import AsyncProfileScraper, CLICK_FIRST_SCRIPT, DOM_QUIET_PROMISE  # noqa: E402
+from page_scroller import SCROLL_TO_BOTTOM_PROMISE, SCROLL_TO_BOTTOM_SCRIPT  # noqa: E402
+from profile_parser import extract_profile_data, EXTRACT_PROFILE_SCRIPT  # noqa: E402
+from profile_scraper import CLICK_CONTACT_INFO_SCRIPT, GET_EMAIL_SCRIPT, READ_EMAIL_SCRIPT, \
+    EXPAND_SECTIONS_SCRIPT  # noqa: E402
+
+# Synthetic LinkedIn-like pages, with the html structure the scrapers and the parsers expect, served by a local
+# HTTP server so that the whole pipeline can be benchmarked without network nor LinkedIn account.
+#
+# Pages are generated from their index only: /in/profile-<i>/ and /company/company-<i>/ are always the same.
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+FIRST_NAMES = ['Mario', 'Giulia', 'Luca', 'Anna', 'Marco', 'Sara', 'Paolo', 'Elena', 'Andrea', 'Chiara']
+LAST_NAMES = ['Rossi', 'Bianchi', 'Russo', 'Ferrari', 'Esposito', 'Romano', 'Colombo', 'Ricci', 'Marino', 'Greco']
+TITLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Consultant', 'Researcher', 'Analyst']
+INDUSTRIES = ['Information Technology and Services', 'Computer Software', 'Management Consulting', 'Research',
+              'Financial Services', 'Automotive']
+CITIES = ['Milano, Italia', 'Torino, Italia', 'London, United Kingdom', 'Berlin, Germany', 'Paris, France']
+INSTITUTIONS = ['Politecnico di Milano', 'Politecnico di Torino', 'Università di Bologna', 'ETH Zürich']
+DEGREES = ['Master of Science - MS', 'Bachelor of Science - BS', 'PhD']
+FIELDS = ['Computer Science', 'Management Engineering', 'Mechanical Engineering', 'Physics']
+SKILLS = ['Python', 'Java', 'C++', 'SQL', 'Machine Learning', 'Project Management', 'Excel', 'Docker', 'Git',
+          'Statistics', 'Leadership', 'Linux', 'JavaScript', 'Data Analysis', 'Research']
+
+# Markup unrelated to the scraped data, so that pages have a realistic size
+FILLER_BLOCK = '<div class="artdeco-card ember-view"><span class="visually-hidden">People also viewed</span>' \
+               '<a href="/in/someone/"><span class="name">Someone Else</span></a><p>Title at Company</p></div>'
+
+# Page of the Human Check
+CHECKPOINT_PATH = '/checkpoint/challenge/'
+
+
+def number_of_companies(number_of_profiles):
+    # Companies are shared by many profiles, as in real cohorts
+    return max(50, number_of_profiles // 20)
+
+
+def profile_path(index):
+    return f"/in/profile-{index}/"
+
+
+def company_path(index):
+    return f"/company/company-{index}/"
+
+
+def profile_spec(index, companies):
+    # Data of the index-th profile: name, email, skills, jobs (most recent first), educations, graduation date
+    rng = random.Random(index)
+
+    graduation_year = rng.randint(2005, 2019)
+
+    jobs = []
+    end_year = None
+    for position in range(rng.randint(0, 6)):
+        if end_year is None:
+            start_year = rng.randint(graduation_year - 3, 2020)
+        else:
+            start_year = rng.randint(end_year - 4, end_year)
+        start = f"{rng.choice(MONTHS)} {start_year}"
+        if position == 0 and rng.random() < 0.8:
+            end = 'Present'
+        else:
+            end = f"{rng.choice(MONTHS)} {start_year + rng.randint(0, 3)}"
+        jobs.append({'title': rng.choice(TITLES),
+                     'company': rng.randrange(companies),
+                     'daterange': f"{start} – {end}",
+                     'location': rng.choice(CITIES)})
+        end_year = start_year
+
+    educations = []
+    for _ in range(rng.randint(0, 3)):
+        start_year = rng.randint(graduation_year - 6, graduation_year - 1)
+        educations.append({'institution': rng.choice(INSTITUTIONS),
+                           'degreename': rng.choice(DEGREES),
+                           'field': rng.choice(FIELDS),
+                           'start_year': str(start_year),
+                           'end_year': str(graduation_year)})
+
+    return {'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'email': f"profile-{index}@example.com" if rng.random() < 0.5 else None,
+            'skills': rng.sample(SKILLS, rng.randint(0, len(SKILLS))),
+            'jobs': jobs,
+            'educations': educations,
+            'graduation_date': f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{graduation_year % 100:02d}"}
+
+
+def company_spec(index):
+    rng = random.Random(-1 - index)
+    return {'name': f"Company {index} S.p.A.",
+            'industry': rng.choice(INDUSTRIES) if rng.random() < 0.9 else None,
+            'location': rng.choice(CITIES)}
+
+
+def render_profile_page(spec, base_url, filler_blocks=100):
+    parts = ['<html><body>', FILLER_BLOCK * (filler_blocks // 2),
+             f'<div class="flex-1 mr5"><ul><li> {spec["name"]} </li><li>Milano</li></ul></div>',
+             '<a href="#" data-control-name="contact_see_more">Contact info</a>']
+
+    parts.append('<button class="artdeco-modal__dismiss">Dismiss</button>')
+    parts.append('<section class="pv-contact-info__contact-type ci-vanity-url"><header>Profile</header><span></span>'
+                 '<div><a href="#">linkedin.com/in/profile</a></div></section>')
+    if spec['email'] is not None:
+        parts.append('<section class="pv-contact-info__contact-type ci-email"><header>Email</header><span></span>'
+                     f'<div><a href="mailto:{spec["email"]}">{spec["email"]}</a></div></section>')
+
+    parts.append('<section id="experience-section"><ul>')
+    for job in spec['jobs']:
+        parts.append(f'<li><a href="{base_url}{company_path(job["company"])}"><h3>{job["title"]}</h3>'
+                     f'<p class="pv-entity__secondary-title">Company {job["company"]} Full-time</p>'
+                     '<h4 class="pv-entity__date-range"><span class="visually-hidden">Dates Employed</span>'
+                     f'<span>{job["daterange"]}</span></h4>'
+                     '<h4 class="pv-entity__location"><span class="visually-hidden">Location</span>'
+                     f'<span>{job["location"]}</span></h4></a></li>')
+    parts.append('</ul></section>')
+
+    parts.append('<section id="education-section"><ul>')
+    for education in spec['educations']:
+        parts.append(f'<li><h3>{education["institution"]}</h3><p class="pv-entity__degree-info">'
+                     f'<span>Degree Name</span><span>{education["degreename"]}</span>'
+                     f'<span>Field Of Study</span><span>{education["field"]}</span></p>'
+                     '<p class="pv-entity__dates"><span class="visually-hidden">Dates attended</span>'
+                     f'<span><time>{education["start_year"]}</time> – <time>{education["end_year"]}</time></span>'
+                     '</p></li>')
+    parts.append('</ul></section>')
+
+    if len(spec['skills']) > 0:
+        parts.append('<button class="pv-skills-section__additional-skills">Show more</button>')
+    for skill in spec['skills']:
+        parts.append('<li class="pv-skill-category-entity">'
+                     f'<span class="pv-skill-category-entity__name-text"> {skill} </span></li>')
+
+    parts.append(FILLER_BLOCK * (filler_blocks - filler_blocks // 2))
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def render_company_page(spec):
+    items = []
+    if spec['industry'] is not None:
+        items.append(f'<div class="org-top-card-summary-info-list__info-item">{spec["industry"]}</div>')
+    items.append(f'<div class="inline-block"><div class="org-top-card-summary-info-list__info-item">'
+                 f'{spec["location"]}</div></div>')
+    return (f'<html><body>{FILLER_BLOCK * 20}<h1 class="org-top-card-summary__title" title="{spec["name"]}">'
+            f'{spec["name"]}</h1><div class="org-top-card-summary-info-list">{"".join(items)}</div></body></html>')
+
+
+class _MockLinkedInHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('/') if part != '']
+        page = None
+        try:
+            if len(parts) == 2 and parts[0] == 'in':
+                spec = profile_spec(int(parts[1].split('-')[1]), self.server.companies)
+                page = render_profile_page(spec, self.server.base_url, self.server.filler_blocks)
+            elif len(parts) == 2 and parts[0] == 'company':
+                index = int(parts[1].split('-')[1])
+                if index in self.server.checkpoint_companies:
+                    # LinkedIn asking for the Human Check
+                    self.send_response(302)
+                    self.send_header('Location', CHECKPOINT_PATH)
+                    self.end_headers()
+                    return
+                if index in self.server.unrendered_companies:
+                    # Company page whose content is not rendered in time
+                    page = f'<html><body>{FILLER_BLOCK * 20}</body></html>'
+                else:
+                    page = render_company_page(company_spec(index))
+            elif self.path == CHECKPOINT_PATH:
+                page = '<html><body><h1>Let\'s do a quick security check</h1></body></html>'
+        except (IndexError, ValueError):
+            page = None
+
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(companies, filler_blocks, checkpoint_companies, unrendered_companies, addresses):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _MockLinkedInHandler)
+    server.daemon_threads = True
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.companies = companies
+    server.filler_blocks = filler_blocks
+    server.checkpoint_companies = checkpoint_companies
+    server.unrendered_companies = unrendered_companies
+    addresses.put(server.base_url)
+    server.serve_forever()
+
+
+class MockLinkedInServer:
+    """Local HTTP server of the synthetic pages, running in its own process (so it does not compete for the GIL
+    nor adds to the memory of the measured process)"""
+
+    def __init__(self, number_of_profiles, filler_blocks=100, checkpoint_companies=(), unrendered_companies=()):
+        # The pages of the companies in checkpoint_companies (indexes) redirect to the Human Check, the ones of the
+        # companies in unrendered_companies never show the company data
+        addresses = Queue()
+        self.companies = number_of_companies(number_of_profiles)
+        self.process = Process(target=_serve, args=(self.companies, filler_blocks, frozenset(checkpoint_companies),
+                                                    frozenset(unrendered_companies), addresses), daemon=True)
+        self.process.start()
+        self.base_url = addresses.get()
+
+    def profile_url(self, index):
+        return self.base_url + profile_path(index)
+
+    def close(self):
+        self.process.terminate()
+        self.process.join()
+
+
+# document.getElementsByClassName('...')[0].click(), failing as in Chrome when there is no such element
+CLICK_FIRST_BY_CLASS = re.compile(r"document\.getElementsByClassName\('([^']+)'\)\[0\]\.click\(\)")
+
+
+def _class_xpath(class_name):
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+class HttpElement:
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def text(self):
+        return " ".join(self.element.text_content().split())
+
+
+class HttpBrowser:
+    """Stand-in of the Chrome WebDriver for the mock server: pages are downloaded with plain HTTP, and the few
+    scripts used by the scrapers are answered from the html. The page is parsed once per navigation.
+
+    It exercises everything but Chrome itself (rendering, JavaScript, DevTools round-trips).
+    """
+
+    def __init__(self):
+        self.current_url = None
+        self.page_source = None
+        self.window_handles = ['main']
+        self._tree = None
+
+    def get(self, url):
+        with urlopen(url) as response:
+            self.page_source = response.read().decode('utf-8')
+            # Where the redirects ended
+            self.current_url = response.geturl()
+        self._tree = html.fromstring(self.page_source)
+
+    def find_elements(self, by, value):
+        if by == By.ID:
+            return [HttpElement(element) for element in self._tree.xpath('//*[@id=$value]', value=value)]
+        if by == By.CLASS_NAME:
+            return [HttpElement(element) for element in self._tree.xpath(_class_xpath(value))]
+        return []
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if len(elements) == 0:
+            raise NoSuchElementException(value)
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        if script == "return " + CLICK_CONTACT_INFO_SCRIPT:
+            return len(self._tree.xpath("//a[contains(., 'Contact info')]")) > 0
+        if script == "return " + GET_EMAIL_SCRIPT:
+            return self._email()
+        if script == "return " + READ_EMAIL_SCRIPT:
+            if len(self._tree.xpath(_class_xpath('artdeco-modal__dismiss'))) == 0:
+                raise WebDriverException("javascript error: Cannot read property 'click' of undefined")
+            return self._email()
+        if script == "return " + EXPAND_SECTIONS_SCRIPT:
+            return {'see_more': len(self._tree.xpath(_class_xpath('pv-profile-section__see-more-inline'))) > 0,
+                    'skills': len(self._tree.xpath(_class_xpath('pv-skills-section__additional-skills'))) > 0}
+        if script == "return " + EXTRACT_PROFILE_SCRIPT:
+            # Same payload, read with the lxml twin of the script
+            return json.dumps(extract_profile_data(self._tree))
+        click = CLICK_FIRST_BY_CLASS.search(script)
+        if click is not None and len(self._tree.xpath(_class_xpath(click.group(1)))) == 0:
+            raise WebDriverException("javascript error: Cannot read property 'click' of undefined")
+        return None
+
+    def _email(self):
+        emails = self._tree.xpath(_class_xpath('ci-email'))
+        return emails[0][2][0].text_content() if len(emails) > 0 else None
+
+    def execute_async_script(self, script, *args):
+        if script == SCROLL_TO_BOTTOM_SCRIPT:
+            # A static page is loaded at once: its height never changes (the scrapers use no sentinel)
+            return [2400, False]
+        # The DOM of a static page is always quiet
+        return True
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def quit(self):
+        pass
+
+
+class HttpBrowserPool:
+    """Same interface of BrowserPool, leasing HttpBrowser instances"""
+
+    def __init__(self, size):
+        self._idle = ThreadQueue()
+        for _ in range(size):
+            self._idle.put(HttpBrowser())
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, browser):
+        self._idle.put(browser)
+
+    def close(self):
+        pass
+
+
+class HttpPage:
+    """Stand-in of a Playwright page for the mock server, on top of an HttpBrowser: the page is downloaded in a
+    thread of the event loop, and the scripts are answered from the html as HttpBrowser does"""
+
+    def __init__(self, context):
+        self.context = context
+        self._browser = HttpBrowser()
+
+    @property
+    def url(self):
+        return self._browser.current_url
+
+    async def goto(self, url, wait_until=None):
+        if self.context.closed:
+            raise PlaywrightError("Target page, context or browser has been closed")
+        await asyncio.get_running_loop().run_in_executor(None, self._browser.get, url)
+        self.context.visited.append(url)
+
+    async def evaluate(self, script, arg=None):
+        if script == SCROLL_TO_BOTTOM_PROMISE:
+            return [2400, False]
+        if script == DOM_QUIET_PROMISE:
+            return True
+        if script == CLICK_FIRST_SCRIPT:
+            return len(self._browser._tree.xpath(_class_xpath(arg))) > 0
+        try:
+            return self._browser.execute_script("return " + script)
+        except WebDriverException as e:
+            raise PlaywrightError(str(e))
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        # Only selectors of ids and classes: '#experience-section, #education-section', '.pv-skill-category-entity'
+        for part in selector.split(','):
+            part = part.strip()
+            if len(self._browser.find_elements(By.ID if part.startswith('#') else By.CLASS_NAME, part[1:])) > 0:
+                return
+        raise PlaywrightError(f"Timeout {timeout}ms exceeded waiting for {selector}")
+
+    async def content(self):
+        return self._browser.page_source
+
+    async def close(self):
+        pass
+
+
+class HttpBrowserContext:
+    """Stand-in of a Playwright browser context: keeps the urls its pages visited"""
+
+    def __init__(self):
+        self.closed = False
+        self.visited = []
+
+    async def new_page(self):
+        if self.closed:
+            raise PlaywrightError("Target page, context or browser has been closed")
+        return HttpPage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class HttpAsyncBrowser:
+    """Stand-in of the Playwright browser driven by AsyncProfileScraper (see MockAsyncProfileScraper)"""
+
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, storage_state=None):
+        context = HttpBrowserContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class MockAsyncProfileScraper(AsyncProfileScraper):
+    """AsyncProfileScraper scraping the mock server with an HttpAsyncBrowser instead of Chrome"""
+
+    def __init__(self, *args, **kwargs):
+        AsyncProfileScraper.__init__(self, *args, login=False, **kwargs)
+        self.browser = HttpAsyncBrowser()
+
+    async def launch_browser(self, playwright):
+        return self.browser
@@ -0,0 +1,163 @@
+import os
+import time
+import traceback
+from queue import Queue
+from threading import Lock
+
+import psutil
+from pyvirtualdisplay import Display
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from utils import get_browser_options, linkedin_login
+
+LINKEDIN_FEED_URL = 'https://www.linkedin.com/feed/'
+
+# Times a browser is started again when it fails to start, and the pause (seconds) between the attempts
+DEFAULT_SPAWN_ATTEMPTS = 3
+SPAWN_RETRY_DELAY = 5
+
+
+def browser_memory_mb(browser):
+    # Resident memory (MB) of chromedriver and of all the Chrome processes it started (browser, renderers, GPU,
+    # ...), or None if they can not be found. Unlike the JavaScript heap of the page, it keeps growing across the
+    # navigations when Chrome leaks.
+    try:
+        driver_process = psutil.Process(browser.service.process.pid)
+        processes = [driver_process] + driver_process.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    rss = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+        except psutil.Error:
+            # Ended in the meantime (e.g. the renderer of a closed tab)
+            pass
+    return rss / 1048576
+
+
+class BrowserPool:
+    """Chrome instances spawned once and leased to the scrapers.
+
+    All the instances share a single virtual display (on Linux). Each pool slot keeps its own Chrome profile
+    directory on disk, so the LinkedIn session survives between runs and the login is done only when expired.
+    Browsers that crashed or that use too much memory (resident memory of all their processes) are replaced when
+    they are given back to the pool. A slot whose browser fails to start stays in the pool, empty: the browser is
+    started again when the slot is acquired.
+    """
+
+    def __init__(self, config, headless_option, size):
+        self.config = config
+        self.headless_option = headless_option
+        self.size = size
+
+        self.profiles_directory = os.path.abspath(config.get('system', 'browser_profiles_directory',
+                                                             fallback='browser_profiles'))
+        self.max_memory = float(config.get('system', 'browser_max_memory_mb', fallback='2048'))
+        self.spawn_attempts = int(config.get('system', 'browser_spawn_attempts', fallback=str(DEFAULT_SPAWN_ATTEMPTS)))
+
+        # Linux-specific code needed to open a new window of Chrome: one display shared by all the browsers
+        self.display = None
+        if config.get('system', 'os') == 'linux':
+            self.display = Display(visible=0, size=(800, 800))
+            self.display.start()
+
+        self._idle = Queue()
+        self._slots = {}
+        self._lock = Lock()
+
+        for slot in range(size):
+            self._idle.put(self._spawn(slot))
+
+    def _spawn(self, slot):
+        print(f"Browser pool: starting browser #{slot + 1}...")
+
+        user_data_dir = os.path.join(self.profiles_directory, f"slot_{slot}")
+        os.makedirs(user_data_dir, exist_ok=True)
+
+        browser = webdriver.Chrome(executable_path=self.config.get('system', 'driver'),
+                                   options=get_browser_options(self.headless_option, self.config, user_data_dir))
+
+        with self._lock:
+            self._slots[browser] = slot
+
+        self.ensure_logged_in(browser)
+
+        return browser
+
+    def ensure_logged_in(self, browser):
+        # The session saved in the profile directory is reused when still valid
+        browser.get(LINKEDIN_FEED_URL)
+        if not browser.current_url.startswith(LINKEDIN_FEED_URL):
+            linkedin_login(browser, self.config.get('linkedin', 'username'), self.config.get('linkedin', 'password'))
+
+    def _restart(self, slot):
+        # Returns the new browser of the slot, raising the last error if it failed to start spawn_attempts times
+        for attempt in range(1, self.spawn_attempts + 1):
+            try:
+                return self._spawn(slot)
+            except Exception:
+                with open("errlog.txt", "a") as errlog:
+                    traceback.print_exc(file=errlog)
+                print(f"Browser pool: browser #{slot + 1} failed to start (attempt {attempt} / {self.spawn_attempts})")
+                if attempt == self.spawn_attempts:
+                    raise
+                time.sleep(SPAWN_RETRY_DELAY)
+
+    def is_healthy(self, browser):
+        try:
+            # Fails if the browser crashed
+            browser.current_url
+        except WebDriverException:
+            return False
+        used_memory = browser_memory_mb(browser)
+        return used_memory is None or used_memory <= self.max_memory
+
+    def acquire(self):
+        # Blocks until a browser is available. Raises the error of Chrome when the browser of an empty slot can not
+        # be started: the slot stays in the pool, to be tried again by the next acquire.
+        browser = self._idle.get()
+        if not isinstance(browser, int):
+            return browser
+
+        slot = browser
+        try:
+            return self._restart(slot)
+        except Exception:
+            self._idle.put(slot)
+            raise
+
+    def release(self, browser):
+        if self.is_healthy(browser):
+            self._idle.put(browser)
+            return
+
+        with self._lock:
+            slot = self._slots.pop(browser)
+
+        print(f"Browser pool: recycling browser #{slot + 1}...")
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
+
+        try:
+            self._idle.put(self._restart(slot))
+        except Exception:
+            # The slot is kept (empty) instead of being lost: its browser is started again when acquired
+            self._idle.put(slot)
+
+    def close(self):
+        while not self._idle.empty():
+            browser = self._idle.get()
+            if isinstance(browser, int):
+                continue
+            try:
+                browser.quit()
+            except WebDriverException:
+                pass
+
+        if self.display is not None:
+            self.display.stop()
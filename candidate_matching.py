@@ -0,0 +1,193 @@
+import re
+import unicodedata
+
+from linkedin_urls import canonical_profile_url
+
+# Matching of the people searched by name (search_profiles_by_name.py) with the candidates proposed by LinkedIn.
+#
+# Universities and courses are compared as sets of normalized tokens: case, accents, punctuation and the words
+# listed in STOP_WORDS do not matter, and TOKEN_SYNONYMS are replaced by the same token:
+#
+#   'Università degli Studi di Milano' ==> {'university', 'milano'}
+#   'University of Milano'            ==> {'university', 'milano'}
+
+STOP_WORDS = {'a', 'and', 'at', 'de', 'degli', 'dei', 'del', 'della', 'delle', 'der', 'des', 'di', 'du', 'e',
+              'for', 'in', 'la', 'le', 'of', 'studi', 'the'}
+
+TOKEN_SYNONYMS = {'universita': 'university', 'universitat': 'university', 'universite': 'university',
+                  'universidad': 'university', 'universidade': 'university', 'univ': 'university',
+                  'milan': 'milano', 'turin': 'torino', 'rome': 'roma'}
+
+# Other names of the universities: either of them matches the other
+UNIVERSITY_ALIASES = {
+    'polimi': 'politecnico di milano',
+    'polito': 'politecnico di torino',
+    'unibo': 'università di bologna',
+    'unimi': 'università degli studi di milano',
+    'bocconi': 'università commerciale luigi bocconi',
+    'mit': 'massachusetts institute of technology',
+    'eth': 'eth zurich',
+    'epfl': 'école polytechnique fédérale de lausanne'
+}
+
+# Candidates of the search typeahead: the first and the last entries are not people
+CANDIDATES_SELECTOR = '.basic-typeahead__triggered-content > div > div'
+
+# Links of all the candidates, read at once
+CANDIDATE_LINKS_SCRIPT = \
+    "return Array.from(document.querySelectorAll(arguments[0])).slice(1, -1).map(function (el) { " \
+    "let a = el.querySelector('a'); return a ? a.href : null; });"
+
+# School, degree and dates of every education of the profile page, read at once
+EDUCATIONS_SCRIPT = \
+    "return Array.from(document.querySelectorAll('#education-section li')).map(function (li) { " \
+    "function text(selector) { let el = li.querySelector(selector); return el ? el.innerText : ''; } " \
+    "return {school_name: text('.pv-entity__school-name'), degree_info: text('.pv-entity__degree-info'), " \
+    "dates: text('.pv-entity__dates')}; });"
+
+_NOT_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+_YEAR = re.compile(r'\b(?:19|20)\d\d\b')
+
+
+def normalize_tokens(text):
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = set()
+    for token in _NOT_ALPHANUMERIC.split(text):
+        if token != '' and token not in STOP_WORDS:
+            tokens.add(TOKEN_SYNONYMS.get(token, token))
+    return frozenset(tokens)
+
+
+def graduation_year(graduation_date):
+    # DD/MM/YY (or DD/MM/YYYY) ==> YYYY
+    year = graduation_date.split('/')[-1].strip()
+    return '20' + year if len(year) == 2 else year
+
+
+class EducationIndex:
+    """University, course and graduation year a person is searched with, normalized once for all the candidates.
+
+    An education of a candidate matches when its school contains all the tokens of one of the universities (or
+    of one of their aliases). It is checked when its degree also contains all the tokens of one of the courses
+    (or when no course is given), and graduation checked when it ends in the graduation year.
+    """
+
+    def __init__(self, universities, courses=None, graduation_date=None, aliases=None):
+        all_aliases = dict(UNIVERSITY_ALIASES)
+        if aliases is not None:
+            all_aliases.update(aliases)
+
+        # Normalized alias ==> normalized names it stands for (both ways)
+        alias_index = {}
+        for alias, full_name in all_aliases.items():
+            alias_tokens = normalize_tokens(alias)
+            full_name_tokens = normalize_tokens(full_name)
+            alias_index.setdefault(alias_tokens, set()).add(full_name_tokens)
+            alias_index.setdefault(full_name_tokens, set()).add(alias_tokens)
+
+        self.universities = []
+        for university in universities or []:
+            tokens = normalize_tokens(university)
+            if len(tokens) > 0:
+                self.universities.append(tokens)
+                self.universities.extend(alias_index.get(tokens, ()))
+
+        self.courses = [tokens for tokens in (normalize_tokens(course) for course in courses or []) if len(tokens) > 0]
+
+        self.graduation_year = graduation_year(graduation_date) if graduation_date is not None else None
+
+    def match(self, education):
+        # Returns (education_checked, grad_check) of the education, None if its school is not a searched one
+        school_tokens = normalize_tokens(education['school_name'])
+        if not any(university <= school_tokens for university in self.universities):
+            return None
+
+        if len(self.courses) > 0:
+            degree_tokens = normalize_tokens(education['degree_info'])
+            education_checked = any(course <= degree_tokens for course in self.courses)
+        else:
+            education_checked = True
+
+        # Check if the graduation year known is equal to the one specified in LinkedIn
+        grad_check = 'NO_GRAD_CHECK'
+        years = _YEAR.findall(education['dates'])
+        if self.graduation_year is not None and len(years) > 1 and years[-1] == self.graduation_year:
+            grad_check = 'GRAD_CHECKED'
+
+        return education_checked, grad_check
+
+    def best_match(self, educations):
+        # Best (education_checked, grad_check) among the educations of a candidate, None if none matches
+        best = None
+        for education in educations:
+            match = self.match(education)
+            if match is not None and (best is None or match_rank(match) > match_rank(best)):
+                best = match
+        return best
+
+
+def match_rank(match):
+    education_checked, grad_check = match
+    return education_checked, grad_check == 'GRAD_CHECKED'
+
+
+# The best possible match: no other candidate is looked at once it is found
+PERFECT_MATCH = (True, 'GRAD_CHECKED')
+
+
+class CandidateMatcher:
+    """Finds the profile of a person among the candidates LinkedIn proposes for the name.
+
+    The name is searched once: the links of all the candidates are read from the typeahead, then each candidate
+    profile is opened directly, until one of them matches perfectly.
+    """
+
+    def __init__(self, browser, readiness, scroller):
+        self.browser = browser
+        self.readiness = readiness
+        self.scroller = scroller
+
+        self.searches = 0
+        self.candidates_visited = 0
+
+    def search_candidates(self, name):
+        # Returns the profile urls of the candidates, in the order LinkedIn proposes them
+        search_input = self.browser.find_element_by_class_name('search-global-typeahead__input')
+        search_input.clear()
+        search_input.send_keys(name.strip())
+        self.readiness.wait_for_typeahead()
+        self.searches += 1
+
+        candidates = []
+        for link in self.browser.execute_script(CANDIDATE_LINKS_SCRIPT, CANDIDATES_SELECTOR):
+            # Entries that are not people (e.g. companies, searches) have no profile url
+            profile_url = canonical_profile_url(link) if link is not None else None
+            if profile_url is not None and profile_url not in candidates:
+                candidates.append(profile_url)
+        return candidates
+
+    def read_educations(self, profile_url):
+        self.browser.get(profile_url)
+        self.candidates_visited += 1
+
+        # Loading the page until the education section is there (LinkedIn loads content asynchronously based on
+        # your scrolling)
+        self.scroller.scroll_to_bottom(self.browser, '#education-section')
+
+        return self.browser.execute_script(EDUCATIONS_SCRIPT)
+
+    def find(self, name, education_index):
+        # Returns [profile url, education_checked, grad_check] of the best candidate, ['N/A', '', ''] if none
+        best_solution = ['N/A', '', '']
+        best = None
+
+        for profile_url in self.search_candidates(name):
+            match = education_index.best_match(self.read_educations(profile_url))
+            if match is not None and (best is None or match_rank(match) > match_rank(best)):
+                best = match
+                best_solution = [profile_url, match[0], match[1]]
+                if match == PERFECT_MATCH:
+                    break
+
+        return best_solution
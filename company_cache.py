@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+import time
+
+from linkedin_urls import canonical_company_url
+
+# The last access of an entry (deciding which entries are dropped first) is updated at most once in this many
+# seconds: most of the hits only read the database
+LAST_ACCESS_RESOLUTION = 24 * 60 * 60
+
+# Expired and least recently used entries are dropped once every this many insertions (and when the cache is opened),
+# so the store can exceed max_entries by this many entries at most
+PRUNE_INTERVAL = 100
+
+
+class CompanyCache:
+    """Company data (industry, name, location) persisted on a SQLite file, shared by threads and runs"""
+
+    def __init__(self, file_name, ttl_seconds, max_entries):
+        self.file_name = file_name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # sqlite3 connections can not be shared between threads: each thread lazily opens its own
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+        self._puts = 0
+
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS companies ("
+                           "url TEXT PRIMARY KEY, "
+                           "industry TEXT, "
+                           "companyname TEXT, "
+                           "location TEXT, "
+                           "created_at REAL, "
+                           "last_access REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS companies_last_access ON companies (last_access)")
+        connection.execute("CREATE INDEX IF NOT EXISTS companies_created_at ON companies (created_at)")
+        self._prune(connection, time.time())
+        connection.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('company_cache', 'file_name', fallback='companies_cache.sqlite'),
+                   float(config.get('company_cache', 'ttl_days', fallback='30')) * 24 * 60 * 60,
+                   int(config.get('company_cache', 'max_entries', fallback='100000')))
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # The timeout makes concurrent writers (other threads or processes) wait for the lock instead of failing
+            connection = sqlite3.connect(self.file_name, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, url):
+        key = canonical_company_url(url)
+        now = time.time()
+        connection = self._connection()
+
+        row = connection.execute("SELECT industry, companyname, location, last_access FROM companies "
+                                 "WHERE url = ? AND created_at >= ?", (key, now - self.ttl_seconds)).fetchone()
+        if row is None:
+            return None
+
+        if now - row[3] >= LAST_ACCESS_RESOLUTION:
+            connection.execute("UPDATE companies SET last_access = ? WHERE url = ?", (now, key))
+            connection.commit()
+
+        return {'industry': row[0],
+                'companyname': row[1],
+                'location': row[2]}
+
+    def put(self, url, industry, companyname, location):
+        key = canonical_company_url(url)
+        now = time.time()
+        connection = self._connection()
+
+        connection.execute("INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?)",
+                           (key, industry, companyname, location, now, now))
+
+        with self._lock:
+            self._puts += 1
+            prune = self._puts % PRUNE_INTERVAL == 0
+        if prune:
+            self._prune(connection, now)
+        connection.commit()
+
+    def _prune(self, connection, now):
+        # Expired entries are dropped, then the least recently used ones if the store is still too big
+        connection.execute("DELETE FROM companies WHERE created_at < ?", (now - self.ttl_seconds,))
+        connection.execute("DELETE FROM companies WHERE url IN ("
+                           "SELECT url FROM companies ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                           (self.max_entries,))
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class MemoryCompanyCache:
+    """Same interface of CompanyCache, kept in memory only (e.g. for offline replays)"""
+
+    def __init__(self):
+        self._companies = {}
+
+    def get(self, url):
+        return self._companies.get(canonical_company_url(url))
+
+    def put(self, url, industry, companyname, location):
+        self._companies[canonical_company_url(url)] = {'industry': industry,
+                                                       'companyname': companyname,
+                                                       'location': location}
+
+    def close(self):
+        pass
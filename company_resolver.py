@@ -0,0 +1,213 @@
+import traceback
+from concurrent.futures import Future
+from queue import Queue
+from threading import Lock, Thread
+
+from instrumentation import timers
+from linkedin_urls import canonical_company_url, is_human_check_url
+from page_readiness import PageReadiness
+from profile_scraper import ProfileBuilder, ScrapingResult, distinct_company_urls, join_company_data
+from utils import Location, HumanCheckException, CannotProceedScrapingException
+
+
+class CompanyPageFetcher(ProfileBuilder, Thread):
+    """Worker of the CompanyResolver: scrapes the company pages it is given with a browser leased from the pool"""
+
+    def __init__(self, resolver):
+        Thread.__init__(self)
+
+        self.resolver = resolver
+        self.company_cache = resolver.company_cache
+        self.capture = resolver.capture
+
+        self.browser = None
+        self.readiness = None
+
+    def load_company_page(self, url):
+        try:
+            with timers.stage('company_page'):
+                self.browser.get(url)
+                human_check = is_human_check_url(self.browser.current_url)
+                if not human_check:
+                    # A page not rendered in time would be parsed (and cached) as a company with no data
+                    if not self.readiness.wait_for_company_page():
+                        return None
+                    page_source = self.browser.page_source
+        except:
+            return None
+
+        if human_check:
+            raise HumanCheckException
+
+        return page_source
+
+    def fetch(self, url):
+        # Raises CannotProceedScrapingException if LinkedIn asks for the Human Check (the company workers run only
+        # in headless mode, where it can not be done)
+        if self.resolver.interrupted:
+            raise CannotProceedScrapingException
+
+        # The browser is leased for a single page, so the scrapers are not starved of browsers
+        try:
+            self.browser = self.resolver.browser_pool.acquire()
+        except:
+            # No browser could be started: the profiles waiting for the company get the data of their profile page
+            with open("errlog.txt", "a") as errlog:
+                traceback.print_exc(file=errlog)
+            return None
+        self.readiness = PageReadiness.from_config(self.browser, self.resolver.config)
+        try:
+            return self.get_company_data(url)
+        except HumanCheckException:
+            raise CannotProceedScrapingException
+        except:
+            return None
+        finally:
+            self.resolver.browser_pool.release(self.browser)
+            self.browser = None
+            self.readiness = None
+
+    def run(self):
+        url = self.resolver.fetch_queue.get()
+        while url is not None:
+            try:
+                self.resolver.fetched(url, self.fetch(url))
+            except CannotProceedScrapingException:
+                self.resolver.interrupt(url)
+            url = self.resolver.fetch_queue.get()
+
+        self.company_cache.close()
+
+
+class CompanyResolver:
+    """Stage resolving the company pages of the scraped profiles, separated from the scraping of the profiles.
+
+    Each distinct company page is fetched once, by a dedicated pool of workers, no matter how many profiles are
+    waiting for it. The scrapers hand over the profiles with resolve() and move to the next entry: the jobs of
+    a profile are joined with the company data once all of its companies are resolved.
+    """
+
+    def __init__(self, browser_pool, config, workers, company_cache, capture=None):
+        self.browser_pool = browser_pool
+        self.config = config
+        self.company_cache = company_cache
+        self.capture = capture
+
+        self.fetch_queue = Queue()
+
+        # Company pages requested and not fetched yet (normalized url => Future of the company data)
+        self._fetches = {}
+        # Profiles waiting for the data of their companies
+        self._pending_profiles = 0
+        self._lock = Lock()
+
+        # Set when LinkedIn asks for the Human Check on a company page: the scraping stops
+        self.interrupted = False
+
+        self.workers = []
+        for _ in range(workers):
+            self.workers.append(CompanyPageFetcher(self))
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+
+    def is_alive(self):
+        # Alive while some profiles are still waiting for their companies
+        with self._lock:
+            return self._pending_profiles > 0
+
+    def request(self, url):
+        # Returns the Future of the company data (as returned by ProfileBuilder.get_company_data) of the url
+        key = canonical_company_url(url)
+
+        with self._lock:
+            fetch = self._fetches.get(key)
+            if fetch is not None:
+                return fetch
+
+        # The cache is read outside the lock, so the scrapers do not wait for each other's disk I/O
+        company_data = self.company_cache.get(url)
+        if company_data is None:
+            with self._lock:
+                fetch = self._fetches.get(key)
+                if fetch is None:
+                    fetch = Future()
+                    self._fetches[key] = fetch
+                    self.fetch_queue.put(url)
+                return fetch
+
+        if self.capture is not None:
+            # No page is visited for the companies already in the cache: the replay needs their data
+            self.capture.save_company_data(url, company_data)
+
+        fetch = Future()
+        fetch.set_result({'industry': company_data['industry'],
+                          'companyname': company_data['companyname'],
+                          'location': Location.from_string(company_data['location'])})
+        return fetch
+
+    def fetched(self, url, company_data):
+        # Called by the workers: the company data is in the company cache from now on
+        with self._lock:
+            fetch = self._fetches.pop(canonical_company_url(url))
+        fetch.set_result(company_data)
+
+    def interrupt(self, url):
+        # Called by the workers when LinkedIn asks for the Human Check: the profiles waiting for the company, and
+        # the ones of the companies still to fetch, are not completed
+        if not self.interrupted:
+            print("Company resolver: Human Check requested by LinkedIn, the scraping is stopping")
+        self.interrupted = True
+        with self._lock:
+            fetch = self._fetches.pop(canonical_company_url(url))
+        fetch.set_exception(CannotProceedScrapingException())
+
+    def resolve(self, scraping_result, company_urls):
+        # Returns the Future of the ScrapingResult with the jobs joined with the data of their companies
+        result = Future()
+
+        urls = distinct_company_urls(company_urls)
+        if scraping_result.is_error() or len(urls) == 0:
+            result.set_result(scraping_result)
+            return result
+
+        with self._lock:
+            self._pending_profiles += 1
+
+        fetches = {}
+        for url in urls:
+            fetches[url] = self.request(url)
+
+        remaining = [len(fetches)]
+        remaining_lock = Lock()
+
+        def company_resolved(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+
+            if any(fetch.exception() is not None for fetch in fetches.values()):
+                result.set_result(ScrapingResult('TerminatedDueToHumanCheckError'))
+            else:
+                companies = {}
+                for url, fetch in fetches.items():
+                    if fetch.result() is not None:
+                        companies[url] = fetch.result()
+
+                result.set_result(join_company_data(scraping_result, company_urls, companies))
+
+            with self._lock:
+                self._pending_profiles -= 1
+
+        for fetch in fetches.values():
+            fetch.add_done_callback(company_resolved)
+
+        return result
+
+    def close(self):
+        for _ in self.workers:
+            self.fetch_queue.put(None)
+        for worker in self.workers:
+            worker.join()
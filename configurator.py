@@ -4,12 +4,20 @@ from sys import platform
 
 import pyttsx3
 
+from page_readiness import DEFAULT_TIMEOUTS, DEFAULT_DOM_QUIET_TIME
+from page_scroller import DEFAULT_STABLE_OBSERVATIONS, DEFAULT_TIME_BUDGET
+
 config = ConfigParser()
 
 config.add_section('system')
 config.add_section('linkedin')
 config.add_section('profiles_data')
 config.add_section('profiles_data_by_name')
+config.add_section('company_cache')
+config.add_section('timeouts')
+config.add_section('fingerprints')
+config.add_section('scrolling')
+config.add_section('sales_export')
 
 print("Welcome to the configuration process.")
 
@@ -107,6 +115,18 @@ append_timestamp = input()
 append_timestamp = append_timestamp if not append_timestamp == "" else "Y"
 config.set('profiles_data', 'append_timestamp', append_timestamp)
 
+# Every scraped profile is saved here immediately, so that an interrupted run can be resumed
+config.set('profiles_data', 'journal_file_name', 'results_journal.jsonl')
+
+# Directory where the html of the visited pages is saved when scraping with --capture
+config.set('profiles_data', 'capture_directory', 'captures')
+
+# Profiles per row group of the Parquet tables written with --parquet
+config.set('profiles_data', 'parquet_row_group_size', '10000')
+
+# Timing report of the stages written when scraping with --report (Prometheus text format if ending in .prom)
+config.set('profiles_data', 'report_file_name', 'run_report.json')
+
 print("Insert the file name containing people names.")
 print("Notice: It doesn't matter if it doesn't exist right now.")
 print("Leave blank for default option (profiles_names.txt)")
@@ -139,6 +159,8 @@ append_timestamp = input()
 append_timestamp = append_timestamp if not append_timestamp == "" else "Y"
 config.set('profiles_data_by_name', 'append_timestamp', append_timestamp)
 
+config.set('profiles_data_by_name', 'parquet_row_group_size', '1000')
+
 print("How many threads do you want to be spawn maximum?")
 print("Leave blank for default option (4)")
 print("> ", end="")
@@ -146,6 +168,41 @@ max_threads = input()
 max_threads = max_threads if not max_threads == "" else "4"
 config.set("system", "max_threads", max_threads)
 
+# Chrome profiles (keeping the LinkedIn session between runs), memory limit (resident memory of all the Chrome
+# processes of a browser) before a browser is restarted, and attempts to start a browser before giving up
+config.set("system", "browser_profiles_directory", "browser_profiles")
+config.set("system", "browser_max_memory_mb", "2048")
+config.set("system", "browser_spawn_attempts", "3")
+
+# Workers fetching the company pages, separately from the scrapers of the profiles
+config.set("system", "company_workers", "2")
+
+# Number of times an entry failing with an unexpected error is scraped again
+config.set("system", "max_retries", "1")
+
+# Company pages already scraped are reused across runs until they expire
+config.set('company_cache', 'file_name', 'companies_cache.sqlite')
+config.set('company_cache', 'ttl_days', '30')
+config.set('company_cache', 'max_entries', '100000')
+
+# Browsers opening the Sales Navigator results in parallel (at most link_queue_size links wait for them), and
+# leads already resolved by previous exports
+config.set('sales_export', 'link_workers', '3')
+config.set('sales_export', 'link_queue_size', '100')
+config.set('sales_export', 'cache_file_name', 'salesnav_links.sqlite')
+
+# Fingerprints of the scraped profiles: unchanged profiles are not scraped again by the next runs
+config.set('fingerprints', 'file_name', 'profiles_fingerprints.sqlite')
+
+# Maximum waiting time (seconds) of each scraping step: steps end as soon as the page is ready
+for step, timeout in DEFAULT_TIMEOUTS.items():
+    config.set('timeouts', step, str(timeout))
+config.set('timeouts', 'dom_quiet_time', str(DEFAULT_DOM_QUIET_TIME))
+
+# Pages are scrolled until their height stays the same for this many observations, within a time budget (seconds)
+config.set('scrolling', 'stable_observations', str(DEFAULT_STABLE_OBSERVATIONS))
+config.set('scrolling', 'time_budget', str(DEFAULT_TIME_BUDGET))
+
 with open('config.ini', 'w') as f:
     config.write(f)
 
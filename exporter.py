@@ -0,0 +1,99 @@
+import time
+
+import xlsxwriter
+
+from instrumentation import timers
+from utils import boolean_to_string_xls, date_to_string_xls
+
+PROFILES_HEADERS = ['Name', 'Email', 'Skills', 'Company', 'Industry', 'Job Title', 'City', 'Country',
+                    'DATE FIRST JOB EVER', 'DATE FIRST JOB AFTER BEGINNING POLIMI',
+                    'DATE FIRST JOB AFTER ENDING POLIMI', 'JOB WITHIN 3 MONTHS', 'JOB WITHIN 5 MONTHS',
+                    'JOB WITHIN 6 MONTHS', 'JOB WHILE STUDYING', 'MORE THAN ONE JOB POSITION',
+                    'NOT CURRENTLY EMPLOYED', 'NEVER HAD JOBS']
+
+SIMPLE_PROFILES_HEADERS = ['Name', 'Email', 'Skills', 'Company', 'Industry', 'Job Title', 'Location',
+                           'DATE FIRST JOB', 'DATE LAST JOB', 'DATE FIRST GRADUATION', 'education', 'institution']
+
+
+def get_output_file_name(config, section):
+    output_file_name = config.get(section, 'output_file_name')
+    if config.get(section, 'append_timestamp') == 'Y':
+        output_file_name_splitted = output_file_name.split('.')
+        output_file_name = "".join(output_file_name_splitted[0:-1]) + "_" + str(int(time.time())) + "." + \
+                           output_file_name_splitted[-1]
+    return output_file_name
+
+
+def profiles_row(p):
+    return [
+        p.profile_name,
+        p.email,
+        ",".join(p.skills),
+        p.current_job.company.name,
+        p.current_job.company.industry,
+        p.current_job.position,
+        p.current_job.location.city,
+        p.current_job.location.country,
+        date_to_string_xls(p.jobs_history.first_job_ever_date),
+        date_to_string_xls(p.jobs_history.date_first_job_after_beginning_university),
+        date_to_string_xls(p.jobs_history.date_first_job_after_ending_university),
+        boolean_to_string_xls(p.jobs_history.had_job_after_graduation_within_3_months),
+        boolean_to_string_xls(p.jobs_history.had_job_after_graduation_within_5_months),
+        boolean_to_string_xls(p.jobs_history.had_job_after_graduation_within_6_months),
+        boolean_to_string_xls(p.jobs_history.had_job_while_studying),
+        boolean_to_string_xls(p.jobs_history.more_than_a_job_now),
+        boolean_to_string_xls(p.jobs_history.is_currently_unemployed),
+        boolean_to_string_xls(p.jobs_history.never_had_jobs)
+    ]
+
+
+def simple_profiles_row(p):
+    return [
+        p.profile_name,
+        p.email,
+        ",".join(p.skills),
+        p.current_job.company.name,
+        p.current_job.company.industry,
+        p.current_job.position,
+        p.current_job.location.full_string,
+        p.job_list[-1].daterange,
+        p.job_list[0].daterange,
+        p.edu_list[-1].end_year,
+        "{}, {}".format(p.edu_list[-1].degreename, p.edu_list[-1].field),
+        p.edu_list[-1].institution
+    ]
+
+
+class XlsxExporter:
+    """Writes the scraping results to an xlsx file one row at a time, keeping memory usage constant"""
+
+    def __init__(self, file_name, headers, row_builder):
+        self.file_name = file_name
+        self.headers = headers
+        self.row_builder = row_builder
+
+        # In constant_memory mode each row is flushed to disk as soon as the next one is started
+        self.workbook = xlsxwriter.Workbook(file_name, {'constant_memory': True})
+        self.worksheet = self.workbook.add_worksheet()
+
+        self.worksheet.write_row(0, 0, headers)
+        self.rows = 1
+
+    def write(self, scraping_result):
+        with timers.stage('export_row'):
+            if scraping_result.is_error():
+                data = ['Error_' + scraping_result.message] * len(self.headers)
+            else:
+                data = self.row_builder(scraping_result.profile)
+
+            self.worksheet.write_row(self.rows, 0, data)
+        self.rows += 1
+
+    def write_all(self, scraping_results):
+        # Accepts any iterable, so results can be consumed while they are still being produced
+        for scraping_result in scraping_results:
+            self.write(scraping_result)
+
+    def close(self):
+        with timers.stage('export_close'):
+            self.workbook.close()
@@ -0,0 +1,82 @@
+import json
+import sqlite3
+import threading
+import time
+
+from linkedin_urls import canonical_profile_url
+from utils import Profile
+
+
+class FingerprintStore:
+    """Content fingerprint of each scraped profile, with the Profile built from it, persisted on a SQLite file.
+
+    When a profile page has the same fingerprint of the previous run, the stored Profile is reused and the
+    profile is not scraped again. Hits and misses are counted for the end of run report.
+    """
+
+    def __init__(self, file_name, reuse=True):
+        self.file_name = file_name
+
+        # When False the stored profiles are never reused, but the fingerprints are still updated
+        self.reuse = reuse
+
+        self.hits = 0
+        self.misses = 0
+        self._counters_lock = threading.Lock()
+
+        # sqlite3 connections can not be shared between threads: each thread lazily opens its own
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS profiles ("
+                           "url TEXT PRIMARY KEY, "
+                           "fingerprint TEXT, "
+                           "profile TEXT, "
+                           "updated_at REAL)")
+        connection.commit()
+
+    @classmethod
+    def from_config(cls, config, reuse=True):
+        return cls(config.get('fingerprints', 'file_name', fallback='profiles_fingerprints.sqlite'), reuse)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.file_name, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def lookup(self, url, fingerprint):
+        # Returns the stored Profile if the fingerprint did not change, None otherwise
+        profile = None
+        if fingerprint is not None and self.reuse:
+            row = self._connection().execute("SELECT profile FROM profiles WHERE url = ? AND fingerprint = ?",
+                                             (canonical_profile_url(url), fingerprint)).fetchone()
+            if row is not None:
+                profile = Profile.from_dict(json.loads(row[0]))
+
+        with self._counters_lock:
+            if profile is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return profile
+
+    def put(self, url, fingerprint, profile):
+        connection = self._connection()
+        connection.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                           (canonical_profile_url(url), fingerprint, json.dumps(profile.to_dict()), time.time()))
+        connection.commit()
+
+    def report(self):
+        total = self.hits + self.misses
+        ratio = self.hits / total * 100 if total > 0 else 0
+        return f"{self.hits} unchanged profiles reused, {self.misses} scraped ({ratio:.1f}% hits)"
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,118 @@
+import hashlib
+from collections import namedtuple
+from datetime import datetime
+
+from linkedin_urls import canonical_profile_url
+
+# Lines of the input file that can not be scraped: line_number starts from 1
+BadEntry = namedtuple('BadEntry', ['line_number', 'entry', 'reason'])
+
+# Bad entries kept for the report: the others are only counted
+MAX_REPORTED_BAD_ENTRIES = 100
+
+
+def parse_entry(entry, delimiter):
+    # This function supports data as:
+    #
+    #   https://www.linkedin.com/in/federicohaag ==> parse name, email, last job
+    #
+    #   https://www.linkedin.com/in/federicohaag:::01/01/1730 ==> parse name, email, last job
+    #   and also produces a "job history summary" returning if the person was working while studying,
+    #   and how fast she/he got a job after the graduation.
+    #   As graduation date is used the one passed as parameter, NOT the date it could be on LinkedIn
+    #
+    # Returns the canonical url of the profile and the graduation date (None if not given).
+    # Raises ValueError, with the reason as message, if the entry is not formatted as above.
+
+    profile_data = entry.split(delimiter)
+    if len(profile_data) > 2:
+        raise ValueError(f"more than one '{delimiter}'")
+
+    profile_linkedin_url = canonical_profile_url(profile_data[0])
+    if profile_linkedin_url is None:
+        raise ValueError("not the url of a LinkedIn profile")
+
+    profile_known_graduation_date = None
+    if len(profile_data) == 2:
+        try:
+            profile_known_graduation_date = datetime.strptime(profile_data[1].strip(), '%d/%m/%y')
+        except ValueError:
+            raise ValueError(f"graduation date '{profile_data[1].strip()}' is not formatted as DD/MM/YY")
+
+    return profile_linkedin_url, profile_known_graduation_date
+
+
+class InputFile:
+    """Entries of the profiles input file.
+
+    The file is read once when created: each entry is validated, and the bad ones and the ones repeating the
+    profile of a previous entry are put aside. Iterating on the InputFile then reads the file again, one line
+    at a time, yielding the remaining entries: the entries are never all in memory.
+    """
+
+    def __init__(self, file_name, delimiter, completed_entries=None):
+        self.file_name = file_name
+        self.delimiter = delimiter
+
+        self.bad_entries = []
+        self.number_of_bad_entries = 0
+        self.duplicates = 0
+
+        # Entries to iterate on, and how many of them are not in completed_entries (e.g. done by a previous run)
+        self.total = 0
+        self.to_scrape = 0
+
+        # Numbers of the lines not yielded: usually a few, compared to the lines of the file
+        self._skipped_lines = set()
+
+        self._validate(completed_entries if completed_entries is not None else set())
+
+    def _lines(self):
+        with open(self.file_name, "r") as input_file:
+            for line_number, line in enumerate(input_file, 1):
+                entry = line.strip()
+                if entry != '':
+                    yield line_number, entry
+
+    def _validate(self, completed_entries):
+        # 128 bit digests of the canonical urls met so far: they take less memory than the urls, and unlike hash()
+        # two different urls do not get the same one in practice
+        profiles = set()
+
+        for line_number, entry in self._lines():
+            try:
+                profile_linkedin_url, _ = parse_entry(entry, self.delimiter)
+            except ValueError as e:
+                self.number_of_bad_entries += 1
+                if len(self.bad_entries) < MAX_REPORTED_BAD_ENTRIES:
+                    self.bad_entries.append(BadEntry(line_number, entry, str(e)))
+                self._skipped_lines.add(line_number)
+                continue
+
+            key = hashlib.blake2b(profile_linkedin_url.encode('utf-8'), digest_size=16).digest()
+            if key in profiles:
+                self.duplicates += 1
+                self._skipped_lines.add(line_number)
+                continue
+            profiles.add(key)
+
+            self.total += 1
+            if entry not in completed_entries:
+                self.to_scrape += 1
+
+    def __iter__(self):
+        for line_number, entry in self._lines():
+            if line_number not in self._skipped_lines:
+                yield entry
+
+    def report(self):
+        lines = [f"{self.total} profiles in {self.file_name}"]
+        if self.duplicates > 0:
+            lines.append(f"{self.duplicates} duplicated entries skipped")
+        if self.number_of_bad_entries > 0:
+            lines.append(f"{self.number_of_bad_entries} bad entries skipped:")
+            for bad_entry in self.bad_entries:
+                lines.append(f"  line {bad_entry.line_number}: {bad_entry.reason} ({bad_entry.entry})")
+            if self.number_of_bad_entries > len(self.bad_entries):
+                lines.append(f"  ... and {self.number_of_bad_entries - len(self.bad_entries)} more")
+        return '\n'.join(lines)
@@ -0,0 +1,164 @@
+import json
+import time
+from bisect import bisect_left
+from threading import Lock
+
+# Upper bounds (seconds) of the histogram buckets: from 1µs to ~17 minutes, 4 buckets per doubling, so that
+# percentiles are estimated within ~20%. Durations above the last bound fall in an overflow bucket.
+BUCKET_BOUNDS = tuple(0.000001 * 2 ** (i / 4) for i in range(121))
+
+PERCENTILES = (50, 95, 99)
+
+
+class StageHistogram:
+    """Durations of a stage, kept as counts per bucket: memory does not grow with the number of samples"""
+
+    __slots__ = ('counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, seconds):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, percent):
+        # Upper bound of the bucket holding the requested rank, never above the longest duration seen
+        if self.count == 0:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count > 0:
+                if bucket == len(BUCKET_BOUNDS):
+                    return self.maximum
+                return min(BUCKET_BOUNDS[bucket], self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        data = {'count': self.count,
+                'total_seconds': self.total,
+                'mean_seconds': self.total / self.count if self.count > 0 else None,
+                'min_seconds': self.minimum,
+                'max_seconds': self.maximum}
+        for percent in PERCENTILES:
+            data[f"p{percent}_seconds"] = self.percentile(percent)
+        return data
+
+
+class _StageTimer:
+    __slots__ = ('timers', 'name', 'start_time')
+
+    def __init__(self, timers, name):
+        self.timers = timers
+        self.name = name
+        self.start_time = None
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.timers.record(self.name, time.perf_counter() - self.start_time)
+        return False
+
+
+class _DisabledTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        return False
+
+
+_DISABLED_TIMER = _DisabledTimer()
+
+
+class StageTimers:
+    """Per-stage timing of the scraping pipeline.
+
+        with timers.stage('navigation'):
+            browser.get(url)
+
+    While disabled (the default) stage() returns a shared object doing nothing, and nothing is recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = None
+        self.histograms = {}
+        self._lock = Lock()
+
+    def enable(self):
+        self.enabled = True
+        self.start_time = time.time()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _DISABLED_TIMER
+        return _StageTimer(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = StageHistogram()
+            histogram.add(seconds)
+
+    def report(self):
+        with self._lock:
+            return {'start_time': self.start_time,
+                    'elapsed_seconds': time.time() - self.start_time if self.start_time is not None else None,
+                    'stages': {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}}
+
+    def to_prometheus(self):
+        # Prometheus text exposition format: a histogram of the durations plus the estimated percentiles
+        lines = ['# HELP scraper_stage_duration_seconds Duration of the scraping stages.',
+                 '# TYPE scraper_stage_duration_seconds histogram']
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+
+            for name, histogram in histograms:
+                cumulative = 0
+                for bucket, bound in enumerate(BUCKET_BOUNDS):
+                    cumulative += histogram.counts[bucket]
+                    # Only one bound per doubling is exposed, to keep the output short
+                    if bucket % 4 == 0:
+                        lines.append(f'scraper_stage_duration_seconds_bucket{{stage="{name}",le="{bound:g}"}} '
+                                     f'{cumulative}')
+                lines.append(f'scraper_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {histogram.count}')
+                lines.append(f'scraper_stage_duration_seconds_sum{{stage="{name}"}} {histogram.total}')
+                lines.append(f'scraper_stage_duration_seconds_count{{stage="{name}"}} {histogram.count}')
+
+            lines.append('# HELP scraper_stage_duration_percentile_seconds Estimated percentiles of the durations.')
+            lines.append('# TYPE scraper_stage_duration_percentile_seconds gauge')
+            for name, histogram in histograms:
+                for percent in PERCENTILES:
+                    lines.append(f'scraper_stage_duration_percentile_seconds{{stage="{name}",'
+                                 f'quantile="{percent / 100:g}"}} {histogram.percentile(percent)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, file_name):
+        # Prometheus text format for .prom files, JSON otherwise
+        with open(file_name, 'w') as report_file:
+            if file_name.endswith('.prom'):
+                report_file.write(self.to_prometheus())
+            else:
+                json.dump(self.report(), report_file, indent=2)
+
+
+# Shared by all the scrapers of the process
+timers = StageTimers()
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import numpy as np
+
+from job_history_summary import JobHistorySummary
+from utils_dates import split_date_range, is_present_range
+
+# Same offsets (seconds) used by JobHistorySummary
+BEGINNING_OF_UNIVERSITY = 24 * 60 * 60 * 365 * 2
+AFTER_GRADUATION = {3: 24 * 60 * 60 * 365 * (3 / 12),
+                    5: 24 * 60 * 60 * 365 * (5 / 12),
+                    6: 24 * 60 * 60 * 365 * (6 / 12)}
+END_DATE_MARGIN = 24 * 60 * 60 * 31
+
+# Dates are handled as int64 microseconds, the resolution of datetime
+_NO_DATE = np.iinfo(np.int64).max
+
+
+def _to_microseconds(seconds):
+    return np.int64(round(seconds * 1000000))
+
+
+def _to_datetime64(values):
+    return np.array([np.datetime64(value, 'us') if value is not None else np.datetime64('NaT', 'us')
+                     for value in values], dtype='datetime64[us]')
+
+
+class JobHistoryBatch:
+    """JobHistorySummary of a whole cohort, computed with a few vectorized passes over columnar data.
+
+    Profiles are identified by their position (0..n-1). Jobs are given as columns: the profile each job belongs
+    to, its start and end dates (datetime64, NaT when not parsable) and whether it is a current position.
+    Each attribute of JobHistorySummary becomes an array with one value per profile (dates are NaT when None).
+    Results equal the ones of JobHistorySummary when the local timezone has no daylight saving time shifts.
+    """
+
+    def __init__(self, graduation_dates, job_profile_index, job_start_dates, job_end_dates, job_is_present):
+        graduation_dates = np.asarray(graduation_dates, dtype='datetime64[us]')
+        job_profile_index = np.asarray(job_profile_index, dtype=np.int64)
+        job_start_dates = np.asarray(job_start_dates, dtype='datetime64[us]')
+        job_end_dates = np.asarray(job_end_dates, dtype='datetime64[us]')
+        job_is_present = np.asarray(job_is_present, dtype=bool)
+
+        profiles = len(graduation_dates)
+
+        jobs = np.bincount(job_profile_index, minlength=profiles)
+        self.jobs_now = np.bincount(job_profile_index, weights=job_is_present, minlength=profiles).astype(np.int64)
+        self.more_than_a_job_now = self.jobs_now > 1
+        self.is_currently_unemployed = self.jobs_now == 0
+        self.never_had_jobs = jobs == 0
+
+        # Only the jobs of profiles having a graduation date contribute to the remaining attributes
+        graduation = graduation_dates.astype(np.int64)[job_profile_index]
+        valid = ~np.isnat(graduation_dates)[job_profile_index] & ~np.isnat(job_start_dates) & ~np.isnat(job_end_dates)
+
+        graduation = graduation[valid]
+        profile_index = job_profile_index[valid]
+        initial_date = job_start_dates.astype(np.int64)[valid]
+        end_date = job_end_dates.astype(np.int64)[valid] + _to_microseconds(END_DATE_MARGIN)
+
+        beginning_of_university = graduation - _to_microseconds(BEGINNING_OF_UNIVERSITY)
+
+        def any_per_profile(mask):
+            return np.bincount(profile_index[mask], minlength=profiles) > 0
+
+        def min_per_profile(mask):
+            result = np.full(profiles, _NO_DATE, dtype=np.int64)
+            np.minimum.at(result, profile_index[mask], initial_date[mask])
+            result = result.astype('datetime64[us]')
+            result[result == np.datetime64(_NO_DATE, 'us')] = np.datetime64('NaT')
+            return result
+
+        self.first_job_ever_date = min_per_profile(np.ones(len(initial_date), dtype=bool))
+        self.date_first_job_after_beginning_university = min_per_profile(initial_date >= beginning_of_university)
+        self.date_first_job_after_ending_university = min_per_profile(initial_date > graduation)
+
+        self.had_job_while_studying = any_per_profile((beginning_of_university <= initial_date)
+                                                      & (initial_date <= graduation))
+        self.had_job_after_graduation = any_per_profile((initial_date <= graduation) & (graduation <= end_date))
+
+        within = {}
+        for months, offset in AFTER_GRADUATION.items():
+            after_graduation = graduation + _to_microseconds(offset)
+            within[months] = any_per_profile((initial_date <= after_graduation) & (after_graduation <= end_date))
+        self.had_job_after_graduation_within_3_months = within[3]
+        self.had_job_after_graduation_within_5_months = within[5]
+        self.had_job_after_graduation_within_6_months = within[6]
+
+    @classmethod
+    def from_date_ranges(cls, graduation_dates, job_positions_data_ranges):
+        # Same inputs of JobHistorySummary, one item per profile: each distinct date range string is parsed once
+        parsed_ranges = {}
+        job_profile_index = []
+        job_start_dates = []
+        job_end_dates = []
+        job_is_present = []
+
+        for i, data_ranges in enumerate(job_positions_data_ranges):
+            for data_range in data_ranges:
+                if data_range not in parsed_ranges:
+                    parsed_ranges[data_range] = split_date_range(data_range)
+                initial_date, end_date = parsed_ranges[data_range]
+                job_profile_index.append(i)
+                job_start_dates.append(initial_date)
+                job_end_dates.append(end_date)
+                job_is_present.append(is_present_range(data_range))
+
+        return cls(_to_datetime64(graduation_dates), job_profile_index, _to_datetime64(job_start_dates),
+                   _to_datetime64(job_end_dates), job_is_present)
+
+    def summary(self, i):
+        # JobHistorySummary of the i-th profile
+        fields = {}
+
+        for field in ['had_job_while_studying', 'had_job_after_graduation', 'had_job_after_graduation_within_3_months',
+                      'had_job_after_graduation_within_5_months', 'had_job_after_graduation_within_6_months',
+                      'more_than_a_job_now', 'is_currently_unemployed', 'never_had_jobs']:
+            fields[field] = bool(getattr(self, field)[i])
+        fields['jobs_now'] = int(self.jobs_now[i])
+
+        for field in ['date_first_job_after_beginning_university', 'date_first_job_after_ending_university',
+                      'first_job_ever_date']:
+            value = getattr(self, field)[i]
+            fields[field] = None if np.isnat(value) else value.astype(datetime)
+
+        return JobHistorySummary()._replace(**fields)
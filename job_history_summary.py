@@ -1,32 +1,43 @@
+from collections import namedtuple
 from datetime import datetime
 
-from utils_dates import split_date_range
+from utils_dates import split_date_range, is_present_range
 
+DATE_FIELDS = ['date_first_job_after_beginning_university', 'date_first_job_after_ending_university',
+               'first_job_ever_date']
 
-class JobHistorySummary:
-    def __init__(self, graduation_date=None, job_positions_data_ranges=None):
 
-        self.had_job_while_studying = False
-        self.had_job_after_graduation_within_3_months = False
-        self.had_job_after_graduation_within_5_months = False
-        self.had_job_after_graduation_within_6_months = False
+class JobHistorySummary(namedtuple('JobHistorySummary', [
+        'had_job_while_studying', 'had_job_after_graduation', 'had_job_after_graduation_within_3_months',
+        'had_job_after_graduation_within_5_months', 'had_job_after_graduation_within_6_months',
+        'date_first_job_after_beginning_university', 'date_first_job_after_ending_university',
+        'first_job_ever_date', 'jobs_now', 'more_than_a_job_now', 'is_currently_unemployed', 'never_had_jobs'])):
+    __slots__ = ()
 
-        self.date_first_job_after_beginning_university = None
-        self.date_first_job_after_ending_university = None
-        self.first_job_ever_date = None
+    def __new__(cls, graduation_date=None, job_positions_data_ranges=None):
 
-        self.jobs_now = 0
+        had_job_while_studying = False
+        had_job_after_graduation = False
+        had_job_after_graduation_within_3_months = False
+        had_job_after_graduation_within_5_months = False
+        had_job_after_graduation_within_6_months = False
+
+        date_first_job_after_beginning_university = None
+        date_first_job_after_ending_university = None
+        first_job_ever_date = None
+
+        jobs_now = 0
 
         if job_positions_data_ranges is None:
             job_positions_data_ranges = []
 
         for data_range in job_positions_data_ranges:
-            if 'present' in data_range.lower():
-                self.jobs_now += 1
+            if is_present_range(data_range):
+                jobs_now += 1
 
-        self.more_than_a_job_now = self.jobs_now > 1
-        self.is_currently_unemployed = self.jobs_now == 0
-        self.never_had_jobs = len(job_positions_data_ranges) == 0
+        more_than_a_job_now = jobs_now > 1
+        is_currently_unemployed = jobs_now == 0
+        never_had_jobs = len(job_positions_data_ranges) == 0
 
         if graduation_date is not None and len(job_positions_data_ranges) > 0:
 
@@ -45,39 +56,71 @@ class JobHistorySummary:
                 initial_date, end_date = split_date_range(date_range)
                 end_date = datetime.fromtimestamp(datetime.timestamp(end_date) + 24 * 60 * 60 * 31)
 
-                if self.first_job_ever_date is None:
-                    self.first_job_ever_date = initial_date
+                if first_job_ever_date is None:
+                    first_job_ever_date = initial_date
                 else:
-                    if initial_date < self.first_job_ever_date:
-                        self.first_job_ever_date = initial_date
+                    if initial_date < first_job_ever_date:
+                        first_job_ever_date = initial_date
 
                 # Checking if was working while studying
                 if beginning_of_university <= initial_date <= graduation_date:
-                    self.had_job_while_studying = True
+                    had_job_while_studying = True
 
                 if initial_date >= beginning_of_university:
 
-                    if self.date_first_job_after_beginning_university is None:
-                        self.date_first_job_after_beginning_university = initial_date
+                    if date_first_job_after_beginning_university is None:
+                        date_first_job_after_beginning_university = initial_date
                     else:
-                        if initial_date < self.date_first_job_after_beginning_university:
-                            self.date_first_job_after_beginning_university = initial_date
+                        if initial_date < date_first_job_after_beginning_university:
+                            date_first_job_after_beginning_university = initial_date
 
                 if initial_date <= graduation_date <= end_date:
-                    self.had_job_after_graduation = True
+                    had_job_after_graduation = True
 
                 if initial_date > graduation_date:
-                    if self.date_first_job_after_ending_university is None:
-                        self.date_first_job_after_ending_university = initial_date
+                    if date_first_job_after_ending_university is None:
+                        date_first_job_after_ending_university = initial_date
                     else:
-                        if initial_date < self.date_first_job_after_ending_university:
-                            self.date_first_job_after_ending_university = initial_date
+                        if initial_date < date_first_job_after_ending_university:
+                            date_first_job_after_ending_university = initial_date
 
                 if initial_date <= three_months_after_graduation_date <= end_date:
-                    self.had_job_after_graduation_within_3_months = True
+                    had_job_after_graduation_within_3_months = True
 
                 if initial_date <= five_months_after_graduation_date <= end_date:
-                    self.had_job_after_graduation_within_5_months = True
+                    had_job_after_graduation_within_5_months = True
 
                 if initial_date <= six_months_after_graduation_date <= end_date:
-                    self.had_job_after_graduation_within_6_months = True
+                    had_job_after_graduation_within_6_months = True
+
+        return super().__new__(cls, had_job_while_studying, had_job_after_graduation,
+                               had_job_after_graduation_within_3_months, had_job_after_graduation_within_5_months,
+                               had_job_after_graduation_within_6_months, date_first_job_after_beginning_university,
+                               date_first_job_after_ending_university, first_job_ever_date, jobs_now,
+                               more_than_a_job_now, is_currently_unemployed, never_had_jobs)
+
+    def __reduce__(self):
+        # The fields are not the arguments of the constructor
+        return self._make, (tuple(self),)
+
+    def to_tuple(self):
+        return tuple(self)
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls._make(data)
+
+    def to_dict(self):
+        data = dict(self._asdict())
+        for field in DATE_FIELDS:
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        for field in DATE_FIELDS:
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return cls._make(data[field] for field in cls._fields)
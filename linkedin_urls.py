@@ -0,0 +1,96 @@
+import re
+from urllib.parse import quote, unquote, urlparse
+
+# Validation and canonicalization of the LinkedIn urls. The patterns are compiled once, at import time.
+#
+# Every variant of a profile (or company) url maps to one canonical url, used as key by the caches and to
+# find the duplicated entries of the input file:
+#
+#   http://it.linkedin.com/in/FedericoHaag?trk=x ==> https://www.linkedin.com/in/federicohaag/
+#   linkedin.com/company/acme/about/             ==> https://www.linkedin.com/company/acme/
+#
+# Urls of any other host are not LinkedIn urls, except the ones of a mock of LinkedIn enabled by the configuration
+# (see allow_mock_linkedin).
+
+# scheme (optional), host, kind of page and its identifier; anything after the identifier is dropped
+_ENTITY_URL = re.compile(
+    r'^(?:(?P<scheme>https?)://)?'
+    r'(?P<host>[^/?#\s]+)'
+    r'/(?P<kind>in|company)/'
+    r'(?P<slug>[^/?#\s]+)'
+    r'(?:[/?#]\S*)?$', re.IGNORECASE)
+
+# www.linkedin.com, linkedin.com and the locale subdomains (it.linkedin.com, de.linkedin.com, ...)
+_LINKEDIN_HOST = re.compile(r'^(?:(?:www|[a-z]{2,3})\.)?linkedin\.com(?::443)?$', re.IGNORECASE)
+
+# Profile urls written in the html of a page (e.g. in the JSON data embedded in the Sales Navigator pages)
+_PROFILE_URL_IN_PAGE = re.compile(r'https://www\.linkedin\.com/in/[^"\'\s,<>&\\]+')
+
+# Pages LinkedIn redirects to when it asks for the Human Check (or for a new login)
+_HUMAN_CHECK_PATH = re.compile(r'^/(?:checkpoint|authwall|uas/login|login)(?:[/?#]|$)', re.IGNORECASE)
+
+# Sales Navigator lead: /sales/people/<lead id>,<search type>,<search token> (or /sales/lead/...)
+_SALES_LEAD_URL = re.compile(r'/sales/(?:people|lead)/(?P<lead>[^,/?#\s]+)', re.IGNORECASE)
+
+LINKEDIN_BASE_URL = 'https://www.linkedin.com'
+
+UNAVAILABLE_PROFILE_URL = 'https://www.linkedin.com/in/unavailable/'
+
+# Scheme and host of the mock of LinkedIn whose urls are accepted too, None when there is none
+_mock_base_url = None
+
+
+def allow_mock_linkedin(config):
+    # [system] mock_linkedin_url, e.g. http://127.0.0.1:8000 for benchmarks/mock_linkedin.py: its urls keep their
+    # own scheme and host. Never set it when scraping LinkedIn.
+    global _mock_base_url
+    mock_base_url = config.get('system', 'mock_linkedin_url', fallback='').strip().rstrip('/').lower()
+    _mock_base_url = mock_base_url if mock_base_url != '' else None
+
+
+def _canonical_url(url, kind):
+    match = _ENTITY_URL.match(url.strip())
+    if match is None or match.group('kind').lower() != kind:
+        return None
+
+    host = match.group('host').lower()
+    if _LINKEDIN_HOST.match(host):
+        base_url = LINKEDIN_BASE_URL
+    elif f"{(match.group('scheme') or 'https').lower()}://{host}" == _mock_base_url:
+        base_url = _mock_base_url
+    else:
+        return None
+
+    # Identifiers are case insensitive, and may be percent-encoded or not
+    slug = quote(unquote(match.group('slug')).lower(), safe='-_.~')
+    return f"{base_url}/{kind}/{slug}/"
+
+
+def canonical_profile_url(url):
+    # None if url is not the one of a profile
+    return _canonical_url(url, 'in')
+
+
+def canonical_company_url(url):
+    # None if url is not the one of a company page
+    return _canonical_url(url, 'company')
+
+
+def is_company_url(url):
+    return canonical_company_url(url) is not None
+
+
+def is_human_check_url(url):
+    return _HUMAN_CHECK_PATH.match(urlparse(url).path) is not None
+
+
+def find_profile_url(page_source):
+    # Canonical url of the first profile found in the html of a page, None if there is none
+    match = _PROFILE_URL_IN_PAGE.search(page_source)
+    return canonical_profile_url(match.group(0)) if match is not None else None
+
+
+def sales_lead_key(url):
+    # The same lead is linked with a different search token by each search: the lead id alone identifies it
+    match = _SALES_LEAD_URL.search(url)
+    return match.group('lead') if match is not None else url.strip().split('?')[0]
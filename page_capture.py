@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from threading import Lock
+
+from linkedin_urls import canonical_company_url
+
+# A capture is a directory containing:
+#   index.jsonl     one record per captured page: {"type": "profile" | "company", "url": ..., "file": ..., ...}
+#                   profile records contain also "email" and "graduation_date" (ISO format or null).
+#                   Companies taken from the company cache have no page: their record has "company_data"
+#                   (industry, companyname, location) in place of "file"
+#   pages/          the html (page_source) of each captured page
+INDEX_FILE_NAME = 'index.jsonl'
+PAGES_DIRECTORY = 'pages'
+
+
+def page_file_name(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+
+
+class PageCapture:
+    """Saves the html of the pages visited by the scrapers, to be replayed offline"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = Lock()
+
+        # Companies already captured (as page or as data) in this run
+        self._companies = set()
+
+        os.makedirs(os.path.join(directory, PAGES_DIRECTORY), exist_ok=True)
+
+    def _save(self, record, page_source):
+        record['file'] = os.path.join(PAGES_DIRECTORY, page_file_name(record['url']))
+
+        with open(os.path.join(self.directory, record['file']), "w", encoding="utf-8") as page_file:
+            page_file.write(page_source)
+
+        self._append(record)
+
+    def _append(self, record):
+        with self._lock:
+            with open(os.path.join(self.directory, INDEX_FILE_NAME), "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(record) + "\n")
+
+    def save_profile(self, url, page_source, email, graduation_date):
+        self._save({'type': 'profile',
+                    'url': url,
+                    'email': email,
+                    'graduation_date': graduation_date.isoformat() if graduation_date is not None else None},
+                   page_source)
+
+    def save_company(self, url, page_source):
+        with self._lock:
+            self._companies.add(canonical_company_url(url))
+        self._save({'type': 'company', 'url': url}, page_source)
+
+    def save_company_data(self, url, company_data):
+        # company_data as stored by the company cache: saved once, however many profiles of the company are scraped
+        with self._lock:
+            key = canonical_company_url(url)
+            if key in self._companies:
+                return
+            self._companies.add(key)
+        self._append({'type': 'company',
+                      'url': url,
+                      'company_data': {'industry': company_data['industry'],
+                                       'companyname': company_data['companyname'],
+                                       'location': company_data['location']}})
+
+
+def load_capture_index(directory):
+    # Returns the profile records, in capture order, and a dictionary company url => company record.
+    # When a page was captured more than once the last capture is used.
+    profiles = {}
+    companies = {}
+
+    with open(os.path.join(directory, INDEX_FILE_NAME), "r", encoding="utf-8") as index_file:
+        for line in index_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record['type'] == 'profile':
+                if record['graduation_date'] is not None:
+                    record['graduation_date'] = datetime.fromisoformat(record['graduation_date'])
+                profiles.pop(record['url'], None)
+                profiles[record['url']] = record
+            else:
+                companies[record['url']] = record
+
+    return list(profiles.values()), companies
+
+
+def read_page(directory, record):
+    with open(os.path.join(directory, record['file']), "r", encoding="utf-8") as page_file:
+        return page_file.read()
@@ -0,0 +1,113 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Default maximum waiting time (seconds) of every step: each step returns as soon as the page is ready
+DEFAULT_TIMEOUTS = {
+    'contact_info': 5,
+    'scroll': 3,
+    'see_more': 5,
+    'sections': 10,
+    'skills': 5,
+    'company_page': 10,
+    'sales_link': 10,
+    'typeahead': 5
+}
+
+# Time (milliseconds) without DOM mutations after which the page is considered stable
+DEFAULT_DOM_QUIET_TIME = 300
+
+# Resolves as soon as the DOM stayed unchanged for arguments[0] ms, or when arguments[1] ms are elapsed
+DOM_QUIET_SCRIPT = """
+var quietTime = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var finished = false, timer = null;
+var observer = new MutationObserver(function() { clearTimeout(timer); timer = setTimeout(finish, quietTime, true); });
+function finish(stable) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(stable);
+}
+observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(finish, quietTime, true);
+setTimeout(finish, timeout, false);
+"""
+
+
+def load_timeouts(config):
+    # Returns the per-step timeouts (seconds) and the DOM quiet time (milliseconds) set in the configuration
+    timeouts = {}
+    for step in DEFAULT_TIMEOUTS:
+        timeouts[step] = float(config.get('timeouts', step, fallback=str(DEFAULT_TIMEOUTS[step])))
+    dom_quiet_time = int(config.get('timeouts', 'dom_quiet_time', fallback=str(DEFAULT_DOM_QUIET_TIME)))
+    return timeouts, dom_quiet_time
+
+
+class PageReadiness:
+    """Explicit waits on the page content, replacing fixed pauses between the scraping steps"""
+
+    def __init__(self, browser, timeouts=None, dom_quiet_time=DEFAULT_DOM_QUIET_TIME):
+        self.browser = browser
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts is not None:
+            self.timeouts.update(timeouts)
+        self.dom_quiet_time = dom_quiet_time
+
+        # Async scripts must be allowed to run at least as long as the longest step
+        self.browser.set_script_timeout(max(self.timeouts.values()) + 5)
+
+    @classmethod
+    def from_config(cls, browser, config):
+        timeouts, dom_quiet_time = load_timeouts(config)
+        return cls(browser, timeouts, dom_quiet_time)
+
+    def wait_for_any(self, step, locators):
+        # Returns True as soon as one of the locators (By, value) matches an element, False on timeout
+        def any_present(browser):
+            for by, value in locators:
+                if len(browser.find_elements(by, value)) > 0:
+                    return True
+            return False
+
+        try:
+            WebDriverWait(self.browser, self.timeouts[step]).until(any_present)
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for_element(self, step, by, value):
+        try:
+            WebDriverWait(self.browser, self.timeouts[step])\
+                .until(expected_conditions.presence_of_element_located((by, value)))
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for_dom_quiet(self, step):
+        # Returns True once no DOM mutation happened for dom_quiet_time ms, False on timeout
+        try:
+            return self.browser.execute_async_script(DOM_QUIET_SCRIPT, self.dom_quiet_time,
+                                                     int(self.timeouts[step] * 1000))
+        except WebDriverException:
+            return False
+
+    def wait_for_contact_info(self):
+        return self.wait_for_element('contact_info', By.CLASS_NAME, 'pv-contact-info__contact-type')
+
+    def wait_for_profile_sections(self):
+        return self.wait_for_any('sections', [(By.ID, 'experience-section'),
+                                              (By.ID, 'education-section')])
+
+    def wait_for_skills(self):
+        return self.wait_for_element('skills', By.CLASS_NAME, 'pv-skill-category-entity')
+
+    def wait_for_typeahead(self):
+        # The candidates are shown as soon as the typeahead appears, then updated while the search completes
+        shown = self.wait_for_element('typeahead', By.CLASS_NAME, 'basic-typeahead__triggered-content')
+        return shown and self.wait_for_dom_quiet('typeahead')
+
+    def wait_for_company_page(self):
+        return self.wait_for_element('company_page', By.CLASS_NAME, 'org-top-card-summary-info-list')
@@ -0,0 +1,126 @@
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from page_readiness import load_timeouts, DEFAULT_DOM_QUIET_TIME, DEFAULT_TIMEOUTS
+
+# Observations in a row of the same page height after which the whole page is considered loaded
+DEFAULT_STABLE_OBSERVATIONS = 2
+
+# Maximum time (seconds) spent scrolling a single page
+DEFAULT_TIME_BUDGET = 30
+
+# Jumps to the bottom of the page and waits until the DOM stayed unchanged for arguments[0] ms (or arguments[1] ms
+# are elapsed). Returns the page height, and whether an element matching the CSS selector arguments[2] is present.
+SCROLL_TO_BOTTOM_SCRIPT = """
+var quietTime = arguments[0], timeout = arguments[1], sentinel = arguments[2], done = arguments[arguments.length - 1];
+var finished = false, timer = null;
+var observer = new MutationObserver(function() { clearTimeout(timer); timer = setTimeout(finish, quietTime); });
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done([document.body.offsetHeight, sentinel !== null && document.querySelector(sentinel) !== null]);
+}
+observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+window.scrollTo(0, document.body.scrollHeight);
+timer = setTimeout(finish, quietTime);
+setTimeout(finish, timeout);
+"""
+
+# Same as SCROLL_TO_BOTTOM_SCRIPT, as a promise awaited by page.evaluate (Playwright)
+SCROLL_TO_BOTTOM_PROMISE = """
+([quietTime, timeout, sentinel]) => new Promise((done) => {
+    let finished = false, timer = null;
+    const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quietTime); });
+    function finish() {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done([document.body.offsetHeight, sentinel !== null && document.querySelector(sentinel) !== null]);
+    }
+    observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+    window.scrollTo(0, document.body.scrollHeight);
+    timer = setTimeout(finish, quietTime);
+    setTimeout(finish, timeout);
+})
+"""
+
+
+class PageScroller:
+    """Loads the whole content of a page (LinkedIn loads it asynchronously based on your scrolling).
+
+    Each observation jumps to the bottom of the page and waits for the DOM to settle. Scrolling ends when the
+    page height stayed the same for stable_observations observations in a row, when the sentinel (CSS selector
+    of an element present only once the needed content is loaded) is found, or when the time budget is over.
+
+    The time spent is kept in elapsed (last page) and total_time (all the pages scrolled).
+    """
+
+    def __init__(self, stable_observations=DEFAULT_STABLE_OBSERVATIONS, time_budget=DEFAULT_TIME_BUDGET,
+                 dom_quiet_time=DEFAULT_DOM_QUIET_TIME, observation_timeout=DEFAULT_TIMEOUTS['scroll']):
+        self.stable_observations = stable_observations
+        self.time_budget = time_budget
+        self.dom_quiet_time = dom_quiet_time
+        self.observation_timeout = observation_timeout
+
+        self.elapsed = 0.0
+        self.total_time = 0.0
+        self.pages = 0
+
+    @classmethod
+    def from_config(cls, config):
+        timeouts, dom_quiet_time = load_timeouts(config)
+        return cls(int(config.get('scrolling', 'stable_observations', fallback=str(DEFAULT_STABLE_OBSERVATIONS))),
+                   float(config.get('scrolling', 'time_budget', fallback=str(DEFAULT_TIME_BUDGET))),
+                   dom_quiet_time, timeouts['scroll'])
+
+    def _arguments(self, sentinel):
+        return [self.dom_quiet_time, int(self.observation_timeout * 1000), sentinel]
+
+    def _is_loaded(self, stable, sentinel_found, deadline):
+        return sentinel_found or stable >= self.stable_observations or time.perf_counter() >= deadline
+
+    def _done(self, start_time):
+        self.elapsed = time.perf_counter() - start_time
+        self.total_time += self.elapsed
+        self.pages += 1
+        return self.elapsed
+
+    def scroll_to_bottom(self, browser, sentinel=None):
+        # Returns the time spent (seconds)
+        start_time = time.perf_counter()
+        deadline = start_time + self.time_budget
+
+        stable = 0
+        last_height = None
+        while True:
+            try:
+                height, sentinel_found = browser.execute_async_script(SCROLL_TO_BOTTOM_SCRIPT,
+                                                                      *self._arguments(sentinel))
+            except WebDriverException:
+                break
+            stable = stable + 1 if height == last_height else 1
+            last_height = height
+            if self._is_loaded(stable, sentinel_found, deadline):
+                break
+
+        return self._done(start_time)
+
+    async def scroll_page_to_bottom(self, page, sentinel=None):
+        # Same as scroll_to_bottom, for a Playwright page
+        start_time = time.perf_counter()
+        deadline = start_time + self.time_budget
+
+        stable = 0
+        last_height = None
+        while True:
+            height, sentinel_found = await page.evaluate(SCROLL_TO_BOTTOM_PROMISE, self._arguments(sentinel))
+            stable = stable + 1 if height == last_height else 1
+            last_height = height
+            if self._is_loaded(stable, sentinel_found, deadline):
+                break
+
+        return self._done(start_time)
@@ -0,0 +1,197 @@
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from instrumentation import timers
+from utils import Job, Education
+
+# Normalized tables of the scraped profiles: every job, education and skill is a row of its own table, linked
+# to its profile by profile_id: the position of the profile row in profiles.parquet, i.e. the order in which the
+# results are written (for a scraping run, the order of the input file, malformed and repeated entries excluded).
+# Columns listed in DICTIONARY_COLUMNS repeat the same few values across many rows and are dictionary-encoded.
+
+PROFILES_SCHEMA = pa.schema([
+    ('profile_id', pa.int64()),
+    ('error', pa.string()),
+    ('profile_name', pa.string()),
+    ('email', pa.string()),
+    ('current_company', pa.string()),
+    ('current_industry', pa.string()),
+    ('current_position', pa.string()),
+    ('current_city', pa.string()),
+    ('current_country', pa.string()),
+    ('current_location', pa.string()),
+    ('first_job_ever_date', pa.timestamp('us')),
+    ('date_first_job_after_beginning_university', pa.timestamp('us')),
+    ('date_first_job_after_ending_university', pa.timestamp('us')),
+    ('had_job_while_studying', pa.bool_()),
+    ('had_job_after_graduation', pa.bool_()),
+    ('had_job_after_graduation_within_3_months', pa.bool_()),
+    ('had_job_after_graduation_within_5_months', pa.bool_()),
+    ('had_job_after_graduation_within_6_months', pa.bool_()),
+    ('jobs_now', pa.int32()),
+    ('more_than_a_job_now', pa.bool_()),
+    ('is_currently_unemployed', pa.bool_()),
+    ('never_had_jobs', pa.bool_())
+])
+
+JOBS_SCHEMA = pa.schema([
+    ('profile_id', pa.int64()),
+    ('job_index', pa.int32()),
+    ('company', pa.string()),
+    ('industry', pa.string()),
+    ('position', pa.string()),
+    ('city', pa.string()),
+    ('country', pa.string()),
+    ('location', pa.string()),
+    ('daterange', pa.string())
+])
+
+EDUCATIONS_SCHEMA = pa.schema([
+    ('profile_id', pa.int64()),
+    ('education_index', pa.int32()),
+    ('institution', pa.string()),
+    ('degreename', pa.string()),
+    ('field', pa.string()),
+    ('start_year', pa.string()),
+    ('end_year', pa.string())
+])
+
+SKILLS_SCHEMA = pa.schema([
+    ('profile_id', pa.int64()),
+    ('skill', pa.string())
+])
+
+SEARCHES_SCHEMA = pa.schema([
+    ('name', pa.string()),
+    ('profile_url', pa.string()),
+    ('education_checked', pa.bool_()),
+    ('checked_status', pa.string())
+])
+
+DICTIONARY_COLUMNS = ['error', 'current_company', 'current_industry', 'current_position', 'current_city',
+                      'current_country', 'current_location', 'company', 'industry', 'position', 'city', 'country',
+                      'location', 'daterange', 'institution', 'degreename', 'field', 'start_year', 'end_year',
+                      'skill', 'checked_status']
+
+JOB_HISTORY_COLUMNS = ['first_job_ever_date', 'date_first_job_after_beginning_university',
+                       'date_first_job_after_ending_university', 'had_job_while_studying',
+                       'had_job_after_graduation', 'had_job_after_graduation_within_3_months',
+                       'had_job_after_graduation_within_5_months', 'had_job_after_graduation_within_6_months',
+                       'jobs_now', 'more_than_a_job_now', 'is_currently_unemployed', 'never_had_jobs']
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+def get_output_directory_name(config, section):
+    # Same name of the xlsx output file, without extension
+    output_directory_name = os.path.splitext(config.get(section, 'output_file_name'))[0]
+    if config.get(section, 'append_timestamp') == 'Y':
+        output_directory_name += "_" + str(int(time.time()))
+    return output_directory_name
+
+
+class ParquetTableWriter:
+    """Parquet file written a row group at a time: rows are buffered column by column and flushed every
+    row_group_size rows, so the file grows while the scraping is running with bounded memory"""
+
+    def __init__(self, file_name, schema, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        self.schema = schema
+        self.row_group_size = row_group_size
+
+        self.writer = pq.ParquetWriter(file_name, schema,
+                                       use_dictionary=[name for name in schema.names if name in DICTIONARY_COLUMNS])
+        self.columns = [[] for _ in schema.names]
+        self.rows = 0
+
+    def append(self, row):
+        # row holds a value for each column of the schema, in the same order
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        if len(self.columns[0]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.columns[0]) == 0:
+            return
+        arrays = [pa.array(column, type=field.type) for column, field in zip(self.columns, self.schema)]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows += len(self.columns[0])
+        self.columns = [[] for _ in self.schema.names]
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+class ParquetExporter:
+    """Same interface of XlsxExporter, writing the profiles, jobs, educations and skills tables in a directory"""
+
+    def __init__(self, directory, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        self.profiles = ParquetTableWriter(os.path.join(directory, 'profiles.parquet'), PROFILES_SCHEMA,
+                                           row_group_size)
+        self.jobs = ParquetTableWriter(os.path.join(directory, 'jobs.parquet'), JOBS_SCHEMA, row_group_size)
+        self.educations = ParquetTableWriter(os.path.join(directory, 'educations.parquet'), EDUCATIONS_SCHEMA,
+                                             row_group_size)
+        self.skills = ParquetTableWriter(os.path.join(directory, 'skills.parquet'), SKILLS_SCHEMA, row_group_size)
+
+        self.rows = 0
+
+    @classmethod
+    def from_config(cls, config, section):
+        return cls(get_output_directory_name(config, section),
+                   int(config.get(section, 'parquet_row_group_size', fallback=str(DEFAULT_ROW_GROUP_SIZE))))
+
+    def write(self, scraping_result):
+        with timers.stage('export_row'):
+            profile_id = self.rows
+
+            if scraping_result.is_error():
+                self.profiles.append([profile_id, scraping_result.message] +
+                                     [None] * (len(PROFILES_SCHEMA) - 2))
+            else:
+                self.write_profile(profile_id, scraping_result.profile)
+
+        self.rows += 1
+
+    def write_profile(self, profile_id, p):
+        jobs_history = p.jobs_history
+        self.profiles.append([profile_id,
+                              None,
+                              p.profile_name,
+                              p.email,
+                              p.current_job.company.name,
+                              p.current_job.company.industry,
+                              p.current_job.position,
+                              p.current_job.location.city,
+                              p.current_job.location.country,
+                              p.current_job.location.full_string] +
+                             [getattr(jobs_history, column) for column in JOB_HISTORY_COLUMNS])
+
+        # Profiles without jobs (educations) hold a placeholder one, not exported
+        if p.job_list != (Job(),):
+            for job_index, job in enumerate(p.job_list):
+                self.jobs.append([profile_id, job_index, job.company.name, job.company.industry, job.position,
+                                  job.location.city, job.location.country, job.location.full_string, job.daterange])
+
+        if p.edu_list != (Education(),):
+            for education_index, education in enumerate(p.edu_list):
+                self.educations.append([profile_id, education_index, education.institution, education.degreename,
+                                        education.field, education.start_year, education.end_year])
+
+        for skill in p.skills:
+            self.skills.append([profile_id, skill])
+
+    def write_all(self, scraping_results):
+        for scraping_result in scraping_results:
+            self.write(scraping_result)
+
+    def close(self):
+        with timers.stage('export_close'):
+            for table in [self.profiles, self.jobs, self.educations, self.skills]:
+                table.close()
@@ -0,0 +1,293 @@
+import hashlib
+import json
+from urllib.parse import urljoin
+
+from lxml import etree, html
+
+
+# Parsing of the LinkedIn profile page from a single snapshot of its html (browser.page_source).
+# Everything here works on the lxml tree, so no WebDriver round-trip is needed for each element.
+
+
+def _has_class(class_name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+LINKEDIN_BASE_URL = 'https://www.linkedin.com/'
+
+# XPath expressions of the profile data, used both precompiled by lxml (reused for every profile) and by
+# EXTRACT_PROFILE_SCRIPT in the browser, so that the two ways of reading a profile find the same elements
+_EXPERIENCE_POSITIONS_PATH = "//*[@id='experience-section']//li"
+_EDUCATION_POSITIONS_PATH = "//*[@id='education-section']//li"
+_NAME_PATH = "(((//div[@class='flex-1 mr5'])[1]//ul)[1]//li)[1]"
+
+_H3_PATH = ".//h3"
+_LINK_HREF_PATH = ".//a/@href"
+_SPANS_PATH = ".//span"
+_TIMES_PATH = ".//time"
+_DATE_RANGE_PATH = f".//*[{_has_class('pv-entity__date-range')}]"
+_SECONDARY_TITLE_PATH = f".//*[{_has_class('pv-entity__secondary-title')}]"
+_LOCATION_PATH = f".//*[{_has_class('pv-entity__location')}]"
+_DEGREE_INFO_PATH = f".//*[{_has_class('pv-entity__degree-info')}]"
+_DATES_PATH = f".//*[{_has_class('pv-entity__dates')}]"
+
+_SKILLS_PATH = f"//*[{_has_class('pv-skill-category-entity')}]"
+_SKILL_NAME_PATH = f".//*[{_has_class('pv-skill-category-entity__name-text')}]"
+
+_EXPERIENCE_POSITIONS = etree.XPath(_EXPERIENCE_POSITIONS_PATH)
+_EDUCATION_POSITIONS = etree.XPath(_EDUCATION_POSITIONS_PATH)
+_NAME = etree.XPath(_NAME_PATH)
+
+_H3 = etree.XPath(_H3_PATH)
+_LINK_HREF = etree.XPath(_LINK_HREF_PATH)
+_SPANS = etree.XPath(_SPANS_PATH)
+_TIMES = etree.XPath(_TIMES_PATH)
+_DATE_RANGE = etree.XPath(_DATE_RANGE_PATH)
+_SECONDARY_TITLE = etree.XPath(_SECONDARY_TITLE_PATH)
+_LOCATION = etree.XPath(_LOCATION_PATH)
+_DEGREE_INFO = etree.XPath(_DEGREE_INFO_PATH)
+_DATES = etree.XPath(_DATES_PATH)
+
+_SKILLS = etree.XPath(_SKILLS_PATH)
+_SKILL_NAME = etree.XPath(_SKILL_NAME_PATH)
+
+_COMPANY_INFO_LIST = etree.XPath(f"//*[{_has_class('org-top-card-summary-info-list')}]")
+_COMPANY_INFO_ITEMS = etree.XPath(f".//*[{_has_class('org-top-card-summary-info-list__info-item')}]")
+_COMPANY_INLINE_ITEMS = etree.XPath(f"(.//*[{_has_class('inline-block')}])[1]"
+                                    f"//*[{_has_class('org-top-card-summary-info-list__info-item')}]")
+_COMPANY_TITLE = etree.XPath(f"(//*[{_has_class('org-top-card-summary__title')}])[1]/@title")
+
+
+def parse_page(page_source):
+    return html.fromstring(page_source)
+
+
+def element_text(element):
+    # Mimics the whitespace normalization of the Selenium WebElement.text property
+    return " ".join(element.text_content().split())
+
+
+def _first_text(elements, default="N/A"):
+    return element_text(elements[0]) if len(elements) > 0 else default
+
+
+def _nth_span_text(container, index):
+    if len(container) == 0:
+        return "N/A"
+    spans = _SPANS(container[0])
+    return element_text(spans[index]) if len(spans) > index else "N/A"
+
+
+def parse_profile_name(tree):
+    name = _NAME(tree)
+    return name[0].text_content().strip() if len(name) > 0 else None
+
+
+def parse_skills(tree):
+    skills = []
+    for skill in _SKILLS(tree):
+        skill_name = _SKILL_NAME(skill)
+        if len(skill_name) > 0:
+            skills.append(element_text(skill_name[0]))
+    return skills
+
+
+def get_job_positions(tree):
+    return _EXPERIENCE_POSITIONS(tree)
+
+
+def get_education_positions(tree):
+    return _EDUCATION_POSITIONS(tree)
+
+
+def parse_job_position(job_position):
+    # Returns the raw data of a single <li> of the experience section.
+    # Company data (industry, official name, location) are resolved afterwards through the company page.
+    companyname = _first_text(_SECONDARY_TITLE(job_position))
+    if companyname != "N/A":
+        companyname = companyname.replace('Full-time', '').replace('Part-time', '').strip()
+
+    links = _LINK_HREF(job_position)
+
+    return {
+        'daterange': _nth_span_text(_DATE_RANGE(job_position), 1),
+        'title': _first_text(_H3(job_position)),
+        'companyname': companyname,
+        # page_source contains relative hrefs, while WebElement.get_attribute('href') used to return absolute ones
+        'company_url': urljoin(LINKEDIN_BASE_URL, links[0]) if len(links) > 0 else "N/A",
+        'location': _nth_span_text(_LOCATION(job_position), 1)
+    }
+
+
+def parse_education_position(education_position):
+    institution = _first_text(_H3(education_position))
+
+    degreename = "N/A"
+    field = "N/A"
+    degree_info = _DEGREE_INFO(education_position)
+    if len(degree_info) > 0:
+        is_degreename = False
+        is_field = False
+        for span in _SPANS(degree_info[0]):
+            span_text = element_text(span)
+            if not is_degreename:
+                if span_text == "Degree Name":
+                    is_degreename = True
+            else:
+                degreename = span_text
+                is_degreename = False
+            if not is_field:
+                if span_text == "Field Of Study":
+                    is_field = True
+            else:
+                field = span_text
+                is_field = False
+
+    start_year = "N/A"
+    end_year = "N/A"
+    dates = _DATES(education_position)
+    if len(dates) > 0:
+        dates_spans = _SPANS(dates[0])
+        if len(dates_spans) > 1:
+            years_range = _TIMES(dates_spans[1])
+            if len(years_range) > 0:
+                start_year = element_text(years_range[0])
+            if len(years_range) > 1:
+                end_year = element_text(years_range[1])
+
+    return {
+        'institution': institution,
+        'degreename': degreename,
+        'field': field,
+        'start_year': start_year,
+        'end_year': end_year
+    }
+
+
+def extract_profile_data(tree):
+    # Same payload of EXTRACT_PROFILE_SCRIPT, read from the html of the page
+    return {
+        'name': parse_profile_name(tree),
+        'skills': parse_skills(tree),
+        'jobs': [parse_job_position(job_position) for job_position in get_job_positions(tree)],
+        'educations': [parse_education_position(education_position)
+                       for education_position in get_education_positions(tree)]
+    }
+
+
+def profile_fingerprint(profile_data, *extra):
+    # Hash of the data read from the profile (the payload of extract_profile_data, with the company links without
+    # their tracking parameters), or None when the page was not a profile
+    if profile_data['name'] is None:
+        return None
+
+    jobs = [dict(job, company_url=job['company_url'].split('?')[0]) for job in profile_data['jobs']]
+    content = json.dumps([profile_data['name'], profile_data['skills'], jobs, profile_data['educations'],
+                          [str(value) for value in extra]], sort_keys=True)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+# Reads the profile data in the browser, with a single round-trip: it returns the payload of
+# extract_profile_data as a JSON string (an expression: prepend "return " to get its value with execute_script)
+EXTRACT_PROFILE_SCRIPT = "(function () { var paths = " + json.dumps({
+    'baseUrl': LINKEDIN_BASE_URL,
+    'name': _NAME_PATH,
+    'skills': _SKILLS_PATH,
+    'skillName': _SKILL_NAME_PATH,
+    'jobs': _EXPERIENCE_POSITIONS_PATH,
+    'educations': _EDUCATION_POSITIONS_PATH,
+    'h3': _H3_PATH,
+    'linkHref': _LINK_HREF_PATH,
+    'spans': _SPANS_PATH,
+    'times': _TIMES_PATH,
+    'dateRange': _DATE_RANGE_PATH,
+    'secondaryTitle': _SECONDARY_TITLE_PATH,
+    'location': _LOCATION_PATH,
+    'degreeInfo': _DEGREE_INFO_PATH,
+    'dates': _DATES_PATH
+}) + """;
+function nodes(path, context) {
+    var result = document.evaluate(path, context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var found = [];
+    for (var i = 0; i < result.snapshotLength; i++) { found.push(result.snapshotItem(i)); }
+    return found;
+}
+function text(node) { return node.textContent.split(/\\s+/).filter(function (s) { return s !== ''; }).join(' '); }
+function firstText(found) { return found.length > 0 ? text(found[0]) : 'N/A'; }
+function nthSpanText(container, index) {
+    if (container.length === 0) { return 'N/A'; }
+    var spans = nodes(paths.spans, container[0]);
+    return spans.length > index ? text(spans[index]) : 'N/A';
+}
+var name = nodes(paths.name);
+var skills = [];
+nodes(paths.skills).forEach(function (skill) {
+    var skillName = nodes(paths.skillName, skill);
+    if (skillName.length > 0) { skills.push(text(skillName[0])); }
+});
+var jobs = nodes(paths.jobs).map(function (job) {
+    var companyname = firstText(nodes(paths.secondaryTitle, job));
+    if (companyname !== 'N/A') { companyname = companyname.split('Full-time').join('').split('Part-time').join('').trim(); }
+    var links = nodes(paths.linkHref, job);
+    return {daterange: nthSpanText(nodes(paths.dateRange, job), 1),
+            title: firstText(nodes(paths.h3, job)),
+            companyname: companyname,
+            company_url: links.length > 0 ? new URL(links[0].value, paths.baseUrl).href : 'N/A',
+            location: nthSpanText(nodes(paths.location, job), 1)};
+});
+var educations = nodes(paths.educations).map(function (education) {
+    var degreename = 'N/A', field = 'N/A', startYear = 'N/A', endYear = 'N/A';
+    var degreeInfo = nodes(paths.degreeInfo, education);
+    if (degreeInfo.length > 0) {
+        var isDegreename = false, isField = false;
+        nodes(paths.spans, degreeInfo[0]).forEach(function (span) {
+            var spanText = text(span);
+            if (!isDegreename) { if (spanText === 'Degree Name') { isDegreename = true; } }
+            else { degreename = spanText; isDegreename = false; }
+            if (!isField) { if (spanText === 'Field Of Study') { isField = true; } }
+            else { field = spanText; isField = false; }
+        });
+    }
+    var dates = nodes(paths.dates, education);
+    if (dates.length > 0) {
+        var datesSpans = nodes(paths.spans, dates[0]);
+        if (datesSpans.length > 1) {
+            var yearsRange = nodes(paths.times, datesSpans[1]);
+            if (yearsRange.length > 0) { startYear = text(yearsRange[0]); }
+            if (yearsRange.length > 1) { endYear = text(yearsRange[1]); }
+        }
+    }
+    return {institution: firstText(nodes(paths.h3, education)), degreename: degreename, field: field,
+            start_year: startYear, end_year: endYear};
+});
+return JSON.stringify({name: name.length > 0 ? name[0].textContent.trim() : null, skills: skills, jobs: jobs,
+                       educations: educations});
+})()"""
+
+
+def parse_company_page(tree):
+    # The info list of the company contains [industry, location, ...] or, when the industry is missing,
+    # only items inside an inline block starting from the location
+    industry = "N/A"
+    location = "N/A"
+
+    info_list = _COMPANY_INFO_LIST(tree)
+    if len(info_list) > 0:
+        info_items = _COMPANY_INFO_ITEMS(info_list[0])
+        no_industry = len(info_items) == len(_COMPANY_INLINE_ITEMS(info_list[0]))
+
+        if no_industry:
+            if len(info_items) > 0:
+                location = element_text(info_items[0])
+        else:
+            industry = element_text(info_items[0])
+            if len(info_items) > 1:
+                location = element_text(info_items[1])
+
+    title = _COMPANY_TITLE(tree)
+
+    return {
+        'industry': industry,
+        'companyname': title[0] if len(title) > 0 else "N/A",
+        'location': location
+    }
@@ -0,0 +1,76 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from company_cache import MemoryCompanyCache
+from linkedin_urls import canonical_company_url
+from page_capture import load_capture_index, read_page
+from profile_scraper import ProfileBuilder
+
+
+class ReplayScraper(ProfileBuilder):
+    """Builds the profiles from a capture directory saved by the scrapers, without browser nor network"""
+
+    def __init__(self, directory, company_records):
+        self.directory = directory
+        self.company_records = {canonical_company_url(url): record for url, record in company_records.items()}
+        self.company_cache = MemoryCompanyCache()
+
+        # Companies the scrapers took from the company cache are replayed from their captured data
+        for url, record in self.company_records.items():
+            if 'company_data' in record:
+                company_data = record['company_data']
+                self.company_cache.put(url, company_data['industry'], company_data['companyname'],
+                                       company_data['location'])
+
+    def load_company_page(self, url):
+        record = self.company_records.get(canonical_company_url(url))
+        if record is None or 'file' not in record:
+            return None
+        return read_page(self.directory, record)
+
+    def scrap_profile(self, profile_record):
+        return self.build_profile(read_page(self.directory, profile_record),
+                                  profile_record['email'],
+                                  profile_record['graduation_date'])
+
+
+def replay_capture(directory):
+    # Yields couples (profile url, ScrapingResult) for each profile of the capture
+    profile_records, company_records = load_capture_index(directory)
+
+    replay_scraper = ReplayScraper(directory, company_records)
+
+    for profile_record in profile_records:
+        yield profile_record['url'], replay_scraper.scrap_profile(profile_record)
+
+
+# ReplayScraper of each worker process, created once by the pool initializer
+_process_replay_scraper = None
+
+
+def _init_replay_process(directory, company_records):
+    global _process_replay_scraper
+    _process_replay_scraper = ReplayScraper(directory, company_records)
+
+
+def _replay_chunk(profile_records):
+    return [(profile_record['url'], _process_replay_scraper.scrap_profile(profile_record))
+            for profile_record in profile_records]
+
+
+def replay_capture_parallel(directory, processes, chunk_size=64):
+    # Same as replay_capture, with the parsing spread over a pool of processes (parsing is CPU-bound).
+    # Profiles are submitted in chunks and a bounded number of chunks is in flight at any time, so results
+    # are yielded in capture order as soon as they are ready without holding the whole capture in memory.
+    profile_records, company_records = load_capture_index(directory)
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_replay_process,
+                             initargs=(directory, company_records)) as executor:
+        in_flight = deque()
+        for start in range(0, len(profile_records), chunk_size):
+            in_flight.append(executor.submit(_replay_chunk, profile_records[start:start + chunk_size]))
+            if len(in_flight) >= 2 * processes:
+                yield from in_flight.popleft().result()
+
+        while len(in_flight) > 0:
+            yield from in_flight.popleft().result()
@@ -1,17 +1,48 @@
+import json
 import traceback
+from concurrent.futures import Future
 from threading import Thread
-import sys, traceback
-
-from pyvirtualdisplay import Display
+import sys
 
+from company_cache import CompanyCache
+from input_pipeline import parse_entry
+from instrumentation import timers
 from job_history_summary import JobHistorySummary
+from linkedin_urls import canonical_profile_url, is_company_url, is_human_check_url, UNAVAILABLE_PROFILE_URL
+from page_readiness import PageReadiness
+from page_scroller import PageScroller
+from profile_parser import parse_page, extract_profile_data, parse_company_page, profile_fingerprint, \
+    EXTRACT_PROFILE_SCRIPT
 from utils import Profile, Location, Job, Education, Company, CannotProceedScrapingException
-from datetime import datetime
 import time
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
-from utils import linkedin_login, is_url_valid, HumanCheckException, message_to_user, get_browser_options, linkedin_logout
+from queue import Empty
+from utils import linkedin_login, HumanCheckException, message_to_user, linkedin_logout
+
+
+# Scripts shared by the scrapers (as expressions: prepend "return " to get their value with execute_script)
+CLICK_CONTACT_INFO_SCRIPT = \
+    "(function(){let clicked = false; try{for(i in document.getElementsByTagName('a')){let el = document.getElementsByTagName('a')[i]; " \
+    "if(el.innerHTML.includes('Contact info')){el.click(); clicked = true;}}}catch(e){} return clicked;})()"
+
+GET_EMAIL_SCRIPT = \
+    "(function(){try{for (i in document.getElementsByClassName('pv-contact-info__contact-type')){ let " \
+    "el = " \
+    "document.getElementsByClassName('pv-contact-info__contact-type')[i]; if(el.className.includes(" \
+    "'ci-email')){ " \
+    "return el.children[2].children[0].innerText; } }} catch(e){return '';}})()"
+
+# Reads the email and closes the 'Contact info' popup: fails if the popup can not be closed
+READ_EMAIL_SCRIPT = \
+    "(function(){let email = " + GET_EMAIL_SCRIPT + "; " \
+    "document.getElementsByClassName('artdeco-modal__dismiss')[0].click(); return email;})()"
+
+# Clicks the 'see more' of the sections and the 'show more' of the skills, returning which ones were found
+EXPAND_SECTIONS_SCRIPT = \
+    "(function(){let expanded = {see_more: false, skills: false}; " \
+    "let el = document.getElementsByClassName('pv-profile-section__see-more-inline')[0]; " \
+    "if(el){el.click(); expanded.see_more = true;} " \
+    "el = document.getElementsByClassName('pv-skills-section__additional-skills')[0]; " \
+    "if(el){el.click(); expanded.skills = true;} return expanded;})()"
 
 
 class ScrapingResult:
@@ -26,287 +57,207 @@ class ScrapingResult:
     def is_error(self):
         return self.profile is None
 
+    def to_dict(self):
+        return {'message': self.message,
+                'profile': self.profile.to_dict() if self.profile is not None else None}
 
-class ProfileScraper(Thread):
+    @classmethod
+    def from_dict(cls, data):
+        if data['profile'] is not None:
+            return cls(Profile.from_dict(data['profile']))
+        return cls(data['message'])
 
-    def __init__(self, identifier, entries, config, headless_option):
 
-        Thread.__init__(self)
+def iterate_results(results_queue, entries, previous_results, work_queue, scrapers):
+    # Yields the ScrapingResult of each entry, in the order of the input file, while the scrapers are running.
+    # Results of entries completed by a previous run are taken from previous_results.
+    pending = {}
+    stopped = False
+    stop_reason = None
 
-        self._id = identifier
+    for index, entry in enumerate(entries):
 
-        print(f"Scraper #{self._id}: Setting up the browser environment...")
+        if entry in previous_results:
+            yield previous_results[entry]
+            continue
 
-        self.entries = entries
+        while index not in pending:
+            if stopped:
+                # Entries left in the queue because all the scrapers got interrupted by the Human Check, or
+                # ended by an unexpected error (see errlog.txt)
+                pending[index] = ScrapingResult(stop_reason)
+                continue
+            try:
+                result_index, scraping_result = results_queue.get(timeout=1)
+                pending[result_index] = scraping_result
+            except Empty:
+                if not any(scraper.is_alive() for scraper in scrapers):
+                    # Results put right before the last scraper ended
+                    while not results_queue.empty():
+                        result_index, scraping_result = results_queue.get()
+                        pending[result_index] = scraping_result
+                    work_queue.close()
+                    stopped = True
+                    if any(getattr(scraper, 'interrupted', False) for scraper in scrapers):
+                        stop_reason = 'TerminatedDueToHumanCheckError'
+                    else:
+                        stop_reason = 'ScraperCrashed'
 
-        self.results = []
+        yield pending.pop(index)
 
-        # Linux-specific code needed to open a new window of Chrome
-        if config.get('system', 'os') == 'linux':
-            self.display = Display(visible=0, size=(800, 800))
-            self.display.start()
 
-        # Creation of a new instance of Chrome
-        self.browser = webdriver.Chrome(executable_path=config.get('system', 'driver'),
-                                        options=get_browser_options(headless_option, config))
+def distinct_company_urls(company_urls):
+    # Company pages to look up for a profile, each once
+    urls = []
+    for url in company_urls:
+        if is_company_url(url) and url not in urls:
+            urls.append(url)
+    return urls
 
-        self.industries_dict = {}
-        self.companies_dict = {}
-        self.locations_dict = {}
 
-        self.config = config
+def join_company_data(scraping_result, company_urls, companies):
+    # Completes the jobs of the profile (see ProfileBuilder.parse_profile) with the data of their company pages.
+    # companies maps the company urls to the data returned by ProfileBuilder.get_company_data: the values
+    # missing there ('N/A') are the ones written on the profile.
+    if scraping_result.is_error() or len(companies) == 0:
+        return scraping_result
 
-        self.headless_option = headless_option
+    profile = scraping_result.profile
 
-        self.interrupted = False
+    jobs = []
+    for job, url in zip(profile.job_list, company_urls):
+        info_company = companies.get(url)
+        if info_company is None:
+            jobs.append(job)
+            continue
 
-    def parse_entry(self, entry, delimiter: str):
-        # This function supports data as:
-        #
-        #   https://www.linkedin.com/in/federicohaag ==> parse name, email, last job
-        #
-        #   https://www.linkedin.com/in/federicohaag:::01/01/1730 ==> parse name, email, last job
-        #   and also produces a "job history summary" returning if the person was working while studying,
-        #   and how fast she/he got a job after the graduation.
-        #   As graduation date is used the one passed as parameter, NOT the date it could be on LinkedIn
-
-        if delimiter in entry:
-            profile_data = entry.split(delimiter)
-            profile_linkedin_url = profile_data[0]
-            profile_known_graduation_date = datetime.strptime(profile_data[1].strip(), '%d/%m/%y')
-        else:
-            profile_linkedin_url = entry
-            profile_known_graduation_date = None
+        companyname = info_company['companyname'] if info_company['companyname'] != "N/A" else job.company.name
+        location = info_company['location'] if info_company['location'].full_string != "N/A" else job.location
 
-        if not profile_linkedin_url[-1] == '/':
-            profile_linkedin_url += '/'
+        jobs.append(job._replace(company=Company(name=companyname.strip(), industry=info_company['industry'].strip()),
+                                 location=location))
 
-        return profile_linkedin_url, profile_known_graduation_date
+    return ScrapingResult(Profile(profile.profile_name, profile.email, profile.skills, jobs[0],
+                                  profile.jobs_history, jobs, profile.edu_list))
 
-    def scrap_profile(self, profile_linkedin_url, profile_known_graduation_date):
 
-        if not is_url_valid(profile_linkedin_url):
-            return ScrapingResult('BadFormattedLink')
+def refresh_job_history(profile, profile_known_graduation_date):
+    # The job history summary of a profile stored by a previous run, computed again now: the jobs ending 'Present'
+    # go on until today
+    if profile.jobs_history.never_had_jobs:
+        return profile
 
-        # Scraping of the profile may fail due to human check forced by LinkedIn
-        try:
+    return Profile(profile.profile_name, profile.email, profile.skills, profile.job_list[0],
+                   JobHistorySummary(profile_known_graduation_date, [job.daterange for job in profile.job_list]),
+                   profile.job_list, profile.edu_list)
 
-            # Setting of the delay (seconds) between operations that need to be sure loading of page is ended
-            loading_pause_time = 2
-            loading_scroll_time = 1
 
-            # Opening of the profile page
-            self.browser.get(profile_linkedin_url)
+class ProfileBuilder:
+    """Builds the scraping results from the html of the pages, independently of where such html comes from"""
 
-            if not str(self.browser.current_url).strip() == profile_linkedin_url.strip():
-                if self.browser.current_url == 'https://www.linkedin.com/in/unavailable/':
-                    return ScrapingResult('ProfileUnavailable')
-                else:
-                    raise HumanCheckException
+    # Must provide get(url) and put(url, industry, companyname, location)
+    company_cache = None
 
-            # Scraping the Email Address from Contact Info (email)
+    # When set, the company pages loaded (or the company data taken from the cache) are saved to be replayed
+    capture = None
 
-            # > click on 'Contact info' link on the page
-            self.browser.execute_script(
-                "(function(){try{for(i in document.getElementsByTagName('a')){let el = document.getElementsByTagName('a')[i]; "
-                "if(el.innerHTML.includes('Contact info')){el.click();}}}catch(e){}})()")
-            time.sleep(loading_pause_time)
+    def load_company_page(self, url):
+        # Returns the html of the company page, or None if it is not available
+        raise NotImplementedError
 
-            # > gets email from the 'Contact info' popup
-            try:
-                email = self.browser.execute_script(
-                    "return (function(){try{for (i in document.getElementsByClassName('pv-contact-info__contact-type')){ let "
-                    "el = "
-                    "document.getElementsByClassName('pv-contact-info__contact-type')[i]; if(el.className.includes("
-                    "'ci-email')){ "
-                    "return el.children[2].children[0].innerText; } }} catch(e){return '';}})()")
-
-                self.browser.execute_script("document.getElementsByClassName('artdeco-modal__dismiss')[0].click()")
-            except:
-                email = 'N/A'
+    def build_profile(self, page_source, email, profile_known_graduation_date):
+        with timers.stage('extraction'):
+            profile_data = extract_profile_data(parse_page(page_source))
 
-            # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
-            window_height = self.browser.execute_script("return window.innerHeight")
-            scrolls = 1
-            while scrolls * window_height < self.browser.execute_script("return document.body.offsetHeight"):
-                self.browser.execute_script(f"window.scrollTo(0, {window_height * scrolls});")
-                time.sleep(loading_scroll_time)
-                scrolls += 1
+        return self.build_profile_from_data(profile_data, email, profile_known_graduation_date)
 
-            try:
-                self.browser.execute_script(
-                    "document.getElementsByClassName('pv-profile-section__see-more-inline')[0].click()")
-                time.sleep(loading_pause_time)
-            except:
-                pass
+    def build_profile_from_data(self, profile_data, email, profile_known_graduation_date):
+        # profile_data is the payload of EXTRACT_PROFILE_SCRIPT (or extract_profile_data of the page html)
+        with timers.stage('parsing'):
+            scraping_result, company_urls = self.parse_profile(profile_data, email, profile_known_graduation_date)
 
-            # Get all the job positions
-            try:
-                job_positions = self.browser\
-                    .find_element_by_id('experience-section')\
-                    .find_elements_by_tag_name('li')
-            except NoSuchElementException:
-                print("job_positions is null")
-                job_positions = []
-
-            # Get all the education positions
-            try:
-                education_positions = self.browser\
-                    .find_element_by_id('education-section')\
-                    .find_elements_by_tag_name('li')
-            except NoSuchElementException:
-                print("job_positions is null")
-                education_positions = []
+        companies = {}
+        for url in distinct_company_urls(company_urls):
+            companies[url] = self.get_company_data(url)
 
-            # Parsing of the page html structure
-            soup = BeautifulSoup(self.browser.page_source, 'lxml')
+        return join_company_data(scraping_result, company_urls, companies)
 
-            # Scraping the Name (using soup)
-            try:
-                name_div = soup.find('div', {'class': 'flex-1 mr5'})
-                name_loc = name_div.find_all('ul')
-                profile_name = name_loc[0].find('li').get_text().strip()
-            except:
-                return ScrapingResult('ERROR IN SCRAPING NAME')
+    def parse_profile(self, profile_data, email, profile_known_graduation_date):
+        # Returns the ScrapingResult built from the profile page only, and the company url of each of its jobs:
+        # the jobs report the company name and location written on the profile, see join_company_data
 
-            # Parsing skills
-            try:
-                self.browser.execute_script(
-                    "document.getElementsByClassName('pv-skills-section__additional-skills')[0].click()")
-                time.sleep(loading_pause_time)
-            except:
-                pass
+        # Get all the job positions
+        job_positions = profile_data['jobs']
 
-            try:
-                skills = self.browser.execute_script(
-                    "return (function(){els = document.getElementsByClassName('pv-skill-category-entity');results = [];for (var i=0; i < els.length; i++){results.push(els[i].getElementsByClassName('pv-skill-category-entity__name-text')[0].innerText);}return results;})()")
-            except:
-                skills = []
-
-            # Parsing the job positions
-
-            if len(job_positions) > 0:
-                # Parse job positions to extract relative the data ranges
-                js = self.parsing_jobs(job_positions)
-                job_positions_data_ranges = js['job_positions_data_ranges']
-                Jobs_array = js['Jobs_array']
-                last_job = Jobs_array[0]
-
-                if len(education_positions) > 0:
-                    eds = self.parsing_educations(education_positions)
-
-                    return ScrapingResult(
-                        Profile(
-                            profile_name,
-                            email,
-                            skills,
-                            last_job,
-                            JobHistorySummary(
-                                profile_known_graduation_date,
-                                job_positions_data_ranges
-                            ),
-                            Jobs_array,
-                            eds
-                        )
-                    )
+        # Get all the education positions
+        education_positions = profile_data['educations']
 
-                else:
-                    return ScrapingResult(
-                        Profile(
-                            profile_name,
-                            email,
-                            skills,
-                            last_job,
-                            JobHistorySummary(
-                                profile_known_graduation_date,
-                                job_positions_data_ranges
-                            ),
-                            Jobs_array
-                        )
-                    )
+        # Scraping the Name
+        profile_name = profile_data['name']
+        if profile_name is None:
+            return ScrapingResult('ERROR IN SCRAPING NAME'), []
 
-            else:
-                return ScrapingResult(
-                    Profile(profile_name, email, skills)
-                )
+        # Parsing skills
+        skills = profile_data['skills']
 
-        except HumanCheckException:
+        # Parsing the job positions
 
-            if self.headless_option:
-                raise CannotProceedScrapingException
+        if len(job_positions) > 0:
+            # Parse job positions to extract relative the data ranges
+            js = self.parsing_jobs(job_positions)
+            job_positions_data_ranges = js['job_positions_data_ranges']
+            Jobs_array = js['Jobs_array']
+            last_job = Jobs_array[0]
 
-            linkedin_logout(self.browser)
+            if len(education_positions) > 0:
+                eds = self.parsing_educations(education_positions)
 
-            linkedin_login(self.browser, self.config.get('linkedin', 'username'),
-                           self.config.get('linkedin', 'password'))
+                return ScrapingResult(
+                    Profile(
+                        profile_name,
+                        email,
+                        skills,
+                        last_job,
+                        JobHistorySummary(
+                            profile_known_graduation_date,
+                            job_positions_data_ranges
+                        ),
+                        Jobs_array,
+                        eds
+                    )
+                ), js['company_urls']
 
-            while self.browser.current_url != 'https://www.linkedin.com/feed/':
-                message_to_user('Please execute manual check', self.config)
-                time.sleep(30)
+            else:
+                return ScrapingResult(
+                    Profile(
+                        profile_name,
+                        email,
+                        skills,
+                        last_job,
+                        JobHistorySummary(
+                            profile_known_graduation_date,
+                            job_positions_data_ranges
+                        ),
+                        Jobs_array
+                    )
+                ), js['company_urls']
 
-            return self.scrap_profile(profile_linkedin_url, profile_known_graduation_date)
+        else:
+            return ScrapingResult(
+                Profile(profile_name, email, skills)
+            ), []
 
     def parsing_educations(self, education_positions):
         education_array = []
 
-        for education_position in education_positions:
+        for education_data in education_positions:
             try:
-                # get the institution
-                try:
-                    institution_element = education_position.find_element_by_tag_name('h3')
-                    institution = institution_element.text
-                except NoSuchElementException:
-                    institution = "N/A"
-
-                try:
-                    degreename_range_element = education_position\
-                        .find_element_by_class_name('pv-entity__degree-info')
-                    degreename_range_spans = degreename_range_element\
-                        .find_elements_by_tag_name('span')
-                    is_degreename = False
-                    is_field = False
-                    degreename = "N/A"
-                    field = "N/A"
-                    for span in degreename_range_spans:
-                        if not is_degreename:
-                            if span.text == "Degree Name":
-                                is_degreename = True
-                                pass
-                        else:
-                            degreename = span.text
-                            is_degreename = False
-                        if not is_field:
-                            if span.text == "Field Of Study":
-                                is_field = True
-                        else:
-                            field = span.text
-                            is_field = False
-                except NoSuchElementException:
-                    degreename = "N/A"
-                    field = "N/A"
-
-                try:
-                    start_year = "N/A"
-                    end_year = "N/A"
-                    dates_range_element = education_position\
-                        .find_element_by_class_name("pv-entity__dates")
-                    dates_spans = dates_range_element\
-                        .find_elements_by_tag_name("span")
-                    years_range = dates_spans[1]\
-                        .find_elements_by_tag_name("time")
-                    start_year = years_range[0].text
-                    end_year = years_range[1].text
-                except NoSuchElementException as ens:
-                    print("Oops!", ens, "occured.")
-
                 # class Education
-                educacion_oo = Education(institution,
-                                         degreename,
-                                         field,
-                                         start_year,
-                                         end_year)
-
-                # print(educacion_oo)
+                educacion_oo = Education(education_data['institution'],
+                                         education_data['degreename'],
+                                         education_data['field'],
+                                         education_data['start_year'],
+                                         education_data['end_year'])
 
                 education_array.append(educacion_oo)
 
@@ -329,77 +280,29 @@ class ProfileScraper(Thread):
         job_positions_data_ranges = []
         #array of Jobs
         Jobs_array = []
+        # company page of each job
+        company_urls = []
 
-        for job_position in job_positions:
-            #print('job_pos.text: {0}\n--'.format(job_position.text))
+        for job_data in job_positions:
             try:
-                # Get the date range of the job position
-                # get the date_range
-                try:                       
-                    date_range_element = job_position.find_element_by_class_name('pv-entity__date-range')
-                    date_range_spans = date_range_element.find_elements_by_tag_name('span')
-                    date_range = date_range_spans[1].text
-                    # print('date_range: {0}'.format(date_range))
-                except NoSuchElementException:
-                    date_range = "N/A"
-
-                try:
-                    # get the title
-                    title_range_element = job_position.find_element_by_tag_name('h3')
-                    title = title_range_element.text
-                    # print('title: {0}'.format(title))
-                except NoSuchElementException:
-                    title = "N/A"
-
-                try:
-                    # get the companyname
-                    companyname_range_element = job_position.find_element_by_class_name('pv-entity__secondary-title')
-                    companyname = companyname_range_element
-                    companyname = companyname.text.replace('Full-time', '').replace('Part-time', '').strip()
-                    # print('companyname: {0}'.format(companyname))
-                except NoSuchElementException:
-                    companyname = "N/A"
-
-                try:
-                    # get the company info using bautifulsoup
-                    company_url_link = job_position.find_element_by_tag_name('a').get_attribute('href')
-                except NoSuchElementException:
-                    company_url_link = "N/A"
-
-                try: 
-                    companylocation_range_element = job_position.find_element_by_class_name('pv-entity__location')
-                    companylocation_spans = companylocation_range_element.find_elements_by_tag_name('span')
-                    companylocation = companylocation_spans[1].text
-                except NoSuchElementException:    
-                    companylocation = "N/A"
-                # print('companylocation: {0}'.format(companylocation))
+                date_range = job_data['daterange']
+                title = job_data['title']
+                companyname = job_data['companyname']
+                companylocation = job_data['location']
 
                 job_positions_data_ranges.append(date_range)
-                info_company = self.get_company_data(company_url_link)
-                try:                   
-                    if info_company['companyname'] == "N/A":
-                        info_company['companyname'] = companyname
-                    if info_company['location'].full_string == "N/A":
-                        loc = Location()
-                        loc.parse_string(companylocation)
-                        info_company['location'] = loc
-                except: 
-                    print("Oops!", sys.exc_info()[0], "occured.")
-                    print(info_company['industry'])
-                    print(info_company['companyname'])
-                    print(info_company['location'])
 
                 trabajo_oo = Job(
                     position=title.strip(),
                     company=Company(
-                        name=info_company['companyname'].strip(),
-                        industry=info_company['industry'].strip()
+                        name=companyname.strip(),
+                        industry='N/A'
                     ),
-                    location=info_company['location'],
+                    location=Location.from_string(companylocation),
                     daterange=date_range.strip()
                 )
                 Jobs_array.append(trabajo_oo)
-                # print(trabajo_oo)
+                company_urls.append(job_data['company_url'])
 
             except:
                 print("Oops!, \n{}\n{}\n{}\noccured.".format(sys.exc_info()[0],
@@ -409,141 +312,332 @@ class ProfileScraper(Thread):
                 pass
 
         return {'Jobs_array':Jobs_array,
-                "job_positions_data_ranges":job_positions_data_ranges}
-
+                "job_positions_data_ranges":job_positions_data_ranges,
+                'company_urls':company_urls}
 
     def get_company_data(self, url):
         #print(url)
-        no_industry = False
-        if url.split("/")[3] != "company":
+        if not is_company_url(url):
             print("no company page")
             return {'industry':'N/A',
                     'companyname':'N/A',
                     'location':Location('N/A','N/A','N/A')}
 
-        if url not in self.industries_dict:
-            try:
-                self.browser.execute_script("window.open('');")
-                self.browser.switch_to.window(self.browser.window_handles[1])
-                self.browser.get(url)
-            except:
+        company_data = self.company_cache.get(url)
+
+        if company_data is None:
+            page_source = self.load_company_page(url)
+            if page_source is None:
                 print("error opening company page")
                 return {'industry':'N/A',
                         'companyname':'N/A',
                         'location':Location('N/A','N/A','N/A')}
-            try:
-                card_summary_divs = self.browser\
-                    .find_element_by_class_name('org-top-card-summary-info-list')\
-                    .find_elements_by_class_name('org-top-card-summary-info-list__info-item')
-                inline_divs = self.browser\
-                    .find_element_by_class_name('org-top-card-summary-info-list')\
-                    .find_element_by_class_name('inline-block')\
-                    .find_elements_by_class_name('org-top-card-summary-info-list__info-item')
-                if len(card_summary_divs) == len(inline_divs):
-                    no_industry = True
-                #print("card_summary_divs {}, inline_divs {}".format(len(card_summary_divs),
-                #                                                    len(inline_divs)))
-            except:
-                print("error getting company data 3")
-            #industry
-            try:
-                if no_industry:
-                    self.industries_dict[url] = "N/A"
-                else:
-                    self.industries_dict[url] = self.browser.execute_script(
-                        "return document.getElementsByClassName("
-                        "'org-top-card-summary-info-list__info-item')["
-                        "0].innerText")
-            except:
-                #print("industry wasnt scrapped")
-                self.industries_dict[url] = 'N/A'
-            #companyname
-            try:
-                self.companies_dict[url] = self.browser.execute_script(
-                    "return document.getElementsByClassName("
-                    "'org-top-card-summary__title')["
-                    "0].title")
-            except:
-                print("company name wasnt scrapped")
-                self.companies_dict[url] = 'N/A'
-            #locations
-            try:
-                if no_industry:
-                    self.locations_dict[url] = self.browser.execute_script(
-                        "return document.getElementsByClassName("
-                        "'org-top-card-summary-info-list__info-item')["
-                        "0].innerText")
+
+            if self.capture is not None:
+                self.capture.save_company(url, page_source)
+
+            with timers.stage('company_parsing'):
+                company_data = parse_company_page(parse_page(page_source))
+
+            # Shared with the other scrapers and with the next runs, unless no data could be read from the page
+            if any(company_data[key] != 'N/A' for key in ('industry', 'companyname', 'location')):
+                self.company_cache.put(url, company_data['industry'], company_data['companyname'],
+                                       company_data['location'])
+
+        elif self.capture is not None:
+            # No page is visited for the companies already in the cache: the replay needs their data
+            self.capture.save_company_data(url, company_data)
+
+        return {'industry':company_data['industry'],
+                'companyname':company_data['companyname'],
+                'location':Location.from_string(company_data['location'])}
+
+
+class ProfileScraper(ProfileBuilder, Thread):
+
+    def __init__(self, identifier, work_queue, results_queue, browser_pool, config, headless_option,
+                 company_cache=None, journal=None, capture=None, company_resolver=None, fingerprints=None):
+
+        Thread.__init__(self)
+
+        self._id = identifier
+
+        self.work_queue = work_queue
+
+        # Queue shared by the scrapers where couples (index of the entry in the input file, ScrapingResult)
+        # are put as soon as they are produced
+        self.results_queue = results_queue
+
+        # Append-only file where every result is saved as soon as it is produced
+        self.journal = journal
+
+        # When set, the html of the visited pages is saved to be replayed offline
+        self.capture = capture
+
+        # Chrome instances (already logged in) are leased from the pool shared by the scrapers
+        self.browser_pool = browser_pool
+        self.browser = None
+
+        # Explicit waits used between the scraping steps, with per-step timeouts
+        self.readiness = None
+
+        # Scrolling of the profile pages until all their content is loaded
+        self.scroller = PageScroller.from_config(config)
+
+        # Company data is persisted on disk and shared between all the scrapers
+        self.company_cache = company_cache if company_cache is not None else CompanyCache.from_config(config)
+
+        # When set, the company pages are resolved by this separate stage instead of inline by the scraper
+        self.company_resolver = company_resolver
+
+        # When set, profiles whose content did not change since the previous run are not scraped again
+        self.fingerprints = fingerprints
+
+        self.config = config
+
+        self.headless_option = headless_option
+
+        # Set when the scraping stops due to the Human Check, or due to an unexpected error
+        self.interrupted = False
+        self.crashed = False
+
+    def scrap_profile(self, profile_linkedin_url, profile_known_graduation_date):
+
+        if canonical_profile_url(profile_linkedin_url) is None:
+            return ScrapingResult('BadFormattedLink')
+
+        # The company workers got the Human Check: the scraping stops
+        if self.company_resolver is not None and self.company_resolver.interrupted:
+            raise CannotProceedScrapingException
+
+        # Scraping of the profile may fail due to human check forced by LinkedIn
+        try:
+
+            # Opening of the profile page
+            with timers.stage('navigation'):
+                self.browser.get(profile_linkedin_url)
+
+            current_url = canonical_profile_url(str(self.browser.current_url))
+            if not current_url == canonical_profile_url(profile_linkedin_url):
+                if current_url == UNAVAILABLE_PROFILE_URL:
+                    return ScrapingResult('ProfileUnavailable')
                 else:
-                    self.locations_dict[url] = self.browser.execute_script(
-                        "return document.getElementsByClassName("
-                        "'org-top-card-summary-info-list__info-item')["
-                        "1].innerText")
-            except:
-                print("location name wasnt scrapped")
-                self.locations_dict[url] = 'N/A'
+                    raise HumanCheckException
 
+            # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
+            with timers.stage('scroll'):
+                self.scroller.scroll_to_bottom(self.browser)
+
+                self.readiness.wait_for_profile_sections()
+
+            with timers.stage('expand_sections'):
+                expanded = self.browser.execute_script("return " + EXPAND_SECTIONS_SCRIPT)
+                if expanded['see_more']:
+                    self.readiness.wait_for_dom_quiet('see_more')
+
+                # Loading all the skills
+                if expanded['skills']:
+                    self.readiness.wait_for_skills()
+                    self.readiness.wait_for_dom_quiet('skills')
+
+            # All the data of the profile is read with a single script: no round-trip for each element
+            with timers.stage('extraction'):
+                profile_data = self.extract_profile_data()
+
+            # Unchanged profiles (same data of the previous run) are taken from the store: their contact info and
+            # their company pages are not opened again
+            fingerprint = None
+            if self.fingerprints is not None:
+                with timers.stage('fingerprint'):
+                    fingerprint = profile_fingerprint(profile_data, profile_known_graduation_date)
+                    profile = self.fingerprints.lookup(profile_linkedin_url, fingerprint)
+                if profile is not None:
+                    return ScrapingResult(refresh_job_history(profile, profile_known_graduation_date))
+
+            # Scraping the Email Address from Contact Info (email)
+
+            with timers.stage('contact_info'):
+                # > click on 'Contact info' link on the page
+                contact_info_clicked = self.browser.execute_script("return " + CLICK_CONTACT_INFO_SCRIPT)
+                if contact_info_clicked:
+                    self.readiness.wait_for_contact_info()
+
+                # > gets email from the 'Contact info' popup
+                try:
+                    email = self.browser.execute_script("return " + READ_EMAIL_SCRIPT)
+                except:
+                    email = 'N/A'
+
+            if self.capture is not None:
+                self.capture.save_profile(profile_linkedin_url, self.browser.page_source, email,
+                                          profile_known_graduation_date)
+
+            scraping_result = self.build_profile_from_data(profile_data, email, profile_known_graduation_date)
+
+            if fingerprint is not None:
+                self.save_fingerprint(profile_linkedin_url, fingerprint, scraping_result)
+
+            return scraping_result
+
+        except HumanCheckException:
+
+            if self.headless_option:
+                raise CannotProceedScrapingException
+
+            linkedin_logout(self.browser)
+
+            linkedin_login(self.browser, self.config.get('linkedin', 'username'),
+                           self.config.get('linkedin', 'password'))
+
+            while self.browser.current_url != 'https://www.linkedin.com/feed/':
+                message_to_user('Please execute manual check', self.config)
+                time.sleep(30)
+
+            return self.scrap_profile(profile_linkedin_url, profile_known_graduation_date)
+
+    def extract_profile_data(self):
+        # Name, skills, jobs and educations of the profile open in the browser (see EXTRACT_PROFILE_SCRIPT)
+        return json.loads(self.browser.execute_script("return " + EXTRACT_PROFILE_SCRIPT))
+
+    def build_profile_from_data(self, profile_data, email, profile_known_graduation_date):
+        if self.company_resolver is None:
+            return ProfileBuilder.build_profile_from_data(self, profile_data, email, profile_known_graduation_date)
+
+        # Returns the Future of the ScrapingResult, completed once the company pages are resolved
+        with timers.stage('parsing'):
+            scraping_result, company_urls = self.parse_profile(profile_data, email, profile_known_graduation_date)
+        return self.company_resolver.resolve(scraping_result, company_urls)
+
+    def load_company_page(self, url):
+        # Returns the html of the company page, opened in a new tab, or None if it can not be opened
+        try:
+            with timers.stage('company_page'):
+                self.browser.execute_script("window.open('');")
+                self.browser.switch_to.window(self.browser.window_handles[1])
+                self.browser.get(url)
+                human_check = is_human_check_url(self.browser.current_url)
+                if not human_check:
+                    # A page not rendered in time would be parsed (and cached) as a company with no data
+                    if not self.readiness.wait_for_company_page():
+                        return None
+                    page_source = self.browser.page_source
+        except:
+            return None
+        finally:
             try:
-                self.browser.close()
-                self.browser.switch_to.window(self.browser.window_handles[0])
+                if len(self.browser.window_handles) > 1:
+                    self.browser.close()
+                    self.browser.switch_to.window(self.browser.window_handles[0])
             except:
                 print("tab did not close")
 
+        if human_check:
+            # Handled as the Human Check on the profile page (see scrap_profile)
+            raise HumanCheckException
+
+        return page_source
+
+    def save_fingerprint(self, url, fingerprint, scraping_result):
+        if isinstance(scraping_result, Future):
+            scraping_result.add_done_callback(lambda result: self.save_fingerprint(url, fingerprint, result.result()))
+            return
+
+        if not scraping_result.is_error():
+            self.fingerprints.put(url, fingerprint, scraping_result.profile)
 
+    def save_result(self, item, scraping_result):
+        if isinstance(scraping_result, Future):
+            # Saved by the company resolver as soon as the companies of the profile are resolved
+            scraping_result.add_done_callback(lambda result: self.save_result(item, result.result()))
+            return
 
-        industry = self.industries_dict[url]
-        companyname = self.companies_dict[url]
-        location = Location()
-        location.parse_string(self.locations_dict[url])
+        self.results_queue.put((item.index, scraping_result))
+        if self.journal is not None:
+            self.journal.append(item.index, item.entry, scraping_result)
 
-        return {'industry':industry,
-                'companyname':companyname,
-                'location':location}
+    def acquire_browser(self):
+        self.browser = self.browser_pool.acquire()
+        self.readiness = PageReadiness.from_config(self.browser, self.config)
+
+    def release_browser(self):
+        # The pool replaces the browser if it crashed or grew too much
+        self.browser_pool.release(self.browser)
+        self.browser = None
+        self.readiness = None
 
     def run(self):
+        try:
+            self.scrap_entries()
+        except:
+            self.crashed = True
+            with open("errlog.txt", "a") as errlog:
+                traceback.print_exc(file=errlog)
+            print(f"Scraper #{self._id}: Stopped by an unexpected error, see errlog.txt")
+        finally:
+            if self.browser is not None:
+                self.release_browser()
+            self.company_cache.close()
+
+    def scrap_entries(self):
 
         delimiter = self.config.get('profiles_data', 'delimiter')
 
-        print(f"Scraper #{self._id}: Executing LinkedIn login...")
+        print(f"Scraper #{self._id}: Waiting for a browser...")
 
-        # Doing login on LinkedIn
-        linkedin_login(self.browser, self.config.get('linkedin', 'username'), self.config.get('linkedin', 'password'))
+        self.acquire_browser()
 
         start_time = time.time()
 
         count = 0
 
-        for entry in self.entries:
+        # Entries are pulled from the queue shared with the other scrapers until it is empty
+        item = self.work_queue.get()
+
+        while item is not None:
 
             count += 1
 
             # Print statistics about ending time of the script
-            if count > 1:
-                time_left = ((time.time() - start_time) / count) * (len(self.entries) - count + 1)
+            time_left = self.work_queue.time_left()
+            if time_left is not None:
                 ending_in = time.strftime("%H:%M:%S", time.gmtime(time_left))
             else:
                 ending_in = "Unknown time"
 
-            print(f"Scraper #{self._id}: Scraping profile {count} / {len(self.entries)} - {ending_in} left")
+            print(f"Scraper #{self._id}: Scraping profile {item.index + 1} / {self.work_queue.total} "
+                  f"(attempt {item.attempts}) - {ending_in} left")
 
             try:
-                linkedin_url, known_graduation_date = self.parse_entry(entry, delimiter)
-                scraping_result = self.scrap_profile(linkedin_url, known_graduation_date)
-                self.results.append(scraping_result)
+                linkedin_url, known_graduation_date = parse_entry(item.entry, delimiter)
+                with timers.stage('profile'):
+                    scraping_result = self.scrap_profile(linkedin_url, known_graduation_date)
 
             except CannotProceedScrapingException:
-                self.results.append(ScrapingResult('TerminatedDueToHumanCheckError'))
+                self.save_result(item, ScrapingResult('TerminatedDueToHumanCheckError'))
+                self.work_queue.task_done()
                 self.interrupted = True
                 break
 
             except:
                 with open("errlog.txt", "a") as errlog:
                     traceback.print_exc(file=errlog)
-                self.results.append(ScrapingResult('GenericError'))
+                # The error may be due to the browser itself: it is given back to the pool for a health check
+                self.release_browser()
+                self.acquire_browser()
+                if self.work_queue.retry(item):
+                    item = self.work_queue.get()
+                    continue
+                scraping_result = ScrapingResult('GenericError')
+
+            self.save_result(item, scraping_result)
+            self.work_queue.task_done()
+
+            item = self.work_queue.get()
 
-        # Closing the Chrome instance
-        self.browser.quit()
+        # Giving the Chrome instance back to the pool
+        self.release_browser()
 
         end_time = time.time()
         elapsed_time = time.strftime('%H:%M:%S', time.gmtime(end_time - start_time))
 
-        print(f"Scraper #{self._id}: Parsed {count} / {len(self.entries)} profiles in {elapsed_time}")
+        print(f"Scraper #{self._id}: Parsed {count} profiles in {elapsed_time}")
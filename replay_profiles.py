@@ -0,0 +1,52 @@
+import sys
+import time
+
+from exporter import XlsxExporter, PROFILES_HEADERS, SIMPLE_PROFILES_HEADERS, profiles_row, simple_profiles_row
+from parquet_exporter import ParquetExporter
+from profile_replay import replay_capture, replay_capture_parallel
+
+# Re-parses the pages captured by scrap_profiles.py --capture, without browser nor network.
+#
+#   python replay_profiles.py <capture_directory> <output_file.xlsx> [SIMPLE] [--processes=N]
+#   python replay_profiles.py <capture_directory> <output_directory> --parquet [--processes=N]
+#
+# SIMPLE produces the same excel scheme of scrap_profiles_simple.py
+# --parquet writes the normalized Parquet tables in the output directory instead of the excel file
+# --processes=N spreads the parsing over N processes (default: 1, no process pool)
+
+if len(sys.argv) < 3:
+    print("Usage: python replay_profiles.py <capture_directory> <output_file.xlsx> [SIMPLE] [--parquet] "
+          "[--processes=N]")
+    sys.exit(0)
+
+capture_directory = sys.argv[1]
+output_file_name = sys.argv[2]
+
+processes = 1
+for argument in sys.argv[3:]:
+    if argument.startswith('--processes='):
+        processes = int(argument.split('=')[1])
+
+if '--parquet' in sys.argv[3:]:
+    exporter = ParquetExporter(output_file_name)
+elif 'SIMPLE' in sys.argv[3:]:
+    exporter = XlsxExporter(output_file_name, SIMPLE_PROFILES_HEADERS, simple_profiles_row)
+else:
+    exporter = XlsxExporter(output_file_name, PROFILES_HEADERS, profiles_row)
+
+start_time = time.time()
+
+if processes > 1:
+    replayed_profiles = replay_capture_parallel(capture_directory, processes)
+else:
+    replayed_profiles = replay_capture(capture_directory)
+
+count = 0
+for _, scraping_result in replayed_profiles:
+    exporter.write(scraping_result)
+    count += 1
+
+exporter.close()
+
+elapsed_time = time.time() - start_time
+print(f"Replayed {count} profiles in {elapsed_time:.2f}s ({count / max(elapsed_time, 1e-9):.0f} profiles/s)")
@@ -0,0 +1,68 @@
+import json
+import os
+from threading import Lock
+
+from profile_scraper import ScrapingResult
+
+# Results that are not considered completed: their entries are scraped again when resuming
+RETRYABLE_MESSAGES = ['TerminatedDueToHumanCheckError', 'GenericError']
+
+
+class ResultsJournal:
+    """Append-only JSONL file where each ScrapingResult is written as soon as it is produced"""
+
+    def __init__(self, file_name, resume=False, overwrite=False):
+        if not resume and not overwrite and ResultsJournal.has_records(file_name):
+            # The journal of an interrupted run is the only record of its results: it is not discarded by mistake
+            raise FileExistsError(f"The journal {file_name} of a previous run already exists")
+        self.file_name = file_name
+        self._lock = Lock()
+        # When not resuming a new run is started, discarding the previous journal
+        self._file = open(file_name, "a" if resume else "w", encoding="utf-8")
+        if resume and self._file.tell() > 0 and not self._ends_with_newline():
+            # Terminates the line truncated by a crash, so that it does not corrupt the next record
+            self._file.write("\n")
+
+    def _ends_with_newline(self):
+        with open(self.file_name, "rb") as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def append(self, index, entry, scraping_result):
+        record = {'index': index, 'entry': entry}
+        record.update(scraping_result.to_dict())
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+            # The line must be on disk before going on, so that a crash loses nothing already scraped
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def has_records(file_name):
+        return os.path.exists(file_name) and os.path.getsize(file_name) > 0
+
+    @staticmethod
+    def load_completed(file_name):
+        # Returns a dictionary entry => ScrapingResult of the entries already completed in previous runs
+        completed = {}
+
+        if not os.path.exists(file_name):
+            return completed
+
+        with open(file_name, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Last line truncated by a crash while it was being written
+                    continue
+                if record['message'] in RETRYABLE_MESSAGES:
+                    completed.pop(record['entry'], None)
+                else:
+                    completed[record['entry']] = ScrapingResult.from_dict(record)
+
+        return completed
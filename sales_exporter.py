@@ -1,14 +1,13 @@
 import sys
 import time
 from configparser import ConfigParser
+from threading import Thread
 
 import xlsxwriter
-from pyvirtualdisplay import Display
-from selenium import webdriver
 
-from utils import get_browser_options, linkedin_login, message_to_user
-
-loading_scroll_time = 1
+from browser_pool import BrowserPool
+from page_scroller import PageScroller
+from sales_link_resolver import SalesLinkCache, SalesLinkResolver
 
 print('Insert the sales search url')
 print("> ", end="")
@@ -18,77 +17,96 @@ searchurl= input()
 config = ConfigParser()
 config.read('config.ini')
 
-if config.get('system', 'os') == 'linux':
-    display = Display(visible=0, size=(800, 800))
-    display.start()
-
 headless_option = len(sys.argv) >= 2 and sys.argv[1] == 'HEADLESS'
 
-# Creation of a new instance of Chrome
-browser = webdriver.Chrome(executable_path=config.get('system', 'driver'), options=get_browser_options(headless_option, config))
+# The result links are opened in parallel by their own browsers, one more browser goes through the search pages
+link_workers = int(config.get('sales_export', 'link_workers', fallback='3'))
 
-# Doing login on LinkedIn
-linkedin_login(browser, config.get('linkedin', 'username'), config.get('linkedin', 'password'))
+# Browsers are started (and logged in, if their saved session expired) once
+browser_pool = BrowserPool(config, headless_option, link_workers + 1)
+browser = browser_pool.acquire()
 
-print('Starting salesnav export...')
+# Leads resolved by a previous (interrupted) export are taken from the cache. When too many links are waiting
+# to be resolved, going through the search pages pauses.
+resolver = SalesLinkResolver(browser_pool, config, link_workers, SalesLinkCache.from_config(config),
+                             int(config.get('sales_export', 'link_queue_size', fallback='100')))
+resolver.start()
+
+scroller = PageScroller.from_config(config)
+
+pages_done = 0
+
+
+def paginate():
+    # Producer: goes through the search pages, submitting the links of each page as soon as it is loaded
+    global pages_done
 
-browser.get(searchurl)
-time.sleep(5)
+    try:
+        browser.get(searchurl)
+        time.sleep(5)
 
-print('Calculating pages...')
+        print('Calculating pages...')
 
-# Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
-window_height = browser.execute_script("return window.innerHeight")
-scrolls = 1
-while scrolls * window_height < browser.execute_script("return document.body.offsetHeight"):
-    browser.execute_script(f"window.scrollTo(0, {window_height * scrolls});")
-    time.sleep(loading_scroll_time)
-    scrolls += 1
+        # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
+        scroller.scroll_to_bottom(browser)
 
-number_of_pages = browser.execute_script("lis = document.getElementsByClassName('search-results__pagination-list')[0].children; max = lis[lis.length-1].innerText.split('… ')[1]*1; return max;")
-links = []
+        number_of_pages = browser.execute_script("lis = document.getElementsByClassName('search-results__pagination-list')[0].children; max = lis[lis.length-1].innerText.split('… ')[1]*1; return max;")
 
-for i in range(number_of_pages):
+        for i in range(number_of_pages):
 
-    current_page = i+1
-    print(f'Parsing page {current_page}...')
-    # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
-    window_height = browser.execute_script("return window.innerHeight")
-    scrolls = 1
-    while scrolls * window_height < browser.execute_script("return document.body.offsetHeight"):
-        browser.execute_script(f"window.scrollTo(0, {window_height * scrolls});")
-        time.sleep(loading_scroll_time)
-        scrolls += 1
+            current_page = i+1
+            # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
+            scroller.scroll_to_bottom(browser)
 
-    list_of_links = browser.execute_script("els = document.getElementsByClassName('result-lockup__name'); u=[]; for(i=0; i<els.length; i++){u.push(els[i].children[0].href)} return u;")
+            list_of_links = browser.execute_script("els = document.getElementsByClassName('result-lockup__name'); u=[]; for(i=0; i<els.length; i++){u.push(els[i].children[0].href)} return u;")
 
-    links.extend(list_of_links)
+            for link in list_of_links:
+                resolver.submit(link)
 
-    if current_page >= number_of_pages:
-        continue
+            pages_done = current_page
+            print(f'Parsed page {current_page} / {number_of_pages}: {resolver.progress()}')
 
-    browser.execute_script("lis = document.getElementsByClassName('search-results__pagination-list')[0].children; for (i=0; i<lis.length; i++){if(lis[i].innerText*1=="+str(current_page+1)+"){lis[i].children[0].click()}}")
+            if current_page >= number_of_pages:
+                continue
 
-    time.sleep(5)
+            browser.execute_script("lis = document.getElementsByClassName('search-results__pagination-list')[0].children; for (i=0; i<lis.length; i++){if(lis[i].innerText*1=="+str(current_page+1)+"){lis[i].children[0].click()}}")
 
-linkedin_urls = []
+            time.sleep(5)
 
-for link in links:
-    browser.get(link)
-    time.sleep(2)
-    linkedin_url = browser.execute_script('return (function(){n = document.documentElement.innerHTML.indexOf("https://www.linkedin.com/in/"); url = ""; i=0; while(true){s = document.documentElement.innerHTML[n+i]; if(s==","){url = url.split(""); url.pop(); return url.join("");} else { url = url + s; i++;}}})();')
-    linkedin_urls.append(linkedin_url)
+    finally:
+        # Also when the pagination fails, the links already submitted are resolved and written
+        resolver.finish()
+        browser_pool.release(browser)
 
-workbook = xlsxwriter.Workbook('salesnav_results.xlsx')
+
+print('Starting salesnav export...')
+
+paginator = Thread(target=paginate)
+paginator.start()
+
+workbook = xlsxwriter.Workbook('salesnav_results.xlsx', {'constant_memory': True})
 worksheet = workbook.add_worksheet()
 
 headers = ['Linkedin URL']
 
 worksheet.write(0, 0, 'Linkedin URL')
 
+# Consumer: rows are written in the order of the search results, as soon as each one is resolved, while the
+# next search pages are still being parsed
 i = 1
-for linkedin_url in linkedin_urls:
-    worksheet.write(i, 0, linkedin_url)
+for link, linkedin_url in resolver.results():
+    worksheet.write(i, 0, linkedin_url if linkedin_url is not None else 'N/A')
+    if i % 25 == 0:
+        print(f"Written {i} rows ({pages_done} pages parsed): {resolver.progress()}")
     i += 1
 
-workbook.close()
\ No newline at end of file
+workbook.close()
+
+paginator.join()
+resolver.close()
+browser_pool.close()
+
+print(f"Resolved {resolver.resolved} profiles ({resolver.cache_hits} from the cache) in "
+      f"{time.time() - resolver.start_time:.1f} seconds.")
+
+print(f"Scrolled {scroller.pages} pages in {scroller.total_time:.1f} seconds.")
@@ -0,0 +1,203 @@
+import sqlite3
+import threading
+import time
+import traceback
+from queue import Queue, Empty
+from threading import Lock, Thread
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from linkedin_urls import find_profile_url, sales_lead_key
+from page_readiness import load_timeouts
+
+
+class SalesLinkCache:
+    """Profile url of each Sales Navigator lead already resolved, persisted on a SQLite file: an interrupted
+    export started again does not open the leads already resolved"""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+
+        # sqlite3 connections can not be shared between threads: each thread lazily opens its own. They are all
+        # closed by close(), once the threads using them are done
+        self._local = threading.local()
+        self._connections = []
+        self._lock = Lock()
+
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS leads ("
+                           "lead TEXT PRIMARY KEY, "
+                           "profile_url TEXT, "
+                           "resolved_at REAL)")
+        connection.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('sales_export', 'cache_file_name', fallback='salesnav_links.sqlite'))
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.file_name, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get(self, link):
+        row = self._connection().execute("SELECT profile_url FROM leads WHERE lead = ?",
+                                         (sales_lead_key(link),)).fetchone()
+        return row[0] if row is not None else None
+
+    def put(self, link, profile_url):
+        connection = self._connection()
+        connection.execute("INSERT OR REPLACE INTO leads VALUES (?, ?, ?)",
+                           (sales_lead_key(link), profile_url, time.time()))
+        connection.commit()
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+
+class SalesLinkWorker(Thread):
+    """Opens the lead pages with its own browser, leased from the pool until it fails"""
+
+    def __init__(self, resolver):
+        Thread.__init__(self)
+        self.resolver = resolver
+
+    def run(self):
+        browser = None
+
+        while True:
+            item = self.resolver.links.get()
+            if item is None:
+                break
+            index, link = item
+
+            try:
+                if browser is None:
+                    browser = self.resolver.browser_pool.acquire()
+                profile_url = self.resolver.resolve_link(browser, link)
+            except:
+                with open("errlog.txt", "a") as errlog:
+                    traceback.print_exc(file=errlog)
+                profile_url = None
+                # The error may be due to the browser itself: it is given back to the pool for a health check,
+                # and another one is acquired for the next link
+                if browser is not None:
+                    self.resolver.browser_pool.release(browser)
+                    browser = None
+
+            if profile_url is not None:
+                self.resolver.cache.put(link, profile_url)
+            self.resolver.put_result(index, link, profile_url)
+
+        if browser is not None:
+            self.resolver.browser_pool.release(browser)
+
+
+class SalesLinkResolver:
+    """Resolves the Sales Navigator result links to the profile urls, with workers browsers opening them in
+    parallel. Leads already in the cache are not opened again.
+
+        resolver.start()
+        for link in links:
+            resolver.submit(link)
+        resolver.finish()
+        for link, profile_url in resolver.results():
+            ...
+
+    results() yields in the order the links were submitted, as soon as each one is resolved: links can be
+    submitted by another thread while the results are consumed. When queue_size links are waiting for a
+    browser, submit blocks until one of them is taken.
+    """
+
+    def __init__(self, browser_pool, config, workers, cache, queue_size=0):
+        self.browser_pool = browser_pool
+        self.cache = cache
+
+        timeouts, _ = load_timeouts(config)
+        self.timeout = timeouts['sales_link']
+
+        self.links = Queue(queue_size)
+        self._results = Queue()
+        self._workers = [SalesLinkWorker(self) for _ in range(workers)]
+
+        self._lock = Lock()
+        self.submitted = 0
+        self.resolved = 0
+        self.cache_hits = 0
+        self._finished = False
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.time()
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, link):
+        with self._lock:
+            index = self.submitted
+            self.submitted += 1
+
+        profile_url = self.cache.get(link)
+        if profile_url is not None:
+            with self._lock:
+                self.cache_hits += 1
+            self.put_result(index, link, profile_url)
+        else:
+            self.links.put((index, link))
+
+    def finish(self):
+        # No more links will be submitted: the workers end once the queued ones are resolved
+        self._finished = True
+        for _ in self._workers:
+            self.links.put(None)
+
+    def resolve_link(self, browser, link):
+        # Returns the profile url of the lead, None if it does not appear in the page within the timeout
+        browser.get(link)
+        try:
+            return WebDriverWait(browser, self.timeout, poll_frequency=0.5)\
+                .until(lambda b: find_profile_url(b.page_source))
+        except TimeoutException:
+            return None
+
+    def put_result(self, index, link, profile_url):
+        with self._lock:
+            self.resolved += 1
+        self._results.put((index, link, profile_url))
+
+    def results(self):
+        pending = {}
+        index = 0
+        while not (self._finished and index == self.submitted):
+            if index in pending:
+                yield pending.pop(index)
+                index += 1
+                continue
+            try:
+                result_index, link, profile_url = self._results.get(timeout=1)
+                pending[result_index] = (link, profile_url)
+            except Empty:
+                pass
+
+    def progress(self):
+        with self._lock:
+            resolved, submitted, cache_hits = self.resolved, self.submitted, self.cache_hits
+        elapsed_time = time.time() - self.start_time
+        throughput = resolved / elapsed_time if elapsed_time > 0 else 0
+        return f"{resolved} / {submitted} profiles resolved ({cache_hits} from the cache), " \
+               f"{throughput:.1f} profiles/s"
+
+    def close(self):
+        # The connections of the workers and of the thread submitting the links are closed once all are done
+        for worker in self._workers:
+            worker.join()
+        self.cache.close()
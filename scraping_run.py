@@ -0,0 +1,182 @@
+import sys
+from configparser import ConfigParser
+from queue import Queue
+
+from async_scraper import AsyncProfileScraper
+from browser_pool import BrowserPool
+from company_cache import CompanyCache
+from company_resolver import CompanyResolver
+from exporter import XlsxExporter, get_output_file_name
+from fingerprint_store import FingerprintStore
+from input_pipeline import InputFile
+from instrumentation import timers
+from linkedin_urls import allow_mock_linkedin
+from page_capture import PageCapture
+from parquet_exporter import ParquetExporter
+from profile_scraper import ProfileScraper, iterate_results
+from results_journal import ResultsJournal
+from utils import message_to_user
+from work_queue import WorkQueue
+
+
+def scrap_profiles(headers, row):
+    # Run of scrap_profiles.py and scrap_profiles_simple.py: they differ only in the columns of the excel file,
+    # given by its headers and by the function returning the row of each ScrapingResult (see exporter.py)
+
+    # Loading of configurations
+    config = ConfigParser()
+    config.read('config.ini')
+    allow_mock_linkedin(config)
+
+    headless_option = 'HEADLESS' in sys.argv[1:]
+
+    # In resume mode the entries already completed by a previous (interrupted) run are not scraped again
+    resume_option = '--resume' in sys.argv[1:]
+
+    # The journal of a previous run is overwritten only when explicitly requested
+    overwrite_journal_option = '--overwrite-journal' in sys.argv[1:]
+
+    # In capture mode the html of the visited pages is saved, so that it can be re-parsed offline (replay_profiles.py)
+    capture_option = '--capture' in sys.argv[1:]
+
+    # In report mode the time spent in each stage is measured and saved in a report at the end of the run
+    report_option = '--report' in sys.argv[1:]
+
+    # In parquet mode the results are written as normalized Parquet tables (profiles, jobs, educations, skills)
+    # instead of the excel file
+    parquet_option = '--parquet' in sys.argv[1:]
+
+    # Profiles whose content did not change since the previous run are reused, unless a full scraping is requested
+    full_option = '--full' in sys.argv[1:]
+
+    # In async mode a single thread drives many browser contexts of one Chrome instance
+    async_option = 'ASYNC' in sys.argv[1:]
+
+    if report_option:
+        timers.enable()
+
+    journal_file_name = config.get('profiles_data', 'journal_file_name', fallback='results_journal.jsonl')
+
+    if not resume_option and not overwrite_journal_option and ResultsJournal.has_records(journal_file_name):
+        print(f"The journal {journal_file_name} of a previous run already exists: add --resume to complete that run, "
+              f"or --overwrite-journal to discard it and start a new one.")
+        return
+
+    if resume_option:
+        previous_results = ResultsJournal.load_completed(journal_file_name)
+        print(f"Resuming: {len(previous_results)} entries already completed.")
+    else:
+        previous_results = {}
+
+    # The input file is validated before starting: bad entries are reported now, not when a scraper gets to them,
+    # and the same profile is scraped once, whatever the form of its url in the input file
+    entries = InputFile(config.get('profiles_data', 'input_file_name'), config.get('profiles_data', 'delimiter'),
+                        previous_results.keys())
+    print(entries.report())
+
+    if entries.total == 0:
+        print("Please provide an input.")
+        return
+
+    journal = ResultsJournal(journal_file_name, resume_option, overwrite_journal_option)
+
+    # All the scrapers pull the entries from the same queue, so none of them stays idle while work is left
+    work_queue = WorkQueue(entries, int(config.get('system', 'max_retries', fallback='1')), previous_results.keys(),
+                           entries.to_scrape)
+
+    if headless_option or async_option:
+        number_of_scrapers = min(int(config.get('system', 'max_threads')), work_queue.total)
+    else:
+        number_of_scrapers = min(1, work_queue.total)
+
+    if number_of_scrapers > 1:
+        print(f"Starting {number_of_scrapers} parallel scrapers.")
+    else:
+        print("Starting scraping...")
+
+    # Company data already scraped (also in previous runs) is shared between all the scrapers
+    company_cache = CompanyCache.from_config(config)
+
+    if capture_option:
+        capture = PageCapture(config.get('profiles_data', 'capture_directory', fallback='captures'))
+    else:
+        capture = None
+
+    # In capture mode all the pages are visited, so that the captures contain all the profiles
+    fingerprints = FingerprintStore.from_config(config, not full_option and not capture_option)
+
+    results_queue = Queue()
+
+    scrapers = []
+    browser_pool = None
+    company_resolver = None
+
+    if async_option:
+        scrapers.append(AsyncProfileScraper(work_queue, results_queue, config, headless_option, number_of_scrapers,
+                                            company_cache, journal, capture, fingerprints))
+    else:
+        # In headless mode company pages are fetched by their own workers, each page once, while the scrapers go on
+        # with the profiles. Otherwise the single scraper opens them itself, in the one Chrome window to look after
+        # for the Human Check.
+        if headless_option:
+            company_workers = int(config.get('system', 'company_workers', fallback='2'))
+        else:
+            company_workers = 0
+
+        # Browsers are started (and logged in, if their saved session expired) once, then leased to the scrapers
+        # and to the company workers
+        browser_pool = BrowserPool(config, headless_option,
+                                   min(int(config.get('system', 'browser_pool_size',
+                                                      fallback=str(number_of_scrapers + company_workers))),
+                                       number_of_scrapers + company_workers))
+
+        if company_workers > 0:
+            company_resolver = CompanyResolver(browser_pool, config, company_workers, company_cache, capture)
+            company_resolver.start()
+
+        for _ in range(number_of_scrapers):
+            scrapers.append(ProfileScraper(len(scrapers)+1, work_queue, results_queue, browser_pool, config,
+                                           headless_option, company_cache, journal, capture, company_resolver,
+                                           fingerprints))
+
+    for scraper in scrapers:
+        scraper.start()
+
+    # Generation of the output file with profiles data: rows are written while the scrapers are still running
+    if parquet_option:
+        exporter = ParquetExporter.from_config(config, 'profiles_data')
+    else:
+        exporter = XlsxExporter(get_output_file_name(config, 'profiles_data'), headers, row)
+    # Results are complete when both the scrapers and the company resolver have nothing left to do
+    stages = scrapers + [company_resolver] if company_resolver is not None else scrapers
+    exporter.write_all(iterate_results(results_queue, entries, previous_results, work_queue, stages))
+    exporter.close()
+
+    for scraper in scrapers:
+        scraper.join()
+
+    if company_resolver is not None:
+        company_resolver.close()
+
+    if browser_pool is not None:
+        browser_pool.close()
+
+    journal.close()
+
+    print(f"Incremental scraping: {fingerprints.report()}")
+    fingerprints.close()
+
+    if report_option:
+        report_file_name = config.get('profiles_data', 'report_file_name', fallback='run_report.json')
+        timers.write_report(report_file_name)
+        print(f"Run report saved in {report_file_name}")
+
+    if any(scraper.interrupted for scraper in scrapers) or \
+            (company_resolver is not None and company_resolver.interrupted):
+        message_to_user("The scraping didnt end correctly due to Human Check. The output file was generated but it "
+                        "will contain some entries reporting an error string.", config)
+    elif any(scraper.crashed for scraper in scrapers):
+        message_to_user("The scraping didnt end correctly due to an unexpected error, see errlog.txt. The output file "
+                        "was generated but it will contain some entries reporting an error string.", config)
+    else:
+        message_to_user('Scraping successfully ended.', config)
@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 from configparser import ConfigParser
@@ -5,11 +6,12 @@ from configparser import ConfigParser
 import xlsxwriter
 from pyvirtualdisplay import Display
 from selenium import webdriver
+from candidate_matching import CandidateMatcher, EducationIndex
+from page_readiness import PageReadiness
+from page_scroller import PageScroller
+from parquet_exporter import ParquetTableWriter, SEARCHES_SCHEMA, get_output_directory_name
 from utils import linkedin_login, message_to_user, get_browser_options
 
-waiting_time_to_load_page = 1
-waiting_time_to_load_results = 5
-
 # Loading of configurations
 config = ConfigParser()
 config.read('config.ini')
@@ -20,12 +22,28 @@ if config.get('system', 'os') == 'linux':
 
 headless_option = len(sys.argv) >= 2 and sys.argv[1] == 'HEADLESS'
 
+# In parquet mode each result is written, as soon as it is found, to a Parquet table instead of the excel file
+parquet_option = '--parquet' in sys.argv[1:]
+
+if parquet_option:
+    output_directory_name = get_output_directory_name(config, 'profiles_data_by_name')
+    os.makedirs(output_directory_name, exist_ok=True)
+    searches_table = ParquetTableWriter(os.path.join(output_directory_name, 'searches.parquet'), SEARCHES_SCHEMA,
+                                        int(config.get('profiles_data_by_name', 'parquet_row_group_size',
+                                                       fallback='1000')))
+
 # Creation of a new instance of Chrome
 browser = webdriver.Chrome(executable_path=config.get('system', 'driver'), options=get_browser_options(headless_option, config))
 
 # Doing login on LinkedIn
 linkedin_login(browser, config.get('linkedin', 'username'), config.get('linkedin', 'password'))
 
+scroller = PageScroller.from_config(config)
+matcher = CandidateMatcher(browser, PageReadiness.from_config(browser, config), scroller)
+
+# Other names of the universities, in addition to the ones known (e.g. polimi = politecnico di milano)
+university_aliases = dict(config.items('university_aliases')) if config.has_section('university_aliases') else None
+
 message_to_user('Starting reading Linkedin profiles', config)
 
 results = []
@@ -54,11 +72,6 @@ for query in open(config.get('profiles_data_by_name', 'input_file_name'), "r"):
     except:
         graduation_date = None
 
-    education_constraints = {
-        'course': course,
-        'university': university
-    }
-
     if len(first_name.split(" ")) > 1:
         first_name = first_name.split(" ")[0]
 
@@ -67,6 +80,8 @@ for query in open(config.get('profiles_data_by_name', 'input_file_name'), "r"):
 
     name = first_name + " " + last_name
 
+    education_index = EducationIndex(university, course, graduation_date, university_aliases)
+
     needToLoop = True
 
     while needToLoop:
@@ -74,94 +89,8 @@ for query in open(config.get('profiles_data_by_name', 'input_file_name'), "r"):
         best_solution = ['N/A', '', '']
 
         try:
-            # Clears the search box
-            browser.find_element_by_class_name('search-global-typeahead__input').clear()
-
-            time.sleep(1)
-
-            # Search on the search bar the name of the person we are looking for
-            browser.find_element_by_class_name('search-global-typeahead__input').send_keys(name.strip())
-
-            time.sleep(waiting_time_to_load_results)
-
-            search_results = browser.find_elements_by_css_selector('.basic-typeahead__triggered-content > div > div')[1:-1]
-
-            i = 0
-
-            while i < len(search_results) and not (best_solution[1] is True and best_solution[2] == 'GRAD_CHECKED'):
-
-                if i > 0:
-                    # Clears the search box
-                    browser.find_element_by_class_name('search-global-typeahead__input').clear()
-
-                    time.sleep(1)
-
-                    # Search on the search bar the name of the person we are looking for
-                    browser.find_element_by_class_name('search-global-typeahead__input').send_keys(name.strip())
-
-                    time.sleep(waiting_time_to_load_results)
-
-                    search_results = browser.find_elements_by_css_selector(
-                        '.basic-typeahead__triggered-content > div > div')[1:-1]
-
-                search_results[i].click()
-
-                time.sleep(5*waiting_time_to_load_page)
-
-                if 'com/in/' in browser.current_url:
-
-                    # Loading the entire page (LinkedIn loads content asynchronously based on your scrolling)
-                    window_height = browser.execute_script("return window.innerHeight")
-                    scrolls = 1
-                    while scrolls * window_height < browser.execute_script("return document.body.offsetHeight"):
-                        browser.execute_script(f"window.scrollTo(0, {window_height * scrolls});")
-                        time.sleep(waiting_time_to_load_page)
-                        scrolls += 1
-
-                    try:
-                        educations = browser.find_element_by_id('education-section').find_elements_by_tag_name('li')
-                    except:
-                        educations = []
-
-                    for education in educations:
-                        try:
-                            school_name = education.find_element_by_class_name('pv-entity__school-name').text
-                        except:
-                            school_name = ''
-
-                        if education_constraints['university'] is None:
-                            continue
-
-                        education_checked = False
-
-                        if any(x in school_name for x in education_constraints['university']):
-
-                            edu_info = education.find_element_by_class_name('pv-entity__degree-info').text
-
-                            if education_constraints['course'] is not None:
-                                if any(x in edu_info.lower() for x in education_constraints['course']):
-                                    education_checked = True
-                            else:
-                                education_checked = True
-
-                            # Check if the graduation year known is equal to the one specified in LinkedIn
-                            grad_check = 'NO_GRAD_CHECK'
-                            if graduation_date is not None:
-                                graduation_year = '20' + graduation_date.split('/')[-1].strip()
-                                try:
-                                    education_dates = education.find_element_by_class_name(
-                                        'pv-entity__dates').text.split(' – ')
-                                    if graduation_year == education_dates[1].strip():
-                                        grad_check = 'GRAD_CHECKED'
-                                except:
-                                    pass
-
-                            if (best_solution[1] is False and education_checked is True) \
-                                    or best_solution[1] == '' \
-                                    or (best_solution[2] == 'NO_GRAD_CHECK' and grad_check == 'GRAD_CHECKED')\
-                                    or best_solution[2] == '':
-                                best_solution = [browser.current_url, education_checked, grad_check]
-                i += 1
+            # The name is searched once: the candidates are then opened directly, until one matches perfectly
+            best_solution = matcher.find(name, education_index)
 
             needToLoop = False
 
@@ -175,6 +104,13 @@ for query in open(config.get('profiles_data_by_name', 'input_file_name'), "r"):
             else:
                 needToLoop = False
 
+    if parquet_option:
+        searches_table.append([name,
+                               best_solution[0],
+                               best_solution[1] if best_solution[1] != '' else None,
+                               best_solution[2] if best_solution[2] != '' else None])
+        continue
+
     results.append(
         [
             name,
@@ -186,6 +122,14 @@ for query in open(config.get('profiles_data_by_name', 'input_file_name'), "r"):
 
 browser.quit()
 
+print(f"Searched {matcher.searches} names, visiting {matcher.candidates_visited} candidates.")
+print(f"Scrolled {scroller.pages} profiles in {scroller.total_time:.1f} seconds.")
+
+if parquet_option:
+    searches_table.close()
+    message_to_user('Search of profiles ended.', config)
+    sys.exit(0)
+
 # Generation of XLS file with profiles data
 
 output_file_name = config.get('profiles_data_by_name', 'output_file_name')
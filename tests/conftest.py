@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
+
+# The modules of the scraper live at the top of the repository, the mock of LinkedIn in benchmarks
+ROOT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIRECTORY)
+sys.path.insert(0, os.path.join(ROOT_DIRECTORY, 'benchmarks'))
+
+import linkedin_urls  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def run_in_temporary_directory(monkeypatch, tmp_path):
+    # The scrapers write errlog.txt (and other files) in the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def no_mock_linkedin():
+    # The urls of the mock server are accepted only by the tests enabling it (see mock_scraping.mock_config)
+    yield
+    linkedin_urls._mock_base_url = None
+
+
+def chromium_available():
+    try:
+        with sync_playwright() as playwright:
+            playwright.chromium.launch().close()
+        return True
+    except PlaywrightError:
+        return False
+
+
+@pytest.fixture(scope='session')
+def chromium():
+    # The tests running scripts in headless Chromium fail when it can not be started: they are skipped only when
+    # SKIP_BROWSER_TESTS is set
+    if not chromium_available():
+        if os.environ.get('SKIP_BROWSER_TESTS', '') != '':
+            pytest.skip("Chromium for Playwright is not installed (SKIP_BROWSER_TESTS is set)")
+        pytest.fail("Chromium for Playwright can not be started: install it with "
+                    "'python -m playwright install chromium', or set SKIP_BROWSER_TESTS=1 to skip the tests needing it")
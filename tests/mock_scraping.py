@@ -0,0 +1,70 @@
+import os
+from configparser import ConfigParser
+from queue import Queue
+
+from company_cache import CompanyCache
+from company_resolver import CompanyResolver
+from input_pipeline import InputFile
+from linkedin_urls import allow_mock_linkedin, canonical_profile_url
+from mock_linkedin import HttpBrowserPool, profile_spec
+from profile_scraper import ProfileScraper, iterate_results
+from work_queue import WorkQueue
+
+
+def mock_config(directory, server):
+    # The urls of the mock server are accepted as LinkedIn urls
+    config = ConfigParser()
+    config.read_dict({'profiles_data': {'delimiter': ':::'},
+                      'company_cache': {'file_name': os.path.join(directory, 'companies_cache.sqlite')},
+                      'system': {'max_retries': '1', 'company_workers': '2', 'mock_linkedin_url': server.base_url},
+                      # The pages of the mock server are complete as soon as they are loaded
+                      'timeouts': {'company_page': '0.5'}})
+    allow_mock_linkedin(config)
+    return config
+
+
+def write_input_file(directory, server, indexes):
+    input_file_name = os.path.join(directory, 'profiles_data.txt')
+    with open(input_file_name, 'w') as input_file:
+        for i in indexes:
+            input_file.write(f"{server.profile_url(i)}:::{profile_spec(i, server.companies)['graduation_date']}\n")
+    return input_file_name
+
+
+def scrap_mock_profiles(server, directory, indexes, threads=2, capture=None, fingerprints=None):
+    # Scrapes the profiles of the mock server as scrap_profiles.py does: returns canonical url => ScrapingResult
+    results, _, _ = run_mock_scraping(server, directory, indexes, threads, capture, fingerprints)
+    return results
+
+
+def run_mock_scraping(server, directory, indexes, threads=2, capture=None, fingerprints=None):
+    # Returns the results of scrap_mock_profiles, the scrapers and the company resolver
+    config = mock_config(directory, server)
+    entries = InputFile(write_input_file(directory, server, indexes), config.get('profiles_data', 'delimiter'))
+    work_queue = WorkQueue(entries, int(config.get('system', 'max_retries')), total=entries.to_scrape)
+
+    company_workers = int(config.get('system', 'company_workers'))
+    browser_pool = HttpBrowserPool(threads + company_workers)
+    company_cache = CompanyCache.from_config(config)
+    results_queue = Queue()
+
+    company_resolver = CompanyResolver(browser_pool, config, company_workers, company_cache, capture)
+    company_resolver.start()
+
+    scrapers = [ProfileScraper(i + 1, work_queue, results_queue, browser_pool, config, True, company_cache,
+                               capture=capture, company_resolver=company_resolver, fingerprints=fingerprints)
+                for i in range(threads)]
+    for scraper in scrapers:
+        scraper.start()
+
+    results = {}
+    for entry, scraping_result in zip(entries, iterate_results(results_queue, entries, {}, work_queue,
+                                                                scrapers + [company_resolver])):
+        results[canonical_profile_url(entry.split(':::')[0])] = scraping_result
+
+    for scraper in scrapers:
+        scraper.join()
+    company_resolver.close()
+    company_cache.close()
+
+    return results, scrapers, company_resolver
@@ -0,0 +1,105 @@
+from queue import Queue
+
+import pytest
+
+from async_scraper import AsyncProfileScraper
+from company_cache import CompanyCache
+from input_pipeline import InputFile
+from linkedin_urls import canonical_profile_url
+from mock_linkedin import MockAsyncProfileScraper, MockLinkedInServer, profile_spec
+from mock_scraping import mock_config, write_input_file, scrap_mock_profiles
+from profile_scraper import iterate_results
+from work_queue import WorkQueue
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = MockLinkedInServer(12)
+    yield server
+    server.close()
+
+
+def scrap_mock_profiles_async(server, directory, indexes, concurrency=3, chrome_path='',
+                              scraper_class=AsyncProfileScraper):
+    # Same as mock_scraping.scrap_mock_profiles, with the AsyncProfileScraper driving headless Chromium (or the
+    # HttpAsyncBrowser of the MockAsyncProfileScraper)
+    config = mock_config(directory, server)
+    config.read_dict({'system': {'chrome_path': chrome_path}})
+    entries = InputFile(write_input_file(directory, server, indexes), config.get('profiles_data', 'delimiter'))
+    work_queue = WorkQueue(entries, int(config.get('system', 'max_retries')), total=entries.to_scrape)
+    results_queue = Queue()
+
+    if scraper_class is AsyncProfileScraper:
+        scraper = AsyncProfileScraper(work_queue, results_queue, config, True, concurrency,
+                                      CompanyCache.from_config(config), login=False)
+    else:
+        scraper = scraper_class(work_queue, results_queue, config, True, concurrency, CompanyCache.from_config(config))
+    scraper.start()
+
+    results = {}
+    for entry, scraping_result in zip(entries, iterate_results(results_queue, entries, {}, work_queue, [scraper])):
+        results[canonical_profile_url(entry.split(':::')[0])] = scraping_result
+    scraper.join()
+
+    return scraper, results
+
+
+def test_browser_failing_to_start_is_not_a_human_check(server, tmp_path):
+    scraper, results = scrap_mock_profiles_async(server, str(tmp_path), range(12),
+                                                 chrome_path=str(tmp_path / 'no-chrome'))
+
+    assert scraper.crashed and not scraper.interrupted
+    assert len(results) == 12
+    assert all(scraping_result.message == 'ScraperCrashed' for scraping_result in results.values())
+
+
+def test_async_scraper_on_the_mock_server(chromium, server, tmp_path):
+    scraper, results = scrap_mock_profiles_async(server, str(tmp_path), range(12))
+    assert not scraper.crashed and not scraper.interrupted
+
+    (tmp_path / 'threads').mkdir()
+    expected_results = scrap_mock_profiles(server, str(tmp_path / 'threads'), range(12))
+
+    assert len(results) == len(expected_results)
+    for url, scraping_result in results.items():
+        assert not scraping_result.is_error(), scraping_result.message
+        assert scraping_result.to_dict() == expected_results[url].to_dict(), url
+
+
+def test_async_scraper_with_the_mock_browser(server, tmp_path):
+    scraper, results = scrap_mock_profiles_async(server, str(tmp_path), range(12),
+                                                 scraper_class=MockAsyncProfileScraper)
+    assert not scraper.crashed and not scraper.interrupted
+
+    (tmp_path / 'threads').mkdir()
+    expected_results = scrap_mock_profiles(server, str(tmp_path / 'threads'), range(12))
+
+    assert len(results) == len(expected_results)
+    for url, scraping_result in results.items():
+        assert not scraping_result.is_error(), scraping_result.message
+        assert scraping_result.to_dict() == expected_results[url].to_dict(), url
+
+    # The company pages are opened in the context of the scraper, not in the ones of the profiles
+    company_contexts = [context for context in scraper.browser.contexts
+                        if any('/company/' in url for url in context.visited)]
+    assert len(company_contexts) == 1
+    assert not any('/in/' in url for url in company_contexts[0].visited)
+
+
+def test_human_check_on_a_company_page_stops_the_async_scraper(tmp_path):
+    # Company 18 (in the jobs of the profiles 11, 13, 14, 16, 23 and 35) asks for the Human Check
+    server = MockLinkedInServer(40, checkpoint_companies=[18])
+    try:
+        scraper, results = scrap_mock_profiles_async(server, str(tmp_path), range(40),
+                                                     scraper_class=MockAsyncProfileScraper)
+    finally:
+        server.close()
+
+    assert scraper.interrupted and not scraper.crashed
+    for i, scraping_result in enumerate(results.values()):
+        if any(job['company'] == 18 for job in profile_spec(i, server.companies)['jobs']):
+            assert scraping_result.message == 'TerminatedDueToHumanCheckError'
+
+    company_cache = CompanyCache(str(tmp_path / 'companies_cache.sqlite'), 3600, 100)
+    assert company_cache.get(server.base_url + '/company/company-18/') is None
+    company_cache.close()
@@ -0,0 +1,92 @@
+import subprocess
+import sys
+from configparser import ConfigParser
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import browser_pool
+from browser_pool import BrowserPool, browser_memory_mb
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeBrowser:
+    """Stand-in of the Chrome WebDriver: its 'chromedriver' is a child python process"""
+
+    def __init__(self):
+        self.service = FakeService(subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']))
+        self.crashed = False
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise WebDriverException('chrome not reachable')
+        return 'https://www.linkedin.com/feed/'
+
+    def quit(self):
+        self.service.process.kill()
+        self.service.process.wait()
+
+
+class FakeBrowserPool(BrowserPool):
+
+    def __init__(self, size):
+        self.failing_spawns = 0
+        config = ConfigParser()
+        config.read_dict({'system': {'os': 'windows', 'browser_spawn_attempts': '2'}})
+        BrowserPool.__init__(self, config, True, size)
+
+    def _spawn(self, slot):
+        if self.failing_spawns > 0:
+            self.failing_spawns -= 1
+            raise WebDriverException('chrome failed to start')
+        browser = FakeBrowser()
+        with self._lock:
+            self._slots[browser] = slot
+        return browser
+
+
+@pytest.fixture(autouse=True)
+def no_spawn_delay(monkeypatch):
+    monkeypatch.setattr(browser_pool, 'SPAWN_RETRY_DELAY', 0)
+
+
+def test_memory_of_the_process_tree():
+    browser = FakeBrowser()
+    try:
+        assert browser_memory_mb(browser) > 1
+    finally:
+        browser.quit()
+
+
+def test_browser_grown_too_much_is_replaced():
+    pool = FakeBrowserPool(1)
+    browser = pool.acquire()
+    pool.max_memory = 0
+    pool.release(browser)
+    pool.max_memory = 2048
+
+    assert pool.acquire() is not browser
+    pool.close()
+
+
+def test_slot_is_kept_when_the_browser_fails_to_start():
+    pool = FakeBrowserPool(1)
+    browser = pool.acquire()
+    browser.crashed = True
+
+    # Both the attempts of the release fail, then both the ones of the next acquire
+    pool.failing_spawns = 4
+    pool.release(browser)
+
+    with pytest.raises(WebDriverException):
+        pool.acquire()
+
+    new_browser = pool.acquire()
+    assert new_browser is not browser and not new_browser.crashed
+    pool.release(new_browser)
+    pool.close()
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from mock_linkedin import MockLinkedInServer
+from mock_scraping import scrap_mock_profiles
+from page_capture import PageCapture, load_capture_index
+from profile_replay import replay_capture, replay_capture_parallel
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = MockLinkedInServer(30)
+    yield server
+    server.close()
+
+
+def assert_same_profiles(live_results, replayed_results):
+    assert len(replayed_results) == len(live_results)
+    for url, scraping_result in replayed_results:
+        assert scraping_result.to_dict() == live_results[url].to_dict(), url
+
+
+def test_replay_of_a_capture_with_a_warm_company_cache(server, tmp_path):
+    # The first run fills the company cache: in the captured run part of the companies are taken from it,
+    # with no company page visited
+    scrap_mock_profiles(server, str(tmp_path), range(0, 15))
+
+    capture_directory = os.path.join(str(tmp_path), 'captures')
+    live_results = scrap_mock_profiles(server, str(tmp_path), range(30), capture=PageCapture(capture_directory))
+
+    _, company_records = load_capture_index(capture_directory)
+    assert any('company_data' in record for record in company_records.values())
+    assert any('file' in record for record in company_records.values())
+
+    assert_same_profiles(live_results, list(replay_capture(capture_directory)))
+    assert_same_profiles(live_results, list(replay_capture_parallel(capture_directory, 2, chunk_size=4)))
+
+
+def test_company_data_is_captured_once(server, tmp_path):
+    scrap_mock_profiles(server, str(tmp_path), range(30))
+
+    capture_directory = os.path.join(str(tmp_path), 'captures')
+    capture = PageCapture(capture_directory)
+    scrap_mock_profiles(server, str(tmp_path), range(30), capture=capture)
+
+    with open(os.path.join(capture_directory, 'index.jsonl'), encoding='utf-8') as index_file:
+        company_lines = [line for line in index_file if '"type": "company"' in line]
+    _, company_records = load_capture_index(capture_directory)
+    assert len(company_lines) == len(company_records)
@@ -0,0 +1,96 @@
+import pytest
+
+import company_cache as company_cache_module
+from company_cache import PRUNE_INTERVAL, CompanyCache
+from mock_linkedin import MockLinkedInServer, company_path, profile_spec
+from mock_scraping import run_mock_scraping
+
+
+@pytest.fixture(scope='module')
+def server():
+    # Company 18 (in the jobs of the profiles 11, 13, 14, 16, 23 and 35) asks for the Human Check
+    server = MockLinkedInServer(40, checkpoint_companies=[18])
+    yield server
+    server.close()
+
+
+def has_company(index, server, company):
+    return any(job['company'] == company for job in profile_spec(index, server.companies)['jobs'])
+
+
+def test_human_check_on_a_company_page_stops_the_scraping(server, tmp_path):
+    results, scrapers, company_resolver = run_mock_scraping(server, str(tmp_path), range(40))
+
+    assert company_resolver.interrupted
+    assert all(scraper.interrupted and not scraper.crashed for scraper in scrapers)
+
+    # The profiles of the company are not completed with wrong (N/A) company data
+    for i, scraping_result in enumerate(results.values()):
+        if has_company(i, server, 18):
+            assert scraping_result.message == 'TerminatedDueToHumanCheckError'
+    assert list(results.values())[-1].message == 'TerminatedDueToHumanCheckError'
+
+
+def test_company_cache_hits_only_read(tmp_path):
+    company_cache = CompanyCache(str(tmp_path / 'companies_cache.sqlite'), 3600, 100)
+    company_cache.put('https://www.linkedin.com/company/acme/', 'Research', 'Acme', 'Milano, Italia')
+
+    connection = company_cache._connection()
+    changes = connection.total_changes
+    for _ in range(3):
+        assert company_cache.get('https://www.linkedin.com/company/acme/')['companyname'] == 'Acme'
+    assert connection.total_changes == changes
+    company_cache.close()
+
+
+def test_company_cache_is_pruned_every_few_insertions(tmp_path, monkeypatch):
+    file_name = str(tmp_path / 'companies_cache.sqlite')
+    company_cache = CompanyCache(file_name, 3600, 10)
+    connection = company_cache._connection()
+
+    def size():
+        return connection.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    now = 1000000.0
+    monkeypatch.setattr(company_cache_module.time, 'time', lambda: now)
+    for i in range(PRUNE_INTERVAL - 1):
+        now += 1
+        company_cache.put(f"https://www.linkedin.com/company/company-{i}/", 'Research', f"Company {i}", 'Italia')
+    assert size() == PRUNE_INTERVAL - 1
+
+    # The least recently used entries are dropped
+    now += 1
+    company_cache.put('https://www.linkedin.com/company/last/', 'Research', 'Last', 'Italia')
+    assert size() == 10
+    assert company_cache.get('https://www.linkedin.com/company/last/') is not None
+    assert company_cache.get('https://www.linkedin.com/company/company-0/') is None
+    company_cache.close()
+
+    # The expired entries are dropped when the cache is opened again
+    now += 3600
+    company_cache = CompanyCache(file_name, 3600, 10)
+    connection = company_cache._connection()
+    assert size() == 1
+    company_cache.close()
+
+
+def test_company_pages_not_rendered_are_not_cached(tmp_path):
+    # Company 5 (in the jobs of some of the profiles) never shows its data
+    server = MockLinkedInServer(40, unrendered_companies=[5])
+    try:
+        results, _, company_resolver = run_mock_scraping(server, str(tmp_path), range(40))
+    finally:
+        server.close()
+
+    assert not company_resolver.interrupted
+    profiles = [i for i in range(40) if has_company(i, server, 5)]
+    assert len(profiles) > 0
+    for i in profiles:
+        scraping_result = list(results.values())[i]
+        assert not scraping_result.is_error()
+
+    company_cache = CompanyCache(str(tmp_path / 'companies_cache.sqlite'), 3600, 100)
+    assert company_cache.get(server.base_url + '/company/company-5/') is None
+    assert company_cache.get(server.base_url + company_path(next(
+        job['company'] for job in profile_spec(0, server.companies)['jobs'] if job['company'] != 5))) is not None
+    company_cache.close()
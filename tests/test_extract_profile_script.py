@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+from mock_linkedin import number_of_companies, profile_spec, render_profile_page
+from profile_parser import EXTRACT_PROFILE_SCRIPT, extract_profile_data, parse_page
+
+# EXTRACT_PROFILE_SCRIPT is run in headless Chromium on the same html parsed by extract_profile_data: the payloads
+# must be equal, or the live scrapers and the replay of a capture (and the mock browser) read different data
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# XPath expressions of the script: the object assigned to its variable paths
+SCRIPT_PATHS, _ = json.JSONDecoder().raw_decode(EXTRACT_PROFILE_SCRIPT,
+                                                EXTRACT_PROFILE_SCRIPT.index('var paths = ') + len('var paths = '))
+
+# Runs the script (read from stdin with the page) in node, with a document answering document.evaluate from the
+# results of the same XPath expressions evaluated by lxml: everything but the browser's html parser and XPath
+# engine (text normalization, parsing of the positions, new URL(href, base), JSON output) is the script's own code
+NODE_DOCUMENT = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+function element(id) { return {id: id, textContent: input.texts[id]}; }
+global.XPathResult = {ORDERED_NODE_SNAPSHOT_TYPE: 7};
+global.document = {id: 'document', evaluate: function (path, context, resolver, type) {
+    if (type !== XPathResult.ORDERED_NODE_SNAPSHOT_TYPE) { throw new Error('unexpected result type ' + type); }
+    const found = (input.results[path][context.id] || []).map(function (item) {
+        return typeof item === 'number' ? element(item) : {value: item};
+    });
+    return {snapshotLength: found.length, snapshotItem: function (i) { return found[i]; }};
+}};
+process.stdout.write(eval(input.script));
+"""
+
+
+def fixture_pages():
+    pages = []
+    for file_name in sorted(os.listdir(FIXTURES_DIRECTORY)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(FIXTURES_DIRECTORY, file_name), encoding='utf-8') as page_file:
+                pages.append(pytest.param(page_file.read(), id=file_name))
+
+    # Pages of the mock server, with relative company links as on LinkedIn
+    companies = number_of_companies(20)
+    for index in range(20):
+        pages.append(pytest.param(render_profile_page(profile_spec(index, companies), '', filler_blocks=2),
+                                  id=f"mock-profile-{index}"))
+
+    pages.append(pytest.param('<html><body><h1>This page doesn\'t exist</h1></body></html>', id='not-a-profile'))
+    return pages
+
+
+def run_in_node(page_source):
+    tree = parse_page(page_source)
+    elements = [element for element in tree.iter() if isinstance(element.tag, str)]
+    ids = {element: i for i, element in enumerate(elements)}
+
+    # path => context (element id, or 'document') => elements (ids) or attribute values found
+    results = {}
+    for key, path in SCRIPT_PATHS.items():
+        if key == 'baseUrl':
+            continue
+        results[path] = {}
+        for context_id, context in [('document', tree)] + list(enumerate(elements)):
+            found = [str(item) if isinstance(item, str) else ids[item] for item in context.xpath(path)]
+            if len(found) > 0:
+                results[path][context_id] = found
+
+    node = subprocess.run(['node', '-e', NODE_DOCUMENT], check=True, capture_output=True, encoding='utf-8',
+                          input=json.dumps({'script': EXTRACT_PROFILE_SCRIPT, 'results': results,
+                                            'texts': [element.text_content() for element in elements]}))
+    return json.loads(node.stdout)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+@pytest.mark.parametrize('page_source', fixture_pages())
+def test_script_logic_in_node(page_source):
+    assert run_in_node(page_source) == extract_profile_data(parse_page(page_source))
+
+
+@pytest.fixture(scope='module')
+def page(chromium):
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        yield browser.new_page()
+        browser.close()
+
+
+@pytest.mark.parametrize('page_source', fixture_pages())
+def test_script_reads_the_same_data_of_the_parser(page, page_source):
+    page.set_content(page_source)
+    browser_data = json.loads(page.evaluate(EXTRACT_PROFILE_SCRIPT))
+
+    assert browser_data == extract_profile_data(parse_page(page_source))
+
+
+def test_fixture_covers_the_edge_cases():
+    # The expected payload of the fixture, so that a change of both the script and the parser is noticed too
+    with open(os.path.join(FIXTURES_DIRECTORY, 'profile_page.html'), encoding='utf-8') as page_file:
+        profile_data = extract_profile_data(parse_page(page_file.read()))
+
+    assert profile_data['name'] == 'Federica Rossi'
+    assert profile_data['skills'] == ['Python', 'C++', 'Machine Learning']
+    assert [job['title'] for job in profile_data['jobs']] == ['Senior Data Engineer', 'Stagista',
+                                                             'Freelance consultant', 'Company NameGrouped Company',
+                                                             'Team Lead', 'Developer']
+    assert profile_data['jobs'][0] == {'daterange': 'Mar 2019 – Present', 'title': 'Senior Data Engineer',
+                                       'companyname': 'Acme R&D S.p.A.',
+                                       'company_url': 'https://www.linkedin.com/company/acme-r-d/?trk=public_profile_'
+                                                      'experience-item_profile-section-card_image-click',
+                                       'location': 'Milan Area, Italy'}
+    assert profile_data['jobs'][1]['companyname'] == 'Società Esempio ·'
+    assert profile_data['jobs'][2]['company_url'] == 'N/A'
+    assert profile_data['educations'][0] == {'institution': 'Politecnico di Milano',
+                                             'degreename': 'Master of Science - MS',
+                                             'field': 'Computer Science & Engineering',
+                                             'start_year': '2012', 'end_year': '2014'}
+    assert profile_data['educations'][1]['start_year'] == '2007'
+    assert profile_data['educations'][2]['degreename'] == 'N/A'
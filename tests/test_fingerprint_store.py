@@ -0,0 +1,86 @@
+import copy
+import json
+import os
+import sqlite3
+
+import pytest
+
+from fingerprint_store import FingerprintStore
+from job_history_summary import JobHistorySummary
+from mock_linkedin import MockLinkedInServer, profile_spec, render_profile_page
+from mock_scraping import scrap_mock_profiles
+from profile_parser import extract_profile_data, parse_page, profile_fingerprint
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = MockLinkedInServer(20)
+    yield server
+    server.close()
+
+
+def profile_data_of(spec, base_url):
+    return extract_profile_data(parse_page(render_profile_page(spec, base_url)))
+
+
+def test_unchanged_profiles_are_reused(server, tmp_path):
+    file_name = os.path.join(str(tmp_path), 'profiles_fingerprints.sqlite')
+
+    fingerprints = FingerprintStore(file_name)
+    first_results = scrap_mock_profiles(server, str(tmp_path), range(20), fingerprints=fingerprints)
+    assert fingerprints.hits == 0
+    fingerprints.close()
+
+    fingerprints = FingerprintStore(file_name)
+    second_results = scrap_mock_profiles(server, str(tmp_path), range(20), fingerprints=fingerprints)
+    assert (fingerprints.hits, fingerprints.misses) == (20, 0)
+    fingerprints.close()
+
+    for url, scraping_result in second_results.items():
+        assert scraping_result.to_dict() == first_results[url].to_dict(), url
+
+
+def test_job_history_of_reused_profiles_is_computed_again(server, tmp_path):
+    file_name = os.path.join(str(tmp_path), 'profiles_fingerprints.sqlite')
+
+    fingerprints = FingerprintStore(file_name)
+    first_results = scrap_mock_profiles(server, str(tmp_path), range(20), fingerprints=fingerprints)
+    fingerprints.close()
+
+    # Summaries of an earlier run, when the jobs ending 'Present' had lasted less
+    connection = sqlite3.connect(file_name)
+    for url, profile in connection.execute("SELECT url, profile FROM profiles").fetchall():
+        profile = json.loads(profile)
+        if not profile['jobs_history']['never_had_jobs']:
+            profile['jobs_history'] = dict(JobHistorySummary().to_dict(), never_had_jobs=False)
+            connection.execute("UPDATE profiles SET profile = ? WHERE url = ?", (json.dumps(profile), url))
+    connection.commit()
+    connection.close()
+
+    fingerprints = FingerprintStore(file_name)
+    second_results = scrap_mock_profiles(server, str(tmp_path), range(20), fingerprints=fingerprints)
+    assert fingerprints.hits == 20
+    fingerprints.close()
+
+    for url, scraping_result in second_results.items():
+        assert scraping_result.to_dict() == first_results[url].to_dict(), url
+
+
+def test_fingerprint_of_the_extracted_data(server):
+    spec = next(profile_spec(i, server.companies) for i in range(20)
+                if len(profile_spec(i, server.companies)['jobs']) > 0)
+    profile_data = profile_data_of(spec, server.base_url)
+    fingerprint = profile_fingerprint(profile_data, '01/07/15')
+
+    # The tracking parameters of the company links do not matter, the data of the jobs does
+    tracked_data = copy.deepcopy(profile_data)
+    tracked_data['jobs'][0]['company_url'] += '?trk=public_profile_experience-item_profile-section-card_image-click'
+    assert profile_fingerprint(tracked_data, '01/07/15') == fingerprint
+
+    changed_spec = copy.deepcopy(spec)
+    changed_spec['jobs'][0]['title'] += ' Senior'
+    assert profile_fingerprint(profile_data_of(changed_spec, server.base_url), '01/07/15') != fingerprint
+    assert profile_fingerprint(profile_data, '01/07/16') != fingerprint
+
+    # A page that is not a profile has no fingerprint
+    assert profile_fingerprint(extract_profile_data(parse_page('<html><body></body></html>'))) is None
@@ -0,0 +1,28 @@
+from input_pipeline import InputFile
+
+
+def write_lines(tmp_path, lines):
+    input_file_name = str(tmp_path / 'profiles_data.txt')
+    with open(input_file_name, 'w') as input_file:
+        input_file.write('\n'.join(lines) + '\n')
+    return input_file_name
+
+
+def test_the_same_profile_is_scraped_once(tmp_path):
+    entries = InputFile(write_lines(tmp_path, ['https://www.linkedin.com/in/federicohaag:::01/07/15',
+                                               'linkedin.com/in/FedericoHaag/?trk=x:::01/07/15',
+                                               'https://www.linkedin.com/in/federicohaag-1',
+                                               'https://evil.com/in/federicohaag',
+                                               'http://www.linkedin.com/in/federicohaag-1/']), ':::')
+
+    assert (entries.total, entries.to_scrape, entries.duplicates, entries.number_of_bad_entries) == (2, 2, 2, 1)
+    assert list(entries) == ['https://www.linkedin.com/in/federicohaag:::01/07/15',
+                             'https://www.linkedin.com/in/federicohaag-1']
+
+
+def test_distinct_profiles_are_all_kept(tmp_path):
+    lines = [f"https://www.linkedin.com/in/profile-{i}" for i in range(20000)]
+    entries = InputFile(write_lines(tmp_path, lines), ':::')
+
+    assert (entries.total, entries.duplicates) == (20000, 0)
+    assert list(entries) == lines
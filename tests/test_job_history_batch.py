@@ -0,0 +1,80 @@
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from job_history_batch import JobHistoryBatch
+from job_history_summary import JobHistorySummary
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+@pytest.fixture(autouse=True)
+def timezone_without_daylight_saving(monkeypatch):
+    # JobHistorySummary works on local times: the batch equals it when there are no daylight saving time shifts
+    monkeypatch.setenv('TZ', 'UTC')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def random_date(rng, first_year=2000, last_year=2022):
+    if rng.random() < 0.3:
+        return str(rng.randint(first_year, last_year))
+    return f"{rng.choice(MONTHS)} {rng.randint(first_year, last_year)}"
+
+
+def random_date_range(rng):
+    # Date ranges LinkedIn shows (JobHistorySummary can not handle the ones it can not parse)
+    start = random_date(rng)
+    kind = rng.random()
+    if kind < 0.2:
+        return f"{start} – Present"
+    if kind < 0.3:
+        return start
+    return f"{start} – {random_date(rng, int(start[-4:]), int(start[-4:]) + 4)}"
+
+
+def random_graduation_date(rng):
+    if rng.random() < 0.1:
+        return None
+    return datetime(rng.randint(2003, 2021), rng.randint(1, 12), rng.randint(1, 28))
+
+
+def assert_same_summaries(graduation_dates, job_positions_data_ranges):
+    batch = JobHistoryBatch.from_date_ranges(graduation_dates, job_positions_data_ranges)
+    for i, (graduation_date, data_ranges) in enumerate(zip(graduation_dates, job_positions_data_ranges)):
+        assert batch.summary(i).to_dict() == JobHistorySummary(graduation_date, data_ranges).to_dict(), \
+            (graduation_date, data_ranges)
+
+
+def test_random_profiles():
+    rng = random.Random(2020)
+    graduation_dates = [random_graduation_date(rng) for _ in range(3000)]
+    job_positions_data_ranges = [[random_date_range(rng) for _ in range(rng.randint(0, 8))]
+                                 for _ in range(3000)]
+    assert_same_summaries(graduation_dates, job_positions_data_ranges)
+
+
+@pytest.mark.parametrize('data_ranges', [
+    [],
+    ['Jan 2019 – Present'],
+    ['Jan 2019 – Present', 'Mar 2015 – Present', '2012 – Present'],
+    ['Jan 2015 – Dec 2018', 'Jun 2016 – Mar 2017', 'Feb 2016 – Jan 2019'],
+    ['Jan 2018 – Present', 'Mar 2018 – Aug 2018', 'Mar 2018 – Aug 2018'],
+    ['2018'],
+    # Around the graduation date (1 July 2018): the day itself, 3, 5 and 6 months later, 2 years before
+    ['Jul 2018 – Jul 2018', 'Oct 2018 – Oct 2018', 'Dec 2018 – Dec 2018', 'Jan 2019 – Jan 2019'],
+    ['Jul 2016 – Aug 2016', 'Jun 2016 – Jun 2016', 'Jun 2018 – Jun 2018']
+])
+@pytest.mark.parametrize('graduation_date', [datetime(2018, 7, 1), None])
+def test_edge_cases(data_ranges, graduation_date):
+    assert_same_summaries([graduation_date], [data_ranges])
+
+
+def test_profiles_of_a_batch_do_not_mix():
+    graduation_dates = [datetime(2018, 7, 1), None, datetime(2010, 2, 1), datetime(2018, 7, 1)]
+    job_positions_data_ranges = [['Jan 2019 – Present'], ['Jan 2019 – Present'], [], ['Jan 2008 – Mar 2009']]
+    assert_same_summaries(graduation_dates, job_positions_data_ranges)
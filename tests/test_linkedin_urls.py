@@ -0,0 +1,44 @@
+from configparser import ConfigParser
+
+import pytest
+
+from linkedin_urls import allow_mock_linkedin, canonical_company_url, canonical_profile_url
+
+
+@pytest.mark.parametrize('url', ['https://www.linkedin.com/in/FedericoHaag', 'http://linkedin.com/in/federicohaag/',
+                                 'www.linkedin.com/in/federicohaag?trk=x', 'linkedin.com/in/federicohaag/details/',
+                                 'https://www.linkedin.com:443/in/federicohaag',
+                                 'http://it.linkedin.com/in/FedericoHaag',
+                                 'https://de.linkedin.com/in/federicohaag/?originalSubdomain=de',
+                                 'https://IT.linkedin.com/in/federicohaag'])
+def test_linkedin_profile_urls(url):
+    assert canonical_profile_url(url) == 'https://www.linkedin.com/in/federicohaag/'
+
+
+@pytest.mark.parametrize('url', ['https://evil.com/in/federicohaag', 'linkedln.com/in/federicohaag',
+                                 'https://linkedin.com.evil.com/in/federicohaag', 'https://evillinkedin.com/in/x',
+                                 'http://127.0.0.1:8000/in/federicohaag',
+                                 'https://evil.it.linkedin.com/in/federicohaag',
+                                 'https://abcd.linkedin.com/in/federicohaag'])
+def test_other_hosts_are_rejected(url):
+    assert canonical_profile_url(url) is None
+    assert canonical_company_url(url.replace('/in/', '/company/')) is None
+
+
+def test_mock_linkedin_urls_only_when_configured():
+    config = ConfigParser()
+    config.read_dict({'system': {'mock_linkedin_url': 'http://127.0.0.1:8000/'}})
+    allow_mock_linkedin(config)
+
+    assert canonical_profile_url('http://127.0.0.1:8000/in/Profile-1?x=y') == 'http://127.0.0.1:8000/in/profile-1/'
+    assert canonical_profile_url('https://127.0.0.1:8000/in/profile-1') is None
+    assert canonical_profile_url('http://127.0.0.1:8001/in/profile-1') is None
+    assert canonical_company_url('linkedin.com/company/acme/about/') == 'https://www.linkedin.com/company/acme/'
+
+    allow_mock_linkedin(ConfigParser())
+    assert canonical_profile_url('http://127.0.0.1:8000/in/profile-1') is None
+
+
+def test_company_urls_of_the_locale_subdomains():
+    assert canonical_company_url('https://it.linkedin.com/company/Acme/?trk=x') == \
+        'https://www.linkedin.com/company/acme/'
@@ -0,0 +1,33 @@
+import pytest
+
+from profile_scraper import ScrapingResult
+from results_journal import ResultsJournal
+
+
+def write_journal(file_name, messages, **options):
+    journal = ResultsJournal(file_name, **options)
+    for index, message in enumerate(messages):
+        journal.append(index, f"entry-{index}", ScrapingResult(message))
+    journal.close()
+
+
+def test_journal_of_a_previous_run_is_not_overwritten(tmp_path):
+    file_name = str(tmp_path / 'results_journal.jsonl')
+    write_journal(file_name, ['ProfileNotFound', 'TerminatedDueToHumanCheckError'])
+
+    with pytest.raises(FileExistsError):
+        ResultsJournal(file_name)
+    assert list(ResultsJournal.load_completed(file_name)) == ['entry-0']
+
+    write_journal(file_name, ['ProfileNotFound', 'ProfileNotFound'], resume=True)
+    assert list(ResultsJournal.load_completed(file_name)) == ['entry-0', 'entry-1']
+
+    write_journal(file_name, [], overwrite=True)
+    assert ResultsJournal.load_completed(file_name) == {}
+
+
+def test_empty_journal_can_be_started_again(tmp_path):
+    file_name = str(tmp_path / 'results_journal.jsonl')
+    write_journal(file_name, [])
+    write_journal(file_name, ['ProfileNotFound'])
+    assert list(ResultsJournal.load_completed(file_name)) == ['entry-0']
@@ -0,0 +1,62 @@
+import sqlite3
+from configparser import ConfigParser
+from threading import Thread
+
+import pytest
+
+from sales_link_resolver import SalesLinkCache, SalesLinkResolver
+
+
+class LeadBrowser:
+    page_source = ''
+
+    def get(self, link):
+        lead = link.split('/sales/lead/')[1].split(',')[0]
+        self.page_source = f'<a href="https://www.linkedin.com/in/{lead}/">Profile</a>'
+
+
+class LeadBrowserPool:
+    def acquire(self):
+        return LeadBrowser()
+
+    def release(self, browser):
+        pass
+
+
+def lead_link(i):
+    return f"https://www.linkedin.com/sales/lead/lead-{i},NAME_SEARCH,token-{i}"
+
+
+def test_links_submitted_while_resolving(tmp_path):
+    cache = SalesLinkCache(str(tmp_path / 'salesnav_links.sqlite'))
+    for i in range(0, 300, 3):
+        cache.put(lead_link(i), f"https://www.linkedin.com/in/cached-{i}/")
+
+    resolver = SalesLinkResolver(LeadBrowserPool(), ConfigParser(), 4, cache, queue_size=10)
+    resolver.start()
+
+    def submit_links():
+        for i in range(300):
+            resolver.submit(lead_link(i))
+            resolver.progress()
+        resolver.finish()
+
+    producer = Thread(target=submit_links)
+    producer.start()
+    results = list(resolver.results())
+    producer.join()
+
+    connections = list(cache._connections)
+    resolver.close()
+
+    assert [link for link, _ in results] == [lead_link(i) for i in range(300)]
+    assert [profile_url for _, profile_url in results] == [
+        f"https://www.linkedin.com/in/cached-{i}/" if i % 3 == 0 else f"https://www.linkedin.com/in/lead-{i}/"
+        for i in range(300)]
+    assert (resolver.submitted, resolver.resolved, resolver.cache_hits) == (300, 300, 100)
+
+    # The connections of the producer, of the workers and of this thread are all closed
+    assert len(connections) >= 3
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from job_history_summary import JobHistorySummary
+from job_history_batch import JobHistoryBatch
+from utils_dates import PRESENT, is_present, is_present_range, parse_date, split_date_range
+
+# A current position as shown by LinkedIn in each language, for every word of PRESENT
+CURRENT_POSITIONS = {
+    'present': ('Jan 2019 – Present', datetime(2019, 1, 1)),
+    'presente': ('gen 2019 – presente', datetime(2019, 1, 1)),
+    'actualidad': ('ene. de 2019 – actualidad', datetime(2019, 1, 1)),
+    'oggi': ('gen 2019 – oggi', datetime(2019, 1, 1)),
+    'heute': ('Jan. 2019 – heute', datetime(2019, 1, 1)),
+    "aujourd'hui": ('janv. 2019 – aujourd’hui', datetime(2019, 1, 1)),
+    'atual': ('jan. de 2019 – atual', datetime(2019, 1, 1)),
+    'momento': ('jan de 2019 – o momento', datetime(2019, 1, 1))
+}
+
+
+def test_every_present_word_has_a_case():
+    assert set(CURRENT_POSITIONS) == PRESENT
+
+
+@pytest.mark.parametrize('word', sorted(PRESENT))
+def test_current_position(word):
+    date_range, begin = CURRENT_POSITIONS[word]
+
+    assert is_present_range(date_range)
+
+    initial_date, end_date = split_date_range(date_range)
+    assert initial_date == begin
+    assert end_date is not None and end_date.date() == datetime.today().date()
+
+    summary = JobHistorySummary(datetime(2018, 7, 1), [date_range])
+    assert summary.jobs_now == 1
+    assert summary.date_first_job_after_ending_university == begin
+
+    batch = JobHistoryBatch.from_date_ranges([datetime(2018, 7, 1)], [[date_range]])
+    assert batch.summary(0).to_dict() == summary.to_dict()
+
+
+@pytest.mark.parametrize('date_str', ['o momento', 'até o momento', 'la actualidad', 'Present', ' heute ',
+                                      'aujourd’hui'])
+def test_present_phrases(date_str):
+    assert is_present(date_str)
+    assert parse_date(date_str).date() == datetime.today().date()
+
+
+@pytest.mark.parametrize('date_range', ['Jan 2017 – Mar 2019', 'momentum 2019 – 2020', '2015'])
+def test_past_positions(date_range):
+    assert not is_present_range(date_range)
@@ -1,4 +1,6 @@
-import re
+import sys
+from collections import namedtuple
+
 import pyttsx3
 from datetime import datetime
 from selenium import webdriver
@@ -15,21 +17,40 @@ class CannotProceedScrapingException(Exception):
     """Human Check from Linkedin during an headless mode execution"""
     pass
 
-class Location:
-    def __init__(self, city='N/A', country='N/A', location='N/A'):
-        self.full_string = location
-        self.city = city
-        self.country = country
 
-    def parse_string(self, location):
-        self.full_string = location
+def intern_string(value):
+    # Values repeated across many profiles ('N/A', industries, countries, ...) share a single string object
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# The data model classes are immutable tuples with __slots__ (no per-instance dict): to "change" a value
+# create a new instance, e.g. with _replace().
+
+class Location(namedtuple('Location', ['city', 'country', 'full_string'])):
+    __slots__ = ()
+
+    def __new__(cls, city='N/A', country='N/A', location='N/A'):
+        return super().__new__(cls, intern_string(city), intern_string(country), intern_string(location))
+
+    @classmethod
+    def from_string(cls, location):
         if ',' in location:
-            # TODO: Probably useless try - except. To be checked.
-            try:
-                self.city = location.split(',')[0]
-                self.country = location.split(',')[-1]
-            except:
-                pass
+            return cls(location.split(',')[0], location.split(',')[-1], location)
+        return cls(location=location)
+
+    def to_tuple(self):
+        return tuple(self)
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls(*data)
+
+    def to_dict(self):
+        return {'city': self.city, 'country': self.country, 'location': self.full_string}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['city'], data['country'], data['location'])
 
     def __str__(self):
         if (self.city == 'N/A') and (self.country == 'N/A'):
@@ -37,25 +58,54 @@ class Location:
         else:
             return '{}, {}'.format(self.city,self.country)
 
-class Company:
-    def __init__(self, name='N/A', industry='N/A'):
-        self.name = name
-        self.industry = industry
+
+class Company(namedtuple('Company', ['name', 'industry'])):
+    __slots__ = ()
+
+    def __new__(cls, name='N/A', industry='N/A'):
+        return super().__new__(cls, intern_string(name), intern_string(industry))
+
+    def to_tuple(self):
+        return tuple(self)
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls(*data)
+
+    def to_dict(self):
+        return {'name': self.name, 'industry': self.industry}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['industry'])
 
     def __str__(self):
         return '{}, {}'.format(self.name,self.industry)
 
 
-class Job:
-    def __init__(self, company=Company(), position='N/A',
-                 location=Location(), daterange="N/A"):
-        self.company = company
-        self.position = position
-        self.location = location
-        self.daterange = daterange
+class Job(namedtuple('Job', ['company', 'position', 'location', 'daterange'])):
+    __slots__ = ()
+
+    def __new__(cls, company=Company(), position='N/A', location=Location(), daterange="N/A"):
+        return super().__new__(cls, company, intern_string(position), location, intern_string(daterange))
 
-    def __set__(self, instance, value):
-        self.instance = value
+    def to_tuple(self):
+        return self.company.to_tuple(), self.position, self.location.to_tuple(), self.daterange
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls(Company.from_tuple(data[0]), data[1], Location.from_tuple(data[2]), data[3])
+
+    def to_dict(self):
+        return {'company': self.company.to_dict(),
+                'position': self.position,
+                'location': self.location.to_dict(),
+                'daterange': self.daterange}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(Company.from_dict(data['company']), data['position'],
+                   Location.from_dict(data['location']), data['daterange'])
 
     def __str__(self):
         return '''
@@ -68,17 +118,26 @@ class Job:
                                            self.daterange)
 
 
-class Education:
-    def __init__(self, institution="N/A", degreename='N/A',
-                 field="N/A", start_year="N/A", end_year="N/A"):
-        self.institution = institution
-        self.degreename = degreename
-        self.field = field
-        self.start_year = start_year
-        self.end_year = end_year
+class Education(namedtuple('Education', ['institution', 'degreename', 'field', 'start_year', 'end_year'])):
+    __slots__ = ()
+
+    def __new__(cls, institution="N/A", degreename='N/A', field="N/A", start_year="N/A", end_year="N/A"):
+        return super().__new__(cls, intern_string(institution), intern_string(degreename), intern_string(field),
+                               intern_string(start_year), intern_string(end_year))
 
-    def __set__(self, instance, value):
-        self.instance = value
+    def to_tuple(self):
+        return tuple(self)
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls(*data)
+
+    def to_dict(self):
+        return dict(self._asdict())
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['institution'], data['degreename'], data['field'], data['start_year'], data['end_year'])
 
     def __str__(self):
         return '''
@@ -92,24 +151,60 @@ class Education:
                            self.end_year)
 
 
-class Profile:
-    def __init__(self, profile_name, email, skills, last_job=Job(), job_history_summary=JobHistorySummary(),
-                 job_list = [], edu_list=[]):
-        self.profile_name = profile_name
-        self.email = email
-        self.skills = skills
-        self.current_job = last_job if not job_history_summary.is_currently_unemployed else Job()
-        self.jobs_history = job_history_summary
-        if len(job_list) == 0:
-            self.job_list = [Job()]
-        else:
-            self.job_list = job_list
-
-        if len(edu_list) == 0:
-            self.edu_list = [Education()]
-        else:
-            self.edu_list = edu_list
-
+class Profile(namedtuple('Profile', ['profile_name', 'email', 'skills', 'current_job', 'jobs_history', 'job_list',
+                                     'edu_list'])):
+    __slots__ = ()
+
+    def __new__(cls, profile_name, email, skills, last_job=None, job_history_summary=None,
+                job_list=None, edu_list=None):
+        if last_job is None:
+            last_job = Job()
+        if job_history_summary is None:
+            job_history_summary = JobHistorySummary()
+
+        if job_list is None or len(job_list) == 0:
+            job_list = (Job(),)
+
+        if edu_list is None or len(edu_list) == 0:
+            edu_list = (Education(),)
+
+        return super().__new__(cls, profile_name, email, tuple(intern_string(skill) for skill in skills),
+                               last_job if not job_history_summary.is_currently_unemployed else Job(),
+                               job_history_summary, tuple(job_list), tuple(edu_list))
+
+    def to_tuple(self):
+        return (self.profile_name,
+                self.email,
+                self.skills,
+                self.current_job.to_tuple(),
+                self.jobs_history.to_tuple(),
+                tuple(job.to_tuple() for job in self.job_list),
+                tuple(education.to_tuple() for education in self.edu_list))
+
+    @classmethod
+    def from_tuple(cls, data):
+        return cls(data[0], data[1], data[2],
+                   Job.from_tuple(data[3]),
+                   JobHistorySummary.from_tuple(data[4]),
+                   [Job.from_tuple(job) for job in data[5]],
+                   [Education.from_tuple(education) for education in data[6]])
+
+    def to_dict(self):
+        return {'profile_name': self.profile_name,
+                'email': self.email,
+                'skills': list(self.skills),
+                'current_job': self.current_job.to_dict(),
+                'jobs_history': self.jobs_history.to_dict(),
+                'job_list': [job.to_dict() for job in self.job_list],
+                'edu_list': [education.to_dict() for education in self.edu_list]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['profile_name'], data['email'], data['skills'],
+                   Job.from_dict(data['current_job']),
+                   JobHistorySummary.from_dict(data['jobs_history']),
+                   [Job.from_dict(job) for job in data['job_list']],
+                   [Education.from_dict(education) for education in data['edu_list']])
 
 
 def linkedin_logout(browser):
@@ -130,24 +225,6 @@ def linkedin_login(browser, username, password):
         pass
 
 
-def chunks(lst, n):
-    if n == 0:
-        return [lst]
-    """Yield successive n-sized chunks from lst."""
-    return [lst[i:i + n] for i in range(0, len(lst), n)]
-
-
-def is_url_valid(url):
-    regex = re.compile(
-        r'^(?:http|ftp)s?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return re.match(regex, url) is not None
-
-
 def get_months_between_dates(date1, date2):
 
     if date1 < date2:
@@ -183,10 +260,14 @@ def message_to_user(message, config):
         engine.runAndWait()
 
 
-def get_browser_options(headless_option, config):
+def get_browser_options(headless_option, config, user_data_dir=None):
 
     options = webdriver.ChromeOptions()
 
+    # Chrome profile directory, keeps cookies (e.g. the LinkedIn session) between executions
+    if user_data_dir is not None:
+        options.add_argument(f'--user-data-dir={user_data_dir}')
+
     options.add_argument('--no-sandbox')
 
     if headless_option:
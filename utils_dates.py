@@ -1,28 +1,93 @@
-import datetime
+import re
+from datetime import datetime
+from functools import lru_cache
+
+# Month names (full and abbreviated) of the languages LinkedIn profiles are commonly shown in
+MONTHS = {}
+for _month_names in [
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'],
+    ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october',
+     'november', 'december'],
+    ['gen', 'feb', 'mar', 'apr', 'mag', 'giu', 'lug', 'ago', 'set', 'ott', 'nov', 'dic'],
+    ['gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno', 'luglio', 'agosto', 'settembre', 'ottobre',
+     'novembre', 'dicembre'],
+    ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sept', 'oct', 'nov', 'dic'],
+    ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto', 'septiembre', 'octubre',
+     'noviembre', 'diciembre'],
+    ['janv', 'févr', 'mars', 'avr', 'mai', 'juin', 'juil', 'août', 'sept', 'oct', 'nov', 'déc'],
+    ['janvier', 'février', 'mars', 'avril', 'mai', 'juin', 'juillet', 'août', 'septembre', 'octobre',
+     'novembre', 'décembre'],
+    ['jan', 'feb', 'mär', 'apr', 'mai', 'jun', 'jul', 'aug', 'sep', 'okt', 'nov', 'dez'],
+    ['januar', 'februar', 'märz', 'april', 'mai', 'juni', 'juli', 'august', 'september', 'oktober',
+     'november', 'dezember'],
+    ['jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez'],
+    ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho', 'agosto', 'setembro', 'outubro',
+     'novembro', 'dezembro']
+]:
+    for _number, _name in enumerate(_month_names):
+        MONTHS[_name] = _number + 1
+
+# Words used in place of the end date of current positions
+PRESENT = {'present', 'presente', 'actualidad', 'oggi', 'heute', "aujourd'hui", 'atual', 'momento'}
+
+# Articles and prepositions that may come before them (e.g. "o momento", "até o momento", "la actualidad")
+PRESENT_LEADING_WORDS = {'o', 'a', 'el', 'la', 'il', 'the', 'até', 'ate', 'hasta', 'fino', 'ad', 'bis'}
+
+# Prepositions between month and year (e.g. "ene. de 2019")
+IGNORED_WORDS = {'de', 'di', 'del'}
+
+DATE_RANGE_SEPARATOR = re.compile(r'\s+[–—-]\s+')
 
 
 def split_date_range(date_range):
-    try:
-        dates = date_range.split(' – ')
+    dates = DATE_RANGE_SEPARATOR.split(date_range, maxsplit=1)
+    if len(dates) > 1:
         begin = parse_date(dates[0])
         end = parse_date(dates[1])
-    except IndexError:
+    else:
         begin = parse_date(date_range.strip())
         end = begin
 
     return [begin, end]
 
 
+def is_present(date_str):
+    # True if date_str stands for the current date, as the end of a current position
+    words = date_str.lower().replace('’', "'").replace('.', ' ').split()
+    while len(words) > 1 and words[0] in PRESENT_LEADING_WORDS:
+        words = words[1:]
+    return len(words) == 1 and words[0] in PRESENT
+
+
+def is_present_range(date_range):
+    dates = DATE_RANGE_SEPARATOR.split(date_range, maxsplit=1)
+    # The end date may be followed by the duration (e.g. "Jan 2019 – Present · 2 yrs")
+    return is_present(dates[-1].split('·')[0])
+
+
 def parse_date(date_str):
-    if date_str == 'Present':
+    # "Present" is not cached, as it depends on the current time
+    if is_present(date_str):
         return datetime.today()
 
-    try:
-        date = datetime.strptime(date_str, '%b %Y')
-        return date
-    except ValueError:
-        try:
-            date = datetime.strptime(date_str, '%Y')
-            return date
-        except ValueError:
-            return None
\ No newline at end of file
+    return _parse_date(date_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str):
+    # Accepts "<month> <year>" and "<year>". The same strings repeat across profiles, so results are cached.
+    words = [word for word in date_str.lower().replace('.', ' ').split() if word not in IGNORED_WORDS]
+
+    if len(words) == 2:
+        month = MONTHS.get(words[0])
+        year = words[1]
+    elif len(words) == 1:
+        month = 1
+        year = words[0]
+    else:
+        return None
+
+    if month is None or not (year.isascii() and year.isdigit()) or len(year) > 4 or int(year) == 0:
+        return None
+
+    return datetime(int(year), month, 1)
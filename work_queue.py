@@ -0,0 +1,71 @@
+import time
+from collections import deque
+from threading import Lock
+
+
+class WorkItem:
+    def __init__(self, index, entry):
+        # Position of the entry in the input file, used to keep the results in the input order
+        self.index = index
+        self.entry = entry
+        self.attempts = 0
+
+
+class WorkQueue:
+    """Entries shared by all the scrapers: each free scraper pulls the next one"""
+
+    def __init__(self, entries, max_retries=1, completed_entries=None, total=None):
+        # Entries in completed_entries (e.g. done by a previous run) are skipped.
+        # entries are read one at a time, when a scraper asks for the next one: they can be streamed from the
+        # input file (see input_pipeline.InputFile), so that only the entries being retried stay in memory.
+        # total is the number of entries to process: it has to be given unless entries is a list.
+        if completed_entries is None:
+            completed_entries = set()
+        self._items = (WorkItem(index, entry) for index, entry in enumerate(entries)
+                       if entry not in completed_entries)
+        self._retries = deque()
+        self._lock = Lock()
+
+        self.max_retries = max_retries
+        if total is None:
+            total = sum(1 for entry in entries if entry not in completed_entries)
+        self.total = total
+        self.completed = 0
+        self.start_time = time.time()
+
+    def get(self):
+        # Returns None when there is nothing left to do
+        with self._lock:
+            if len(self._retries) > 0:
+                item = self._retries.popleft()
+            else:
+                item = next(self._items, None)
+                if item is None:
+                    return None
+            item.attempts += 1
+            return item
+
+    def retry(self, item):
+        # Puts back the item at the head of the queue, if it has still attempts left.
+        # Retrying it right away keeps the results close to the input order, so few of them wait to be exported.
+        if item.attempts > self.max_retries:
+            return False
+        with self._lock:
+            self._retries.appendleft(item)
+        return True
+
+    def task_done(self):
+        with self._lock:
+            self.completed += 1
+
+    def close(self):
+        # No item is given to the scrapers anymore
+        with self._lock:
+            self._items = iter(())
+            self._retries.clear()
+
+    def time_left(self):
+        with self._lock:
+            if self.completed == 0:
+                return None
+            return ((time.time() - self.start_time) / self.completed) * (self.total - self.completed)